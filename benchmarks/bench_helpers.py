@@ -0,0 +1,179 @@
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_helpers_baseline.json")
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+class Payload:
+    # stands in for requests.Response in the parse_* transforms
+    def __init__(self, data) -> None:
+        self.text = json.dumps(data)
+        self.content = self.text.encode()
+
+
+def build_cases() -> dict[str, tuple]:
+    from bench_json import make_creation
+    from cogs.moderation import normalize_console_id_input
+    from models import LapTime
+    from utils import (
+        convert_datetime_to_discord_date,
+        format_time,
+        get_platform_name,
+        parse_creations_page,
+        parse_presence_page,
+        parse_time_trial,
+        parse_top_creations,
+        rename_complaint,
+        rename_creation_type,
+        rename_presence,
+    )
+
+    random.seed(1)
+    search_1000 = Payload({"total": 40000, "creations": [make_creation(i) for i in range(1000)]})
+    top_10 = Payload([make_creation(i) for i in range(10)])
+    presence_1000 = Payload({
+        "total": 1000,
+        "presence": [
+            {"userId": i, "username": f"player_{i}", "presence": "IN_POD", "platform": "PS3", "isMNR": True, "isRpcn": True}
+            for i in range(1000)
+        ],
+    })
+    scores_1000 = Payload({
+        "track": {"id": 10000, "name": "Track", "rating": 4.5, "creatorUsername": "player_1"},
+        "total": 10000,
+        "scores": [
+            {"rank": i + 1, "scoreId": i, "playerUsername": f"player_{i}", "bestLapTime": f"1:{i % 60}:{i % 1000}"}
+            for i in range(1000)
+        ],
+    })
+
+    long_console_id = "-".join(f"{i:04x}" for i in range(2500))
+    messy_console_id = "💯" + ":-. |/_;,".join("ab" for _ in range(500)) + "：：："
+    lap_time = LapTime(83_456)
+
+    # name -> (callable, args); each case should be a few microseconds to a few milliseconds
+    return {
+        "format_time/LapTime": (format_time, (lap_time,)),
+        "format_time/string": (format_time, ("1:23:456",)),
+        "format_time/seconds float": (format_time, (83.456,)),
+        "format_time/999 minutes": (format_time, ("999:59:999",)),
+        "rename_presence/known": (rename_presence, ("RANKED_RACE",)),
+        "rename_presence/unknown": (rename_presence, ("SOME_NEW_STATE",)),
+        "rename_presence/long unknown": (rename_presence, ("A_" * 2000,)),
+        "rename_creation_type/known": (rename_creation_type, ("CHARACTER",)),
+        "rename_creation_type/unknown": (rename_creation_type, ("STORY_LEVEL_V2",)),
+        "rename_complaint/known": (rename_complaint, ("VULGAR",)),
+        "rename_complaint/unknown": (rename_complaint, ("HATE_SPEECH",)),
+        "get_platform_name/int": (get_platform_name, (2,)),
+        "get_platform_name/digit string": (get_platform_name, (" 4 ",)),
+        "get_platform_name/name": (get_platform_name, ("ps3",)),
+        "get_platform_name/invalid": (get_platform_name, ("DREAMCAST",)),
+        "convert_datetime_to_discord_date": (convert_datetime_to_discord_date, ("2024-05-01T12:34:56.789+00:00",)),
+        "normalize_console_id_input/typical": (normalize_console_id_input, ("12-34-56-78",)),
+        "normalize_console_id_input/emoji": (normalize_console_id_input, (" 💯：ab.cd ",)),
+        "normalize_console_id_input/10k chars": (normalize_console_id_input, (long_console_id,)),
+        "normalize_console_id_input/separator runs": (normalize_console_id_input, (messy_console_id,)),
+        "parse_top_creations/10 rows": (parse_top_creations, (top_10,)),
+        "parse_creations_page/1000 rows": (parse_creations_page, (search_1000,)),
+        "parse_presence_page/1000 rows": (parse_presence_page, (presence_1000,)),
+        "parse_time_trial/1000 rows": (parse_time_trial, (scores_1000,)),
+    }
+
+
+def measure(function, args: tuple, repeat: int, budget: float) -> float:
+    timer = timeit.Timer(lambda: function(*args))
+
+    # size the loop so one repeat takes about `budget` seconds, then keep the best repeat
+    number, elapsed = timer.autorange()
+    number = max(1, int(number * budget / max(elapsed, 1e-9)))
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def format_duration(seconds: float) -> str:
+    if seconds < 1e-6:
+        return f"{seconds * 1e9:.0f}ns"
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.2f}µs"
+    return f"{seconds * 1e3:.2f}ms"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Microbenchmarks for the helpers and payload transforms in utils.py.")
+    parser.add_argument("--record", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown over baseline (default: 0.25)")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--budget", type=float, default=0.05, help="seconds per repeat (default: 0.05)")
+    parser.add_argument("--filter", default="", help="only run cases containing this text")
+    parser.add_argument("--confirm", type=int, default=3, help="re-runs of a case over threshold before it counts (default: 3)")
+    args = parser.parse_args()
+
+    if not os.path.exists(os.path.join(ROOT, ".env")):
+        sys.exit("config.py needs a .env in the project root, copy .env.example.")
+    os.chdir(ROOT)
+
+    cases = {name: case for name, case in build_cases().items() if args.filter in name}
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file).get("results", {})
+
+    results = {}
+    regressions = []
+    print(f"{'case':<44} {'time':>10} {'baseline':>10} {'change':>8}")
+    for name, (function, function_args) in cases.items():
+        seconds = measure(function, function_args, args.repeat, args.budget)
+
+        previous = baseline.get(name)
+        # a noisy neighbour can double a microbenchmark, so a regression has to survive a few re-runs
+        for _ in range(args.confirm if previous and not args.record else 0):
+            if seconds / previous - 1 <= args.threshold:
+                break
+            seconds = min(seconds, measure(function, function_args, args.repeat, args.budget))
+
+        results[name] = seconds
+        if previous:
+            change = seconds / previous - 1
+            marker = " !" if change > args.threshold else ""
+            if marker:
+                regressions.append(name)
+            print(f"{name:<44} {format_duration(seconds):>10} {format_duration(previous):>10} {change:>+7.0%}{marker}")
+        else:
+            print(f"{name:<44} {format_duration(seconds):>10} {'-':>10} {'new':>8}")
+
+    if args.record:
+        with open(args.baseline, "w", encoding="utf-8") as baseline_file:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "results": {**baseline, **results},
+                },
+                baseline_file,
+                indent=2,
+                sort_keys=True,
+            )
+            baseline_file.write("\n")
+        print(f"\nrecorded {len(results)} cases to {args.baseline}")
+        return 0
+
+    if regressions:
+        print(f"\n{len(regressions)} case(s) slower than baseline by more than {args.threshold:.0%}:")
+        for name in regressions:
+            print(f"  {name}")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
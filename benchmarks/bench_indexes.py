@@ -0,0 +1,81 @@
+import argparse
+import itertools
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from indexes import CreationIndex
+
+WORDS = [
+    "track", "race", "rally", "speed", "speedway", "circuit", "loop", "drift", "canyon", "desert",
+    "moon", "space", "city", "night", "neon", "jungle", "ice", "lava", "mountain", "beach",
+    "kart", "turbo", "mario", "sonic", "rainbow", "road", "grand", "prix", "super", "mega",
+    "classic", "remake", "the", "of", "and", "ultimate", "extreme", "fun", "fast", "crazy",
+]
+QUERIES = {
+    "search/word": "rally",
+    "search/two words": "neon canyon",
+    "search/common prefix": "tr",
+    "search/common words": "the race track",
+    "search/typo": "speedwya",
+    "search/id prefix": "1234",
+}
+
+
+def make_name(rng: random.Random) -> str:
+    name = " ".join(rng.choice(WORDS).title() for _ in range(rng.randint(1, 4)))
+    if rng.random() < 0.3:
+        name += f" {rng.randint(1, 99)}"
+    return name
+
+
+def build_index(size: int) -> CreationIndex:
+    rng = random.Random(size)
+    index = CreationIndex()
+    index.add_many(
+        (10000 + i, make_name(rng), f"player_{i % 5000}", rng.choice(["TRACK", "KART", "CHARACTER"]))
+        for i in range(size)
+    )
+    return index
+
+
+def build_cases(index: CreationIndex, size: int) -> dict:
+    rng = random.Random(0)
+    new_ids = itertools.count(10000 + size)
+    names = itertools.cycle(["Neon Canyon Rally", "Neon Canyon Rally 2"])
+
+    cases = {
+        "add/unchanged": lambda: index.add(10000, index.get(10000).name),
+        "add/new": lambda: index.add(next(new_ids), make_name(rng)),
+        "add/rename": lambda: index.add(10001, next(names)),
+    }
+    for name, query in QUERIES.items():
+        cases[name] = lambda query=query: index.search(query)
+    return cases
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time creation index writes and searches as the index grows.")
+    parser.add_argument("--sizes", default="10000,50000,100000", help="comma separated index sizes (default: 10000,50000,100000)")
+    parser.add_argument("--number", type=int, default=200, help="calls per measurement (default: 200)")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    print(f"{'case':<24}" + "".join(f"{size:>12,}" for size in sizes))
+
+    timings: dict[str, list[float]] = {}
+    for size in sizes:
+        index = build_index(size)
+        for name, case in build_cases(index, size).items():
+            seconds = min(timeit.repeat(case, number=args.number, repeat=5)) / args.number
+            timings.setdefault(name, []).append(seconds)
+
+    for name, row in timings.items():
+        print(f"{name:<24}" + "".join(f"{seconds * 1e6:>10.1f}µs" for seconds in row))
+
+
+if __name__ == "__main__":
+    main()
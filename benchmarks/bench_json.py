@@ -0,0 +1,130 @@
+import argparse
+import json
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import Creation, Presence, Score
+
+
+def make_creation(i: int) -> dict:
+    is_track = i % 3 == 0
+    creation = {
+        "playerCreationId": 10000 + i,
+        "name": f"Creation {i} " + "x" * random.randint(4, 24),
+        "description": "Lorem ipsum dolor sit amet " * random.randint(1, 8),
+        "rating": round(random.uniform(0, 5), 2),
+        "creatorUsername": f"player_{i % 500}",
+        "type": "TRACK" if is_track else random.choice(["KART", "CHARACTER"]),
+        "tags": ["FAST", "FUN", "TECHNICAL"][: random.randint(0, 3)],
+        "isMNR": True,
+        "platform": "PS3",
+        "createdAt": "2024-05-01T12:34:56.789+00:00",
+        "downloads": {"all_time": random.randint(0, 5000), "this_week": random.randint(0, 50)},
+        "views": {"all_time": random.randint(0, 50000), "this_week": random.randint(0, 500)},
+        "points": {"all_time": random.randint(0, 90000), "this_week": random.randint(0, 900)},
+    }
+    if is_track:
+        creation["records"] = {
+            "bestLapTime": f"{random.randint(0, 3)}:{random.randint(0, 59)}:{random.randint(0, 999)}",
+            "longestDrift": round(random.uniform(0, 20), 3),
+            "longestHangTime": round(random.uniform(0, 8), 3),
+        }
+    return creation
+
+
+def make_payloads(size: int) -> dict[str, tuple[bytes, str, type]]:
+    random.seed(1)
+    search = {"total": size * 40, "creations": [make_creation(i) for i in range(size)]}
+    top = [make_creation(i) for i in range(size)]
+    presence = {
+        "total": size,
+        "presence": [
+            {
+                "userId": i,
+                "username": f"player_{i}",
+                "presence": random.choice(["ONLINE", "IN_POD", "RANKED_RACE", "IN_STUDIO"]),
+                "platform": "PS3",
+                "isMNR": True,
+                "isRpcn": bool(i % 2),
+            }
+            for i in range(size)
+        ],
+    }
+    scores = {
+        "track": {"id": 10000, "name": "Track", "rating": 4.5, "creatorUsername": "player_1"},
+        "total": size * 10,
+        "scores": [
+            {
+                "rank": i + 1,
+                "id": 50000 + i,
+                "playerUsername": f"player_{i}",
+                "bestLapTime": f"1:{i % 60}:{i % 1000}",
+                "updatedAt": "2024-05-01T12:34:56.789+00:00",
+            }
+            for i in range(size)
+        ],
+    }
+
+    return {
+        "search": (json.dumps(search).encode(), "creations", Creation),
+        "top list": (json.dumps(top).encode(), None, Creation),
+        "presence": (json.dumps(presence).encode(), "presence", Presence),
+        "time trial": (json.dumps(scores).encode(), "scores", Score),
+    }
+
+
+def available_decoders() -> dict:
+    decoders = {"json": json.loads}
+
+    try:
+        import orjson
+        decoders["orjson"] = orjson.loads
+    except ImportError:
+        pass
+
+    try:
+        import msgspec
+        decoders["msgspec"] = msgspec.json.Decoder().decode
+    except ImportError:
+        pass
+
+    return decoders
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare JSON decoders on PLGarage-shaped payloads.")
+    parser.add_argument("--size", type=int, default=100, help="items per payload (default: 100)")
+    parser.add_argument("--number", type=int, default=200, help="decodes per measurement (default: 200)")
+    args = parser.parse_args()
+
+    decoders = available_decoders()
+    payloads = make_payloads(args.size)
+
+    print(f"{'payload':<12} {'bytes':>8} {'decoder':<8} {'decode µs':>10} {'+models µs':>11} {'speedup':>8}")
+    for name, (body, key, model) in payloads.items():
+        baseline = None
+        for decoder_name, loads in decoders.items():
+            def decode_only():
+                loads(body)
+
+            def decode_models():
+                data = loads(body)
+                items = data if key is None else data.get(key, [])
+                [model.from_payload(item) for item in items]
+
+            decode_us = min(timeit.repeat(decode_only, number=args.number, repeat=5)) / args.number * 1e6
+            models_us = min(timeit.repeat(decode_models, number=args.number, repeat=5)) / args.number * 1e6
+            baseline = baseline or decode_us
+
+            print(
+                f"{name:<12} {len(body):>8} {decoder_name:<8} {decode_us:>10.1f} "
+                f"{models_us:>11.1f} {baseline / decode_us:>7.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,378 @@
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from mock_plgarage import MOCK_TOKEN, MockConfig, start_mock_server
+
+
+# (weight, cog, command, argument factory) -- roughly what a busy guild sends
+COMMAND_MIX = (
+    (20, "Player", "player", lambda rng, world: {"username": f"player_{rng.randint(1, world.players)}"}),
+    (14, "Creation", "creation_id", lambda rng, world: {"creation_id": 10000 + rng.randrange(world.creations)}),
+    (10, "Creation", "creation_query", lambda rng, world: {"creation_name": f"Track {rng.randint(10, 99)}"}),
+    (4, "Creation", "creation_player", lambda rng, world: {"username": f"player_{rng.randint(1, world.players)}"}),
+    (4, "Creation", "topmods", lambda rng, world: {}),
+    (3, "Creation", "topkarts", lambda rng, world: {}),
+    (3, "Creation", "toptracks", lambda rng, world: {}),
+    (10, "Stats", "players_online", lambda rng, world: {}),
+    (10, "Stats", "server_stats", lambda rng, world: {}),
+    (8, "Score", "hotlap", lambda rng, world: {}),
+    (6, "Score", "time-trials", lambda rng, world: {"track_id": 10000 + 3 * rng.randrange(world.creations // 3)}),
+    (2, "Score", "time-trials-compare", lambda rng, world: {
+        "track_ids": ",".join(str(10000 + 3 * rng.randrange(world.creations // 3)) for _ in range(3)),
+        "player": f"player_{rng.randint(1, world.players)}",
+    }),
+    (2, "Moderation", "mod player_complaints", lambda rng, world: {}),
+    (2, "Moderation", "mod banned_console_ids", lambda rng, world: {}),
+    (2, "Moderation", "mod ban_player", lambda rng, world: {
+        "username": f"player_{rng.randint(1, world.players)}",
+        "is_banned": rng.random() < 0.5,
+    }),
+)
+
+
+class FakeAsset:
+    url = "https://cdn.discordapp.com/embed/avatars/0.png"
+
+
+class FakeUser:
+    def __init__(self, user_id: int) -> None:
+        self.id = user_id
+        self.name = f"loadtest_{user_id}"
+        self.display_avatar = FakeAsset()
+        self.roles = []
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class FakeMessage:
+    def __init__(self, message_id: int) -> None:
+        self.id = message_id
+
+    async def edit(self, **kwargs) -> "FakeMessage":
+        return self
+
+    async def delete(self, **kwargs) -> None:
+        pass
+
+
+class FakeResponse:
+    def __init__(self, interaction: "FakeInteraction") -> None:
+        self._interaction = interaction
+        self._done = False
+
+    def is_done(self) -> bool:
+        return self._done
+
+    async def _respond(self, content=None, **kwargs) -> None:
+        if self._done:
+            raise RuntimeError("Interaction already responded to.")
+        await self._interaction.discord_round_trip()
+        self._done = True
+        self._interaction.record(content)
+
+    async def defer(self, **kwargs) -> None:
+        await self._respond()
+
+    async def send_message(self, content=None, **kwargs) -> None:
+        await self._respond(content)
+
+    async def send_modal(self, modal) -> None:
+        await self._respond()
+
+    async def edit_message(self, content=None, **kwargs) -> None:
+        await self._respond(content)
+
+
+class FakeFollowup:
+    def __init__(self, interaction: "FakeInteraction") -> None:
+        self._interaction = interaction
+
+    async def send(self, content=None, **kwargs) -> FakeMessage:
+        await self._interaction.discord_round_trip()
+        self._interaction.record(content)
+        return FakeMessage(self._interaction.id)
+
+
+class FakeInteraction:
+    # only the surface the cogs touch; discord.py's Interaction can't be built without a gateway payload
+    def __init__(self, interaction_id: int, user_id: int, discord_latency: float) -> None:
+        self.id = interaction_id
+        self.user = FakeUser(user_id)
+        self.guild_id = 1
+        self.channel_id = 1
+        self.extras = {}
+        self.command = None
+        self.response = FakeResponse(self)
+        self.followup = FakeFollowup(self)
+        self.discord_latency = discord_latency
+        self.error_reply = False
+
+    async def discord_round_trip(self) -> None:
+        if self.discord_latency:
+            await asyncio.sleep(self.discord_latency)
+
+    def record(self, content) -> None:
+        if isinstance(content, str) and content.startswith("Error:"):
+            self.error_reply = True
+
+    async def edit_original_response(self, content=None, **kwargs) -> FakeMessage:
+        await self.discord_round_trip()
+        self.record(content)
+        return FakeMessage(self.id)
+
+    async def original_response(self) -> FakeMessage:
+        return FakeMessage(self.id)
+
+    async def delete_original_response(self) -> None:
+        pass
+
+
+@dataclass
+class Result:
+    command: str
+    latency: float
+    failed: bool
+    error_reply: bool
+
+
+class LoopLagMonitor:
+    def __init__(self, interval: float = 0.01) -> None:
+        self.interval = interval
+        self.samples: list[float] = []
+        self._task: asyncio.Task | None = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, loop.time() - expected))
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+
+def percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(q * len(ordered) + 0.5) - 1))]
+
+
+def start_mock_in_thread(config: MockConfig, port: int) -> str:
+    # the mock gets its own loop so its handlers don't show up as bot loop lag
+    loop = asyncio.new_event_loop()
+    ready = threading.Event()
+    address: list[str] = []
+
+    async def start() -> None:
+        _, url = await start_mock_server(config, port=port)
+        address.append(url)
+        ready.set()
+
+    threading.Thread(target=loop.run_forever, name="mock-plgarage", daemon=True).start()
+    asyncio.run_coroutine_threadsafe(start(), loop)
+    ready.wait(timeout=60)
+    return address[0]
+
+
+def find_command(cog, qualified_name: str):
+    for command in cog.walk_app_commands():
+        if command.qualified_name == qualified_name:
+            return command
+    raise LookupError(qualified_name)
+
+
+async def build_cogs(bot) -> dict:
+    import cogs.creations
+    import cogs.moderation
+    import cogs.player
+    import cogs.score
+    import cogs.stats
+
+    loaded = {
+        "Player": cogs.player.Player(bot),
+        "Creation": cogs.creations.Creation(bot),
+        "Stats": cogs.stats.Stats(bot),
+        "Score": cogs.score.Score(bot),
+        "Moderation": cogs.moderation.Moderation(bot),
+    }
+
+    # background loops (catalog sync, history, hotlap watch) are left off so only commands hit the backend
+    moderation = loaded["Moderation"]
+    moderation._has_moderator_role = lambda interaction: True
+    return loaded
+
+
+async def run(args: argparse.Namespace, mock_config: MockConfig) -> None:
+    import discord
+    from discord.ext import commands
+
+    import endpoints
+
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=args.threads, thread_name_prefix="to_thread"))
+
+    bot = commands.Bot(command_prefix="!", intents=discord.Intents.none())
+    loaded = await build_cogs(bot)
+
+    rng = random.Random(args.seed)
+    weights = [entry[0] for entry in COMMAND_MIX]
+    plan = rng.choices(COMMAND_MIX, weights=weights, k=args.commands)
+
+    user_ids = [100 + index for index in range(args.users)]
+    for user_id in user_ids:
+        loaded["Moderation"].moderation_tokens[user_id] = MOCK_TOKEN
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    results: list[Result] = []
+    failures: Counter = Counter()
+
+    async def invoke(index: int, entry) -> None:
+        _, cog_name, command_name, make_arguments = entry
+        cog = loaded[cog_name]
+        command = find_command(cog, command_name)
+        interaction = FakeInteraction(index, rng.choice(user_ids), args.discord_latency)
+        interaction.command = command
+        arguments = make_arguments(rng, mock_config)
+
+        async with semaphore:
+            started = time.perf_counter()
+            failed = False
+            try:
+                await command.callback(cog, interaction, **arguments)
+            except Exception as exc:
+                failed = True
+                failures[f"{command_name}: {type(exc).__name__}: {exc}"[:160]] += 1
+            results.append(Result(command_name, time.perf_counter() - started, failed, interaction.error_reply))
+
+    monitor = LoopLagMonitor()
+    monitor.start()
+    started = time.perf_counter()
+    await asyncio.gather(*(invoke(index, entry) for index, entry in enumerate(plan)))
+    elapsed = time.perf_counter() - started
+    await monitor.stop()
+
+    by_command: dict[str, list[Result]] = defaultdict(list)
+    for result in results:
+        by_command[result.command].append(result)
+
+    latencies = [result.latency for result in results]
+    print(
+        f"\n{len(results)} commands in {elapsed:.2f}s -> {len(results) / elapsed:.1f} commands/s "
+        f"(concurrency {args.concurrency}, {args.threads} worker threads)"
+    )
+    print(
+        f"latency p50 {percentile(latencies, 0.5) * 1000:.0f}ms  p95 {percentile(latencies, 0.95) * 1000:.0f}ms  "
+        f"p99 {percentile(latencies, 0.99) * 1000:.0f}ms  max {max(latencies) * 1000:.0f}ms"
+    )
+    print(
+        f"loop lag p50 {percentile(monitor.samples, 0.5) * 1000:.1f}ms  p99 {percentile(monitor.samples, 0.99) * 1000:.1f}ms  "
+        f"max {max(monitor.samples, default=0.0) * 1000:.1f}ms"
+    )
+
+    print(f"\n{'command':<26} {'n':>5} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'failed':>7} {'errors':>7}")
+    for command_name, command_results in sorted(by_command.items(), key=lambda item: -len(item[1])):
+        values = [result.latency for result in command_results]
+        print(
+            f"{command_name:<26} {len(command_results):>5} {percentile(values, 0.5) * 1000:>8.0f} "
+            f"{percentile(values, 0.95) * 1000:>8.0f} {percentile(values, 0.99) * 1000:>8.0f} "
+            f"{sum(result.failed for result in command_results):>7} "
+            f"{sum(result.error_reply for result in command_results):>7}"
+        )
+
+    upstream = await fetch_mock_stats(args.url)
+    if upstream:
+        print(f"\nupstream requests: {sum(upstream.values())} ({sum(upstream.values()) / len(results):.2f} per command)")
+        for route, count in sorted(upstream.items(), key=lambda item: -item[1]):
+            print(f"  {count:>7}  {route}")
+
+    client_events: Counter = Counter()
+    for key, count in endpoints.counters.items():
+        client_events[key.rpartition(".")[2]] += count
+    print(f"\nclient: {dict(client_events) or 'no cache hits, coalescing or retries'}")
+
+    if failures:
+        print("\nexceptions:")
+        for message, count in failures.most_common(10):
+            print(f"  {count:>5}  {message}")
+
+
+async def fetch_mock_stats(url: str) -> dict[str, int]:
+    import aiohttp
+
+    try:
+        async with aiohttp.ClientSession() as session:
+            async with session.get(f"{url}/_mock/stats") as response:
+                return await response.json() if response.status == 200 else {}
+    except aiohttp.ClientError:
+        return {}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Drive cog commands concurrently against a mock PLGarage.")
+    parser.add_argument("--commands", type=int, default=2000, help="total command invocations")
+    parser.add_argument("--concurrency", type=int, default=200, help="commands in flight at once")
+    parser.add_argument("--users", type=int, default=500, help="distinct fake users")
+    parser.add_argument("--threads", type=int, default=32, help="default executor size used by asyncio.to_thread")
+    parser.add_argument("--discord-latency", type=float, default=0.05, help="seconds per simulated Discord API call")
+    parser.add_argument("--url", help="use an already running PLGarage or mock instead of starting one")
+    parser.add_argument("--port", type=int, default=0, help="port for the in-process mock (0 picks a free one)")
+    parser.add_argument("--players", type=int, default=5000)
+    parser.add_argument("--creations", type=int, default=20000)
+    parser.add_argument("--latency", type=float, default=0.03, help="mock upstream latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.01)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=1)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    mock_config = MockConfig(
+        players=args.players,
+        creations=args.creations,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+
+    if args.url is None:
+        args.url = start_mock_in_thread(mock_config, args.port)
+        print(f"mock PLGarage on {args.url}")
+
+    if not os.path.exists(os.path.join(ROOT, ".env")):
+        sys.exit("config.py needs a .env in the project root, copy .env.example (URL and DATA_DIR are overridden here).")
+
+    # config is read at import time, so point it at the backend and a scratch data dir before the bot modules load
+    os.environ["URL"] = args.url
+    os.environ.setdefault("DATA_DIR", tempfile.mkdtemp(prefix="skidplate-loadtest-"))
+    os.chdir(ROOT)
+
+    asyncio.run(run(args, mock_config))
+
+
+if __name__ == "__main__":
+    main()
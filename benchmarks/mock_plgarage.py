@@ -0,0 +1,556 @@
+import argparse
+import asyncio
+import random
+from collections import Counter
+from dataclasses import dataclass, field
+
+from aiohttp import web
+
+
+CREATION_TYPES = ("TRACK", "KART", "CHARACTER")
+PRESENCES = ("ONLINE", "IN_POD", "IN_STUDIO", "ROAMING", "RANKED_RACE", "CASUAL_RACE", "IDLING")
+TAGS = ("FAST", "FUN", "TECHNICAL", "DRIFT", "JUMPS", "SCENIC", "HARD", "SHORT")
+COMPLAINT_REASONS = ("TOS", "ILLEGAL", "VULGAR", "SPAM")
+MOCK_TOKEN = "mock-token"
+
+
+@dataclass(frozen=True)
+class MockConfig:
+    players: int = 5000
+    creations: int = 20000
+    online: int = 300
+    scores_per_track: int = 500
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    payload_scale: int = 1
+    seed: int = 1
+
+
+@dataclass
+class World:
+    players: list[dict]
+    players_by_name: dict[str, dict]
+    creations: list[dict]
+    creations_by_id: dict[int, dict]
+    online: list[dict]
+    hotlap_track_id: int
+    announcements: dict[int, dict] = field(default_factory=dict)
+    banned_console_ids: list[str] = field(default_factory=list)
+    banned_creation_ids: set[int] = field(default_factory=set)
+    moderators: dict[int, dict] = field(default_factory=dict)
+
+
+def lap_time(rng: random.Random) -> str:
+    return f"{rng.randint(0, 2)}:{rng.randint(0, 59)}:{rng.randint(0, 999)}"
+
+
+def timestamp(rng: random.Random) -> str:
+    return f"20{rng.randint(10, 25)}-{rng.randint(1, 12):02}-{rng.randint(1, 28):02}T12:34:56.789+00:00"
+
+
+def build_world(config: MockConfig) -> World:
+    rng = random.Random(config.seed)
+
+    players = []
+    for user_id in range(1, config.players + 1):
+        players.append({
+            "userId": user_id,
+            "username": f"player_{user_id}",
+            "quote": "Vroom " * rng.randint(0, 6 * config.payload_scale),
+            "starRating": round(rng.uniform(0, 5), 2),
+            "onlineRaces": rng.randint(0, 3000),
+            "onlineFinished": rng.randint(0, 2000),
+            "onlineForfeits": rng.randint(0, 100),
+            "onlineWins": rng.randint(0, 900),
+            "winStreak": rng.randint(0, 10),
+            "longestWinStreak": rng.randint(0, 40),
+            "skillLevels": {"PS3": {
+                "id": rng.randint(1, 30),
+                "name": "Rookie",
+                "creationPoints": rng.randint(0, 90000),
+                "raceXp": rng.randint(0, 90000),
+            }},
+            "skillRating": rng.randint(0, 5000),
+            "longestDrift": round(rng.uniform(0, 30), 3),
+            "longestHangTime": round(rng.uniform(0, 10), 3),
+            "presence": "OFFLINE",
+            "isBanned": False,
+            "createdAt": timestamp(rng),
+            "creationsCount": {"mnr": {"PS3": {"CHARACTER": 0, "KART": 0, "TRACK": 0}}},
+        })
+
+    creations = []
+    for index in range(config.creations):
+        creation_id = 10000 + index
+        creator = players[rng.randrange(len(players))]
+        creation_type = CREATION_TYPES[index % len(CREATION_TYPES)]
+        creator["creationsCount"]["mnr"]["PS3"][creation_type] += 1
+
+        creation = {
+            "playerCreationId": creation_id,
+            "name": f"{creation_type.title()} {creation_id}",
+            "description": "Lorem ipsum dolor sit amet " * rng.randint(1, 8 * config.payload_scale),
+            "rating": round(rng.uniform(0, 5), 2),
+            "creatorUsername": creator["username"],
+            "type": creation_type,
+            "tags": rng.sample(TAGS, rng.randint(0, 3)),
+            # every fifth creation is an LBP Karting one, so the isMnr filter has something to split
+            "isMNR": index % 5 != 0,
+            "platform": "PS3",
+            "createdAt": timestamp(rng),
+            "downloads": {"all_time": rng.randint(0, 5000), "this_week": rng.randint(0, 50)},
+            "views": {"all_time": rng.randint(0, 50000), "this_week": rng.randint(0, 500)},
+            "points": {"all_time": rng.randint(0, 90000), "this_week": rng.randint(0, 900)},
+        }
+        if creation_type == "TRACK":
+            creation["records"] = {
+                "bestLapTime": lap_time(rng),
+                "longestDrift": round(rng.uniform(0, 20), 3),
+                "longestHangTime": round(rng.uniform(0, 8), 3),
+            }
+        creations.append(creation)
+
+    online = []
+    for player in rng.sample(players, min(config.online, len(players))):
+        player["presence"] = rng.choice(PRESENCES)
+        online.append({
+            "userId": player["userId"],
+            "username": player["username"],
+            "presence": player["presence"],
+            "platform": "PS3",
+            "isMNR": True,
+            "isRpcn": rng.random() < 0.5,
+        })
+
+    tracks = [creation for creation in creations if creation["type"] == "TRACK"]
+
+    return World(
+        players=players,
+        players_by_name={player["username"].casefold(): player for player in players},
+        creations=creations,
+        creations_by_id={creation["playerCreationId"]: creation for creation in creations},
+        online=online,
+        hotlap_track_id=tracks[0]["playerCreationId"] if tracks else 0,
+        moderators={1: {"ID": 1, "Username": "admin"}},
+    )
+
+
+def page_of(items: list, request: web.Request, per_page_key: str = "perPage", default: int = 6) -> tuple[list, int]:
+    page = max(int(request.query.get("page", 1)), 1)
+    per_page = max(min(int(request.query.get(per_page_key, default)), 1000), 1)
+    return items[(page - 1) * per_page:page * per_page], len(items)
+
+
+def track_scores(world: World, config: MockConfig, track_id: int) -> list[dict]:
+    # seeded by track so every request for the same board sees the same standings
+    rng = random.Random(config.seed * 1_000_003 + track_id)
+    players = rng.sample(world.players, min(config.scores_per_track, len(world.players)))
+    times = sorted(rng.randint(30_000, 180_000) for _ in players)
+
+    return [
+        {
+            "rank": rank,
+            "scoreId": track_id * 10_000 + rank,
+            "playerUsername": player["username"],
+            "bestLapTime": f"{ms // 60000}:{ms // 1000 % 60}:{ms % 1000}",
+            "updatedAt": timestamp(rng),
+        }
+        for rank, (player, ms) in enumerate(zip(players, times), start=1)
+    ]
+
+
+def ok() -> web.Response:
+    return web.Response(text="ok")
+
+
+def require_token(request: web.Request) -> None:
+    if request.headers.get("Authorization") != f"Bearer {MOCK_TOKEN}":
+        raise web.HTTPForbidden()
+
+
+def create_app(config: MockConfig = MockConfig()) -> web.Application:
+    world = build_world(config)
+    stats: Counter = Counter()
+    rng = random.Random(config.seed)
+
+    @web.middleware
+    async def inject(request: web.Request, handler):
+        route = request.match_info.route.resource.canonical if request.match_info.route.resource else request.path
+        stats[f"{request.method} {route}"] += 1
+
+        if config.latency or config.jitter:
+            await asyncio.sleep(max(0.0, config.latency + rng.uniform(-config.jitter, config.jitter)))
+
+        if config.error_rate and not route.startswith("/_mock") and rng.random() < config.error_rate:
+            raise web.HTTPServiceUnavailable()
+
+        return await handler(request)
+
+    app = web.Application(middlewares=[inject])
+
+    def find_player(request: web.Request) -> dict | None:
+        if "id" in request.query:
+            user_id = int(request.query["id"])
+            return world.players[user_id - 1] if 0 < user_id <= len(world.players) else None
+        return world.players_by_name.get(request.query.get("username", "").casefold())
+
+    def filter_creations(request: web.Request, creations: list[dict]) -> list[dict]:
+        # newest first, like the live search
+        is_mnr = request.query.get("isMnr", "True").casefold() != "false"
+        creations = [creation for creation in reversed(creations) if creation["isMNR"] == is_mnr]
+        creation_type = request.query.get("type")
+        if creation_type:
+            creations = [creation for creation in creations if creation["type"] == creation_type]
+        return creations
+
+    async def username_to_id(request: web.Request) -> web.Response:
+        player = find_player(request)
+        return web.Response(text=str(player["userId"]) if player else "error_player_not_found")
+
+    async def player(request: web.Request) -> web.Response:
+        found = find_player(request)
+        return web.json_response(found or {"error": "error_player_not_found"})
+
+    async def creation(request: web.Request) -> web.Response:
+        found = world.creations_by_id.get(int(request.match_info["creation_id"]))
+        return web.json_response(found or {"error": "error_creation_not_found"})
+
+    async def creations_search(request: web.Request) -> web.Response:
+        query = request.query.get("query", "").casefold()
+        matches = filter_creations(
+            request,
+            [creation for creation in world.creations if query in creation["name"].casefold()],
+        )
+        page, total = page_of(matches, request)
+        return web.json_response({"total": total, "creations": page})
+
+    async def creations_by_username(request: web.Request) -> web.Response:
+        username = request.match_info["username"].casefold()
+        matches = filter_creations(
+            request,
+            [creation for creation in world.creations if creation["creatorUsername"].casefold() == username],
+        )
+        page, total = page_of(matches, request)
+        return web.json_response({"total": total, "creations": page})
+
+    def top(creation_type: str):
+        async def handler(request: web.Request) -> web.Response:
+            ranked = sorted(
+                (creation for creation in world.creations if creation["type"] == creation_type),
+                key=lambda creation: creation["points"]["this_week"],
+                reverse=True,
+            )
+            return web.json_response(ranked[:10])
+        return handler
+
+    async def presence(request: web.Request) -> web.Response:
+        page, total = page_of(world.online, request)
+        return web.json_response({"total": total, "presence": page})
+
+    async def session_count(request: web.Request) -> web.Response:
+        return web.Response(text=str(len(world.online)))
+
+    async def creation_count(request: web.Request) -> web.Response:
+        by_type = Counter(creation["type"] for creation in world.creations)
+        return web.json_response({"totalMNR": len(world.creations), "mnr": {"PS3": dict(by_type)}})
+
+    async def player_count(request: web.Request) -> web.Response:
+        return web.Response(text=str(len(world.players)))
+
+    async def instance_name(request: web.Request) -> web.Response:
+        return web.Response(text="Mock PLGarage")
+
+    def track_envelope(track_id: int) -> dict:
+        track = world.creations_by_id.get(track_id, {})
+        return {
+            "id": track_id,
+            "name": track.get("name"),
+            "rating": track.get("rating"),
+            "creatorUsername": track.get("creatorUsername"),
+        }
+
+    async def hotlap(request: web.Request) -> web.Response:
+        scores = track_scores(world, config, world.hotlap_track_id)[:10]
+        return web.json_response({
+            "track": track_envelope(world.hotlap_track_id),
+            "resetInSeconds": 3600,
+            "topTimes": scores,
+        })
+
+    async def score(request: web.Request) -> web.Response:
+        track_id = int(request.query.get("trackId", 0))
+        page, total = page_of(track_scores(world, config, track_id), request, default=10)
+        return web.json_response({"track": track_envelope(track_id), "total": total, "scores": page})
+
+    async def login(request: web.Request) -> web.Response:
+        if not request.query.get("login") or not request.query.get("password"):
+            return web.Response(text="error")
+        response = ok()
+        response.set_cookie("Token", MOCK_TOKEN)
+        return response
+
+    async def refresh_token(request: web.Request) -> web.Response:
+        require_token(request)
+        response = ok()
+        response.set_cookie("Token", MOCK_TOKEN)
+        return response
+
+    async def moderator_id(request: web.Request) -> web.Response:
+        require_token(request)
+        username = request.match_info["username"].casefold()
+        for moderator in world.moderators.values():
+            if moderator["Username"].casefold() == username:
+                return web.Response(text=str(moderator["ID"]))
+        raise web.HTTPNotFound()
+
+    async def write_ok(request: web.Request) -> web.Response:
+        require_token(request)
+        return ok()
+
+    async def set_status(request: web.Request) -> web.Response:
+        require_token(request)
+        creation_id = int(request.query.get("id", 0))
+        if request.query.get("status") == "BANNED":
+            world.banned_creation_ids.add(creation_id)
+        else:
+            world.banned_creation_ids.discard(creation_id)
+        return ok()
+
+    async def banned_creations(request: web.Request) -> web.Response:
+        require_token(request)
+        banned = [
+            {
+                "ID": creation_id,
+                "Name": world.creations_by_id[creation_id]["name"],
+                "Type": world.creations_by_id[creation_id]["type"],
+                "PlayerID": world.players_by_name[world.creations_by_id[creation_id]["creatorUsername"].casefold()]["userId"],
+                "IsMNR": True,
+            }
+            for creation_id in sorted(world.banned_creation_ids)
+            if creation_id in world.creations_by_id
+        ]
+        page, total = page_of(banned, request, "per_page")
+        return web.json_response({"Total": total, "Page": page})
+
+    async def remove_creation(request: web.Request) -> web.Response:
+        require_token(request)
+        if int(request.match_info["creation_id"]) not in world.creations_by_id:
+            raise web.HTTPNotFound()
+        return ok()
+
+    async def announcements(request: web.Request) -> web.Response:
+        require_token(request)
+        items = list(world.announcements.values())
+        if "platform" in request.query:
+            items = [item for item in items if str(item["Platform"]) == request.query["platform"]]
+        page, total = page_of(items, request, "per_page")
+        return web.json_response({"Total": total, "Page": page})
+
+    async def create_announcement(request: web.Request) -> web.Response:
+        require_token(request)
+        announcement_id = max(world.announcements, default=0) + 1
+        world.announcements[announcement_id] = {
+            "Id": announcement_id,
+            "Subject": request.query.get("subject"),
+            "Text": request.query.get("text"),
+            "Platform": int(request.query.get("platform", 2)),
+            "LanguageCode": request.query.get("languageCode"),
+            "CreatedAt": "2024-05-01T12:34:56.789+00:00",
+        }
+        return ok()
+
+    async def edit_announcement(request: web.Request) -> web.Response:
+        require_token(request)
+        announcement = world.announcements.get(int(request.match_info["announcement_id"]))
+        if announcement is None:
+            raise web.HTTPNotFound()
+        announcement.update(Subject=request.query.get("subject"), Text=request.query.get("text"))
+        return ok()
+
+    async def delete_announcement(request: web.Request) -> web.Response:
+        require_token(request)
+        if world.announcements.pop(int(request.match_info["announcement_id"]), None) is None:
+            raise web.HTTPNotFound()
+        return ok()
+
+    async def banned_console_ids(request: web.Request) -> web.Response:
+        require_token(request)
+        page, total = page_of(world.banned_console_ids, request, "per_page")
+        return web.json_response({"Total": total, "Page": page})
+
+    async def add_banned_console_id(request: web.Request) -> web.Response:
+        require_token(request)
+        console_id = request.query.get("consoleId", "")
+        if console_id in world.banned_console_ids:
+            return web.Response(text="error_already_exists")
+        world.banned_console_ids.append(console_id)
+        return ok()
+
+    async def remove_banned_console_id(request: web.Request) -> web.Response:
+        require_token(request)
+        console_id = request.query.get("consoleId", "")
+        if console_id not in world.banned_console_ids:
+            raise web.HTTPNotFound()
+        world.banned_console_ids.remove(console_id)
+        return ok()
+
+    async def ban_console_id_by_session(request: web.Request) -> web.Response:
+        require_token(request)
+        player_id = int(request.match_info["player_id"])
+        if not any(player["userId"] == player_id for player in world.online):
+            return web.Response(text="no_active_session")
+        console_id = f"mock:{player_id}"
+        if console_id in world.banned_console_ids:
+            return web.Response(text="error_already_exists")
+        world.banned_console_ids.append(console_id)
+        return ok()
+
+    def complaints(creation: bool):
+        async def handler(request: web.Request) -> web.Response:
+            require_token(request)
+            rng = random.Random(config.seed)
+            items = [
+                {
+                    "UserId": rng.randint(1, len(world.players)),
+                    "PlayerId": rng.randint(1, len(world.players)),
+                    "PlayerCreationId": rng.choice(world.creations)["playerCreationId"] if creation else None,
+                    "Reason": rng.choice(COMPLAINT_REASONS),
+                    "Comments": "Please look at this " * rng.randint(1, 4 * config.payload_scale),
+                }
+                for _ in range(min(50, len(world.players)))
+            ]
+            page, total = page_of(items, request, "per_page", default=1)
+            return web.json_response({"Total": total, "Page": page})
+        return handler
+
+    async def moderators(request: web.Request) -> web.Response:
+        require_token(request)
+        page, total = page_of(list(world.moderators.values()), request, "per_page")
+        return web.json_response({"Total": total, "Page": page})
+
+    async def create_moderator(request: web.Request) -> web.Response:
+        require_token(request)
+        moderator_id = max(world.moderators, default=0) + 1
+        world.moderators[moderator_id] = {"ID": moderator_id, "Username": request.query.get("username")}
+        return ok()
+
+    async def delete_moderator(request: web.Request) -> web.Response:
+        require_token(request)
+        world.moderators.pop(int(request.match_info["moderator_id"]), None)
+        return ok()
+
+    async def permissions(request: web.Request) -> web.Response:
+        require_token(request)
+        return web.json_response({"ManageModerators": True, "BanUsers": True})
+
+    async def set_username(request: web.Request) -> web.Response:
+        require_token(request)
+        return web.json_response("ok")
+
+    async def mock_stats(request: web.Request) -> web.Response:
+        return web.json_response(dict(stats))
+
+    async def mock_reset(request: web.Request) -> web.Response:
+        stats.clear()
+        return ok()
+
+    app.router.add_get("/api/usernameToId", username_to_id)
+    app.router.add_get("/api/player", player)
+    app.router.add_get("/api/creation/{creation_id:\\d+}", creation)
+    app.router.add_get("/api/creations/search", creations_search)
+    app.router.add_get("/api/creations/{username}", creations_by_username)
+    app.router.add_get("/api/topmods", top("CHARACTER"))
+    app.router.add_get("/api/topkarts", top("KART"))
+    app.router.add_get("/api/toptracks", top("TRACK"))
+    app.router.add_get("/api/playercounts/presence", presence)
+    app.router.add_get("/api/playercounts/sessioncount", session_count)
+    app.router.add_get("/api/playercounts", player_count)
+    app.router.add_get("/api/creationcount", creation_count)
+    app.router.add_get("/api/GetInstanceName", instance_name)
+    app.router.add_get("/api/hotlap", hotlap)
+    app.router.add_get("/api/score", score)
+
+    app.router.add_post("/api/moderation/login", login)
+    app.router.add_post("/api/moderation/refresh_token", refresh_token)
+    app.router.add_post("/api/moderation/setban", write_ok)
+    app.router.add_post("/api/moderation/setStatus", set_status)
+    app.router.add_post("/api/moderation/setUserQuota", write_ok)
+    app.router.add_post("/api/moderation/setUserSettings", write_ok)
+    app.router.add_get("/api/moderation/player_creations", banned_creations)
+    app.router.add_delete("/api/moderation/player_creations/{creation_id:\\d+}", remove_creation)
+    app.router.add_delete("/api/moderation/users/{player_id:\\d+}/stats", write_ok)
+    app.router.add_delete("/api/moderation/users/{player_id:\\d+}/avatar", write_ok)
+    app.router.add_delete("/api/moderation/users/{player_id:\\d+}/creations", write_ok)
+    app.router.add_get("/api/moderation/announcements", announcements)
+    app.router.add_post("/api/moderation/announcements", create_announcement)
+    app.router.add_post("/api/moderation/announcements/{announcement_id:\\d+}", edit_announcement)
+    app.router.add_delete("/api/moderation/announcements/{announcement_id:\\d+}", delete_announcement)
+    app.router.add_get("/api/moderation/banned_console_ids", banned_console_ids)
+    app.router.add_post("/api/moderation/banned_console_ids", add_banned_console_id)
+    app.router.add_delete("/api/moderation/banned_console_ids", remove_banned_console_id)
+    app.router.add_post("/api/moderation/banned_console_ids/player/{player_id:\\d+}", ban_console_id_by_session)
+    app.router.add_get("/api/moderation/player_complaints", complaints(creation=False))
+    app.router.add_get("/api/moderation/player_creation_complaints", complaints(creation=True))
+    app.router.add_get("/api/moderation/moderators", moderators)
+    app.router.add_post("/api/moderation/moderators", create_moderator)
+    app.router.add_delete("/api/moderation/moderators/{moderator_id:\\d+}", delete_moderator)
+    app.router.add_get("/api/moderation/permissions", permissions)
+    app.router.add_get("/api/moderation/set_username", set_username)
+    app.router.add_post("/api/moderation/set_password", write_ok)
+    app.router.add_post("/api/moderation/{moderator_id:\\d+}/set_permissions", write_ok)
+    app.router.add_get("/api/moderation/{username}/id", moderator_id)
+
+    app.router.add_get("/_mock/stats", mock_stats)
+    app.router.add_post("/_mock/reset", mock_reset)
+
+    return app
+
+
+async def start_mock_server(config: MockConfig, host: str = "127.0.0.1", port: int = 0) -> tuple[web.AppRunner, str]:
+    runner = web.AppRunner(create_app(config), access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+
+    bound_port = runner.addresses[0][1]
+    return runner, f"http://{host}:{bound_port}"
+
+
+def parse_args() -> argparse.Namespace:
+    defaults = MockConfig()
+    parser = argparse.ArgumentParser(description="Serve a synthetic PLGarage API for offline benchmarks.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=10050)
+    parser.add_argument("--players", type=int, default=defaults.players)
+    parser.add_argument("--creations", type=int, default=defaults.creations)
+    parser.add_argument("--online", type=int, default=defaults.online, help="players reported in presence")
+    parser.add_argument("--scores-per-track", type=int, default=defaults.scores_per_track)
+    parser.add_argument("--latency", type=float, default=defaults.latency, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=defaults.jitter, help="+/- seconds of random latency")
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate, help="fraction of requests answered with 503")
+    parser.add_argument("--payload-scale", type=int, default=defaults.payload_scale, help="multiplier for text field sizes")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    config = MockConfig(
+        players=args.players,
+        creations=args.creations,
+        online=args.online,
+        scores_per_track=args.scores_per_track,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        payload_scale=args.payload_scale,
+        seed=args.seed,
+    )
+
+    print(f"Mock PLGarage on http://{args.host}:{args.port} (moderator token: {MOCK_TOKEN})")
+    web.run_app(create_app(config), host=args.host, port=args.port, print=None, access_log=None)
+
+
+if __name__ == "__main__":
+    main()
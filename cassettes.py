@@ -0,0 +1,190 @@
+import atexit
+import base64
+import gzip
+import json
+import logging
+import os
+import threading
+import time
+import zlib
+from collections import deque
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+
+logger = logging.getLogger("skidplate.cassettes")
+
+REDACTED = "REDACTED"
+SENSITIVE_PARAMS = {"password", "token"}
+SENSITIVE_COOKIES = {"Token"}
+KEPT_HEADERS = {"Content-Type"}
+
+
+def request_key(method: str, url: str) -> str:
+    # host is dropped so a production cassette replays against any URL
+    parts = urlsplit(url)
+    query = sorted(
+        (key, REDACTED if key.lower() in SENSITIVE_PARAMS else value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+    )
+    return f"{method} {parts.path}" + (f"?{urlencode(query)}" if query else "")
+
+
+def _encode_body(content: bytes) -> dict[str, str]:
+    try:
+        return {"body": content.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"body_b64": base64.b64encode(content).decode("ascii")}
+
+
+def _decode_body(entry: dict) -> bytes:
+    if "body_b64" in entry:
+        return base64.b64decode(entry["body_b64"])
+    return entry.get("body", "").encode("utf-8")
+
+
+class RecordingAdapter(HTTPAdapter):
+    def __init__(self, path: str, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.path = path
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "ab")
+        atexit.register(self.close)
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        offset = time.perf_counter() - self.started
+        started = time.perf_counter()
+        response = super().send(request, **kwargs)
+        elapsed = time.perf_counter() - started
+
+        entry = {
+            "request": request_key(request.method, request.url),
+            "offset": round(offset, 4),
+            "elapsed": round(elapsed, 4),
+            "status": response.status_code,
+            "headers": {key: value for key, value in response.headers.items() if key in KEPT_HEADERS},
+            "cookies": {
+                name: REDACTED if name in SENSITIVE_COOKIES else value
+                for name, value in response.cookies.items()
+            },
+            **_encode_body(response.content),
+        }
+
+        # one gzip member per response, so a killed run leaves at most the last one truncated
+        line = json.dumps(entry, separators=(",", ":")) + "\n"
+        with self._lock:
+            if not self._file.closed:
+                self._file.write(gzip.compress(line.encode("utf-8")))
+                self._file.flush()
+
+        return response
+
+    def close(self) -> None:
+        super().close()
+        atexit.unregister(self.close)
+        with self._lock:
+            self._file.close()
+
+
+def read_cassette(path: str) -> list[dict]:
+    with open(path, "rb") as cassette_file:
+        data = cassette_file.read()
+
+    text = b""
+    while data:
+        decompressor = zlib.decompressobj(wbits=31)
+        try:
+            text += decompressor.decompress(data)
+        except zlib.error:
+            break
+        if not decompressor.eof:
+            break
+        data = decompressor.unused_data
+
+    entries = []
+    for line in text.decode("utf-8", errors="replace").splitlines():
+        if not line.strip():
+            continue
+        try:
+            entries.append(json.loads(line))
+        except json.JSONDecodeError:
+            # only the record being written when the recorder died can be cut short
+            logger.warning("Skipping a truncated record at the end of %s.", path)
+            break
+    return entries
+
+
+class ReplayAdapter(BaseAdapter):
+    def __init__(self, path: str, timing: str = "original") -> None:
+        super().__init__()
+        self.path = path
+        self.timing = timing
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: dict[str, deque[dict]] = {}
+
+        for entry in read_cassette(path):
+            self._entries.setdefault(entry["request"], deque()).append(entry)
+
+        logger.info(
+            "Replaying %s responses for %s requests from %s.",
+            sum(len(entries) for entries in self._entries.values()),
+            len(self._entries),
+            path,
+        )
+
+    def _next_entry(self, key: str) -> dict | None:
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                self.misses += 1
+                return None
+            # recorded order per request, the last response repeats once the run outlasts the recording
+            return entries.popleft() if len(entries) > 1 else entries[0]
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        key = request_key(request.method, request.url)
+        entry = self._next_entry(key)
+        if entry is None:
+            raise requests.ConnectionError(f"No recorded response for {key} in {self.path}.", request=request)
+
+        if self.timing == "original":
+            time.sleep(entry["elapsed"])
+
+        response = requests.Response()
+        response.status_code = entry["status"]
+        response.headers = CaseInsensitiveDict(entry.get("headers", {}))
+        response._content = _decode_body(entry)
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        response.reason = "Replayed"
+        for name, value in entry.get("cookies", {}).items():
+            response.cookies.set(name, value)
+        return response
+
+    def close(self) -> None:
+        if self.misses:
+            logger.warning("%s requests had no recorded response in %s.", self.misses, self.path)
+
+
+def install(session: requests.Session, mode: str, path: str, timing: str = "original", **adapter_kwargs) -> BaseAdapter:
+    if mode == "record":
+        adapter = RecordingAdapter(path, **adapter_kwargs)
+    elif mode == "replay":
+        adapter = ReplayAdapter(path, timing)
+    else:
+        raise ValueError(f"Unknown cassette mode {mode!r}, expected 'record' or 'replay'.")
+
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    logger.info("Cassette %s mode on %s.", mode, path)
+    return adapter
@@ -0,0 +1,477 @@
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from config import CATALOG_PATH, CATALOG_MAX_AGE
+from indexes import known_creations, known_players
+from models import Creation
+from utils import get_creations_stats_by_query, get_creations_stats_by_username
+
+
+logger = logging.getLogger("skidplate.catalog")
+
+CATALOG_PAGE_SIZE = 100
+# is_mnr values the crawler mirrors, each with its own pass and cursor
+CATALOG_SCOPES = (True, False)
+SYNC_STATE_KEYS = (
+    "page",
+    "cursor",
+    "high_water",
+    "ordered",
+    "pass_started_at",
+    "previous_pass_started_at",
+    "last_full_sync",
+)
+
+CATALOG_SORTS = {
+    "rating": "rating DESC",
+    "downloads": "downloads DESC",
+    "views": "views DESC",
+    "points": "points DESC",
+    "newest": "created_at DESC",
+    "oldest": "created_at ASC",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS creations (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL DEFAULT '',
+    creator_username TEXT,
+    type TEXT,
+    tags TEXT,
+    is_mnr INTEGER,
+    rating REAL,
+    downloads INTEGER,
+    views INTEGER,
+    points INTEGER,
+    created_at TEXT,
+    seen_at REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS creations_creator ON creations (creator_username COLLATE NOCASE);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS creations_fts USING fts5(
+    name, creator_username, tags,
+    content='creations', content_rowid='id'
+);
+
+CREATE TRIGGER IF NOT EXISTS creations_ai AFTER INSERT ON creations BEGIN
+    INSERT INTO creations_fts (rowid, name, creator_username, tags)
+    VALUES (new.id, new.name, new.creator_username, new.tags);
+END;
+
+CREATE TRIGGER IF NOT EXISTS creations_ad AFTER DELETE ON creations BEGIN
+    INSERT INTO creations_fts (creations_fts, rowid, name, creator_username, tags)
+    VALUES ('delete', old.id, old.name, old.creator_username, old.tags);
+END;
+
+CREATE TRIGGER IF NOT EXISTS creations_au AFTER UPDATE ON creations BEGIN
+    INSERT INTO creations_fts (creations_fts, rowid, name, creator_username, tags)
+    VALUES ('delete', old.id, old.name, old.creator_username, old.tags);
+    INSERT INTO creations_fts (rowid, name, creator_username, tags)
+    VALUES (new.id, new.name, new.creator_username, new.tags);
+END;
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+UPSERT = """
+INSERT INTO creations (
+    id, name, creator_username, type, tags, is_mnr,
+    rating, downloads, views, points, created_at, seen_at
+)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (id) DO UPDATE SET
+    name = excluded.name,
+    creator_username = excluded.creator_username,
+    type = excluded.type,
+    tags = excluded.tags,
+    is_mnr = excluded.is_mnr,
+    rating = excluded.rating,
+    downloads = excluded.downloads,
+    views = excluded.views,
+    points = excluded.points,
+    created_at = excluded.created_at,
+    seen_at = excluded.seen_at
+"""
+
+SELECT_COLUMNS = (
+    "c.id, c.name, c.creator_username, c.type, c.tags, c.is_mnr, "
+    "c.rating, c.downloads, c.views, c.points, c.created_at"
+)
+
+
+def _tags_to_text(tags) -> str | None:
+    if isinstance(tags, (list, tuple)):
+        return ", ".join(str(tag) for tag in tags)
+    return tags
+
+
+def _fts_query(query: str) -> str:
+    # every word has to match, and the last one may still be half typed
+    return " ".join(f'"{token}"*' for token in re.findall(r"\w+", query))
+
+
+def _row_to_creation(row) -> Creation:
+    return Creation(
+        id=row[0],
+        name=row[1],
+        creator_username=row[2],
+        type=row[3],
+        tags=row[4],
+        is_mnr=None if row[5] is None else bool(row[5]),
+        rating=row[6],
+        downloads=row[7],
+        views=row[8],
+        points=row[9],
+        created_at=row[10],
+    )
+
+
+class CreationCatalog:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(SCHEMA)
+            self._connection = connection
+
+        return self._connection
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _get_meta(self, connection: sqlite3.Connection, key: str, default=None):
+        row = connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def _set_meta(self, connection: sqlite3.Connection, key: str, value) -> None:
+        connection.execute(
+            "INSERT INTO meta (key, value) VALUES (?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+            (key, str(value)),
+        )
+
+    def upsert(self, creations: list[Creation], seen_at: float | None = None) -> int:
+        seen_at = time.time() if seen_at is None else seen_at
+        rows = [
+            (
+                int(c.id),
+                c.name or "",
+                c.creator_username,
+                c.type,
+                _tags_to_text(c.tags),
+                None if c.is_mnr is None else int(bool(c.is_mnr)),
+                c.rating,
+                c.downloads,
+                c.views,
+                c.points,
+                c.created_at,
+                seen_at,
+            )
+            for c in creations
+            if str(c.id or "").isdigit()
+        ]
+
+        if not rows:
+            return 0
+
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.executemany(UPSERT, rows)
+
+        return len(rows)
+
+    def last_full_sync(self, is_mnr: bool = True) -> float | None:
+        with self._lock:
+            value = self._get_meta(self._connect(), f"last_full_sync:{int(is_mnr)}")
+        return float(value) if value else None
+
+    def is_fresh(self, is_mnr: bool = True, max_age: int = CATALOG_MAX_AGE) -> bool:
+        last_full_sync = self.last_full_sync(is_mnr)
+        return last_full_sync is not None and time.time() - last_full_sync <= max_age
+
+    def sync_step(self, pages: int, per_page: int = CATALOG_PAGE_SIZE) -> int:
+        return sum(self._sync_scope(is_mnr, pages, per_page) for is_mnr in CATALOG_SCOPES)
+
+    def _load_state(self, is_mnr: bool) -> dict:
+        with self._lock:
+            connection = self._connect()
+            return {
+                key: self._get_meta(connection, f"{key}:{int(is_mnr)}")
+                for key in SYNC_STATE_KEYS
+            }
+
+    def _save_state(self, is_mnr: bool, state: dict) -> None:
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                for key in SYNC_STATE_KEYS:
+                    value = state.get(key)
+                    self._set_meta(connection, f"{key}:{int(is_mnr)}", "" if value is None else value)
+
+    def _fetch(self, is_mnr: bool, page: int, per_page: int) -> list[Creation] | None:
+        data = get_creations_stats_by_query("", is_mnr=is_mnr, page=page, per_page=per_page)
+        if isinstance(data, str):
+            return None
+        return [creation for creation in data.get("creations", []) if str(creation.id or "").isdigit()]
+
+    def _sync_scope(self, is_mnr: bool, pages: int, per_page: int) -> int:
+        state = self._load_state(is_mnr)
+        ordered = state["ordered"] != "0"
+        high_water = int(state["high_water"]) if state["high_water"] else None
+        page = int(state["page"] or 0)
+        cursor = int(state["cursor"]) if state["cursor"] else None
+        budget = pages
+        mirrored = 0
+
+        # new creations land on the first pages, so pick them up without waiting for the next pass
+        if ordered and high_water is not None:
+            head_page = 1
+            while budget > 0:
+                creations = self._fetch(is_mnr, head_page, per_page)
+                budget -= 1
+                if creations is None:
+                    break
+
+                newer = [creation for creation in creations if int(creation.id) > high_water]
+                mirrored += self.upsert(newer)
+                if len(newer) < len(creations) or len(creations) < per_page:
+                    break
+                head_page += 1
+
+        last_full_sync = float(state["last_full_sync"]) if state["last_full_sync"] else None
+        if not page and last_full_sync is not None and time.time() - last_full_sync < CATALOG_MAX_AGE / 2:
+            # nothing to refresh yet, the head scan keeps the mirror current in between passes
+            state["high_water"] = self._max_id(is_mnr)
+            self._save_state(is_mnr, state)
+            return mirrored
+
+        if not page:
+            page, cursor = 1, None
+            state["pass_started_at"] = time.time()
+
+        while budget > 0:
+            creations = self._fetch(is_mnr, page, per_page)
+            budget -= 1
+            if creations is None:
+                break
+
+            ids = [int(creation.id) for creation in creations]
+            if ordered and any(a <= b for a, b in zip(ids, ids[1:])):
+                logger.warning("Creation search is not sorted newest first, the catalog falls back to plain paging.")
+                ordered = False
+                state["ordered"] = 0
+
+            if ordered and cursor is not None:
+                # rows above the cursor were mirrored earlier in this pass and only moved down a page
+                creations = [creation for creation in creations if int(creation.id) < cursor]
+            mirrored += self.upsert(creations)
+            if ordered and ids:
+                cursor = min(ids) if cursor is None else min(cursor, min(ids))
+
+            if len(ids) < per_page:
+                self._finish_pass(is_mnr, state)
+                page, cursor = 0, None
+                break
+
+            page += 1
+
+        state["page"] = page
+        state["cursor"] = cursor
+        state["high_water"] = self._max_id(is_mnr)
+        self._save_state(is_mnr, state)
+        return mirrored
+
+    def _max_id(self, is_mnr: bool) -> int | None:
+        with self._lock:
+            row = self._connect().execute("SELECT MAX(id) FROM creations WHERE is_mnr = ?", (int(is_mnr),)).fetchone()
+        return row[0]
+
+    def _finish_pass(self, is_mnr: bool, state: dict) -> None:
+        previous_pass_started_at = state["previous_pass_started_at"]
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                # offset paging can skip a row that shifted pages mid-pass, so only rows missed by two passes go
+                if previous_pass_started_at:
+                    connection.execute(
+                        "DELETE FROM creations WHERE is_mnr = ? AND seen_at < ?",
+                        (int(is_mnr), float(previous_pass_started_at)),
+                    )
+
+        state["previous_pass_started_at"] = state["pass_started_at"]
+        state["pass_started_at"] = None
+        state["last_full_sync"] = time.time()
+
+    def _select_page(
+        self,
+        where: list[str],
+        params: list,
+        order_by: str,
+        page: int,
+        per_page: int,
+        join_fts: bool = False,
+    ) -> dict:
+        source = "creations c"
+        if join_fts:
+            source = "creations_fts JOIN creations c ON c.id = creations_fts.rowid"
+
+        clause = f"WHERE {' AND '.join(where)}" if where else ""
+        offset = max(page - 1, 0) * per_page
+
+        with self._lock:
+            connection = self._connect()
+            total = connection.execute(f"SELECT COUNT(*) FROM {source} {clause}", params).fetchone()[0]
+            rows = connection.execute(
+                f"SELECT {SELECT_COLUMNS} FROM {source} {clause} "
+                f"ORDER BY {order_by} LIMIT ? OFFSET ?",
+                [*params, per_page, offset],
+            ).fetchall()
+
+        return {
+            "total": total,
+            "creations": [_row_to_creation(row) for row in rows],
+        }
+
+    def search(
+        self,
+        query: str,
+        creation_type=None,
+        is_mnr=None,
+        sort=None,
+        page=1,
+        per_page=6,
+    ) -> dict:
+        where: list[str] = []
+        params: list = []
+        fts_query = _fts_query(query or "")
+
+        if fts_query:
+            where.append("creations_fts MATCH ?")
+            params.append(fts_query)
+
+        if creation_type is not None:
+            where.append("c.type = ?")
+            params.append(creation_type)
+
+        where.append("c.is_mnr = ?")
+        params.append(int(True if is_mnr is None else is_mnr))
+
+        if sort in CATALOG_SORTS:
+            order_by = f"c.{CATALOG_SORTS[sort]}, c.id DESC"
+        elif fts_query:
+            order_by = "creations_fts.rank, c.id DESC"
+        else:
+            order_by = "c.id DESC"
+
+        return self._select_page(where, params, order_by, page, per_page, join_fts=bool(fts_query))
+
+    def by_creator(
+        self,
+        username: str,
+        creation_type=None,
+        is_mnr=None,
+        sort=None,
+        page=1,
+        per_page=6,
+    ) -> dict:
+        where = ["c.creator_username = ? COLLATE NOCASE"]
+        params: list = [username]
+
+        if creation_type is not None:
+            where.append("c.type = ?")
+            params.append(creation_type)
+
+        where.append("c.is_mnr = ?")
+        params.append(int(True if is_mnr is None else is_mnr))
+
+        order_by = f"c.{CATALOG_SORTS.get(sort, CATALOG_SORTS['newest'])}, c.id DESC"
+        return self._select_page(where, params, order_by, page, per_page)
+
+    def load_indexes(self) -> int:
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT id, name, creator_username, type FROM creations"
+            ).fetchall()
+
+        known_creations.add_many(rows)
+        known_players.add_many(row[2] for row in rows)
+        return len(rows)
+
+
+creation_catalog = CreationCatalog(CATALOG_PATH)
+
+
+# the mirror has no platform column, so platform filtered searches always go upstream
+def _mirror_unavailable(platform, sort) -> str | None:
+    # the API can't sort, so a sorted search it would have to answer is refused rather than shown unsorted
+    if sort is None:
+        return None
+    if platform is not None:
+        return "Error: Sorting is not available together with a platform filter."
+    return "Error: Sorting is not available while the creation catalog is syncing. Try again later or search without sorting."
+
+
+def search_creations(
+    query,
+    creation_type=None,
+    platform=None,
+    is_mnr=None,
+    sort=None,
+    page=1,
+    per_page=6,
+):
+    if platform is None and creation_catalog.is_fresh(is_mnr is not False):
+        return creation_catalog.search(query, creation_type, is_mnr, sort, page, per_page)
+
+    error = _mirror_unavailable(platform, sort)
+    if error is not None:
+        return error
+
+    data = get_creations_stats_by_query(query, creation_type, platform, is_mnr, page, per_page)
+    if isinstance(data, dict):
+        creation_catalog.upsert(data.get("creations", []))
+    return data
+
+
+def search_creations_by_username(
+    username,
+    creation_type=None,
+    platform=None,
+    is_mnr=None,
+    sort=None,
+    page=1,
+    per_page=6,
+):
+    if platform is None and creation_catalog.is_fresh(is_mnr is not False):
+        return creation_catalog.by_creator(username, creation_type, is_mnr, sort, page, per_page)
+
+    error = _mirror_unavailable(platform, sort)
+    if error is not None:
+        return error
+
+    data = get_creations_stats_by_username(username, creation_type, platform, is_mnr, page, per_page)
+    if isinstance(data, dict):
+        creation_catalog.upsert(data.get("creations", []))
+    return data
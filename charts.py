@@ -0,0 +1,125 @@
+import asyncio
+import io
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+from history import DAY, HOUR, history_store
+
+
+HISTORY_WINDOWS = {
+    "24h": (DAY, HOUR),
+    "7d": (7 * DAY, HOUR),
+    "30d": (30 * DAY, DAY),
+}
+
+_chart_pool: ProcessPoolExecutor | None = None
+_chart_cache: dict[tuple[int, int], tuple[int | None, bytes]] = {}
+_chart_renders: dict[tuple[int, int, int | None], asyncio.Task] = {}
+
+
+# runs inside the process pool, so it only gets plain lists and returns png bytes
+def render_history_chart(
+    title: str,
+    players_online: list[tuple[int, float, float]],
+    total_creations: list[tuple[int, float]],
+) -> bytes:
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.dates as mdates
+    import matplotlib.pyplot as plt
+
+    figure, (players_axis, creations_axis) = plt.subplots(
+        2, 1, figsize=(8, 5), sharex=True, constrained_layout=True
+    )
+    figure.suptitle(title)
+
+    if players_online:
+        times = [datetime.fromtimestamp(ts, timezone.utc) for ts, _, _ in players_online]
+        players_axis.plot(times, [average for _, average, _ in players_online], label="Average")
+        players_axis.plot(times, [peak for _, _, peak in players_online], label="Peak", alpha=0.6)
+        players_axis.legend(loc="upper left")
+    players_axis.set_ylabel("Players Online")
+    players_axis.grid(alpha=0.3)
+
+    if total_creations:
+        times = [datetime.fromtimestamp(ts, timezone.utc) for ts, _ in total_creations]
+        creations_axis.plot(times, [value for _, value in total_creations], color="tab:green")
+    creations_axis.set_ylabel("Total Creations")
+    creations_axis.grid(alpha=0.3)
+    creations_axis.xaxis.set_major_formatter(mdates.DateFormatter("%m-%d %H:%M"))
+    figure.autofmt_xdate()
+
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format="png", dpi=100)
+    plt.close(figure)
+    return buffer.getvalue()
+
+
+def _load_series(window: int, bucket: int, now: int) -> tuple[list, list]:
+    players_online = [
+        (row[0], row[2] / row[1], row[4])
+        for row in history_store.rollups("players_online", bucket, now - window, now)
+    ]
+    total_creations = [
+        (row[0], row[5])
+        for row in history_store.rollups("total_creations", bucket, now - window, now)
+    ]
+    return players_online, total_creations
+
+
+def _get_chart_pool() -> ProcessPoolExecutor:
+    global _chart_pool
+    if _chart_pool is None:
+        # forking a process that already runs the loop, the http pool and the log listener can copy a held lock
+        _chart_pool = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+    return _chart_pool
+
+
+def shutdown_chart_pool() -> None:
+    global _chart_pool
+    if _chart_pool is not None:
+        _chart_pool.shutdown(wait=False, cancel_futures=True)
+        _chart_pool = None
+
+
+async def _render_history_chart(window_name: str, last_sample_at: int) -> bytes | None:
+    window, bucket = HISTORY_WINDOWS[window_name]
+
+    players_online, total_creations = await asyncio.to_thread(_load_series, window, bucket, last_sample_at)
+    if not players_online and not total_creations:
+        return None
+
+    loop = asyncio.get_running_loop()
+    image = await loop.run_in_executor(
+        _get_chart_pool(),
+        render_history_chart,
+        f"Server History ({window_name})",
+        players_online,
+        total_creations,
+    )
+
+    _chart_cache[(window, bucket)] = (last_sample_at, image)
+    return image
+
+
+async def get_history_chart(window_name: str) -> bytes | None:
+    window, bucket = HISTORY_WINDOWS[window_name]
+    last_sample_at = await asyncio.to_thread(history_store.latest_sample_at)
+    if last_sample_at is None:
+        return None
+
+    # the chart only changes when a new sample lands, so reuse it until then
+    cached = _chart_cache.get((window, bucket))
+    if cached is not None and cached[0] == last_sample_at:
+        return cached[1]
+
+    # requests that arrive while the chart is rendering wait for the same render
+    key = (window, bucket, last_sample_at)
+    task = _chart_renders.get(key)
+    if task is None:
+        task = asyncio.create_task(_render_history_chart(window_name, last_sample_at))
+        _chart_renders[key] = task
+        task.add_done_callback(lambda _: _chart_renders.pop(key, None))
+
+    return await asyncio.shield(task)
@@ -1,16 +1,30 @@
 import discord
 from discord import app_commands
-from discord.ext import commands
+from discord.ext import commands, tasks
 import asyncio
 import math
 from typing import Callable, Any
 
-from config import URL
+from catalog import creation_catalog, search_creations, search_creations_by_username
+from config import URL, CATALOG_SYNC_INTERVAL, CATALOG_PAGES_PER_SYNC, PAGINATION_DEBOUNCE
+from indexes import creation_id_autocomplete, username_autocomplete
+import models
+from ratelimits import Debounce
 from utils import *
 
 
+CATALOG_SORT_CHOICES = [
+    app_commands.Choice(name="Rating", value="rating"),
+    app_commands.Choice(name="Downloads", value="downloads"),
+    app_commands.Choice(name="Views", value="views"),
+    app_commands.Choice(name="Total XP", value="points"),
+    app_commands.Choice(name="Newest", value="newest"),
+    app_commands.Choice(name="Oldest", value="oldest"),
+]
+
+
 def build_creations_list_embed(
-    creations: list[dict],
+    creations: list[models.Creation],
     interaction: discord.Interaction,
     current_page: int,
     total_pages: int,
@@ -23,15 +37,15 @@ def build_creations_list_embed(
     )
 
     for i, c in enumerate(creations, start=1):
-        id_ = c.get("id")
-        name = c.get("name")
-        creator = c.get("creatorUsername")
-        type_ = rename_creation_type(c.get("type"))
-        rating = c.get("rating")
+        id_ = c.id
+        name = c.name
+        creator = c.creator_username
+        type_ = rename_creation_type(c.type)
+        rating = c.rating
         value = (
             f"Creator: {creator}\n"
             f"Type: {type_} | Rating: {rating}\n"
-            f"Total XP: {c.get('points')} | Downloads: {c.get('downloads')} | Views: {c.get('views')}"
+            f"Total XP: {c.points} | Downloads: {c.downloads} | Views: {c.views}"
         )
         embed.add_field(
             name=f"{name} `{id_}`",
@@ -46,21 +60,21 @@ def build_creations_list_embed(
     return embed
 
 
-def build_topcreations_embed(top_creations: list[dict], interaction: discord.Interaction, title: str) -> discord.Embed:
+def build_topcreations_embed(top_creations: list[models.Creation], interaction: discord.Interaction, title: str) -> discord.Embed:
     embed = discord.Embed(
         title=title,
         color=discord.Color.gold()
     )
 
     for rank, creation in enumerate(top_creations, start=1):
-        creation_id = creation.get("id")
-        name = creation.get("name")
-        description = creation.get("description")
-        creator = creation.get("creatorUsername")
-        rating = creation.get("rating")
-        points = creation.get("points")
-        downloads = creation.get("downloads")
-        views = creation.get("views")
+        creation_id = creation.id
+        name = creation.name
+        description = creation.description
+        creator = creation.creator_username
+        rating = creation.rating
+        points = creation.points
+        downloads = creation.downloads
+        views = creation.views
 
         embed.add_field(
             name=f"#{rank} | {name} `{creation_id}`",
@@ -80,7 +94,7 @@ def build_topcreations_embed(top_creations: list[dict], interaction: discord.Int
     return embed
 
 
-def normalize_creations_payload(data: Any) -> tuple[list[dict], int]:
+def normalize_creations_payload(data: Any) -> tuple[list[models.Creation], int]:
     if isinstance(data, list):
         return data, len(data)
 
@@ -103,6 +117,7 @@ class CreationListView(discord.ui.View):
         total_results: int,
     ):
         super().__init__(timeout=120)
+        self.debounce = Debounce(PAGINATION_DEBOUNCE)
         self.interaction = interaction
         self.fetch_function = fetch_function
         self.fetch_kwargs = fetch_kwargs
@@ -154,7 +169,7 @@ class CreationListView(discord.ui.View):
             await interaction.response.send_message("Only the original user can change pages.", ephemeral=True)
             return
         await interaction.response.defer()
-        if self.current_page <= 1:
+        if self.current_page <= 1 or not self.debounce.ready():
             return
         await self._fetch_and_update(interaction, self.current_page - 1)
 
@@ -164,7 +179,7 @@ class CreationListView(discord.ui.View):
             await interaction.response.send_message("Only the original user can change pages.", ephemeral=True)
             return
         await interaction.response.defer()
-        if self.current_page >= self.total_pages:
+        if self.current_page >= self.total_pages or not self.debounce.ready():
             return
         await self._fetch_and_update(interaction, self.current_page + 1)
 
@@ -206,9 +221,37 @@ async def send_paginated_creation_list(
 class Creation(commands.Cog):
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
+        self._warmup_task: asyncio.Task | None = None
+
+    async def cog_load(self) -> None:
+        # top lists seed the creation name index so autocomplete works before anyone searches
+        self._warmup_task = asyncio.create_task(self._warm_creation_index())
+        self.catalog_sync.start()
+
+    async def cog_unload(self) -> None:
+        if self._warmup_task is not None:
+            self._warmup_task.cancel()
+        self.catalog_sync.cancel()
+
+    async def _warm_creation_index(self) -> None:
+        await asyncio.to_thread(creation_catalog.load_indexes)
+
+        for fetch_function in (get_topmods, get_topkarts, get_toptracks):
+            try:
+                await asyncio.to_thread(fetch_function)
+            except requests.RequestException:
+                continue
+
+    @tasks.loop(seconds=CATALOG_SYNC_INTERVAL)
+    async def catalog_sync(self) -> None:
+        try:
+            await asyncio.to_thread(creation_catalog.sync_step, CATALOG_PAGES_PER_SYNC)
+        except requests.RequestException:
+            pass
 
     @app_commands.command(name="creation_id", description="Get a creation's stats by its ID.")
-    @app_commands.describe(creation_id="The creation ID to get stats for")
+    @app_commands.describe(creation_id="The creation ID (or start typing its name)")
+    @app_commands.autocomplete(creation_id=creation_id_autocomplete)
     async def creation_id(self, interaction: discord.Interaction, creation_id: int) -> None:
         if creation_id < 10000:
             await interaction.response.send_message("Error: Creation not found.", ephemeral=True)
@@ -222,22 +265,22 @@ class Creation(commands.Cog):
             await interaction.followup.send(creation_stats, ephemeral=True)
             return
         
-        embed = discord.Embed(title=f"{creation_stats.get('name')}")
-        embed.description = f"By: _{creation_stats.get('creatorUsername')}_"
+        embed = discord.Embed(title=f"{creation_stats.name}")
+        embed.description = f"By: _{creation_stats.creator_username}_"
         embed.set_thumbnail(url=f"{URL}/player_creations/{creation_id}/preview_image.png")
-        embed.add_field(name="Description", value=f"> {creation_stats.get('description')}", inline=False)
+        embed.add_field(name="Description", value=f"> {creation_stats.description}", inline=False)
         
-        embed.add_field(name="Rating", value=creation_stats.get("rating"), inline=True)
-        embed.add_field(name="Type", value=rename_creation_type(creation_stats.get("type")), inline=True)
-        embed.add_field(name="Total XP", value=creation_stats.get("points"), inline=True)
+        embed.add_field(name="Rating", value=creation_stats.rating, inline=True)
+        embed.add_field(name="Type", value=rename_creation_type(creation_stats.type), inline=True)
+        embed.add_field(name="Total XP", value=creation_stats.points, inline=True)
         
-        embed.add_field(name="Downloads", value=creation_stats.get("downloads"), inline=True)
-        embed.add_field(name="Views", value=creation_stats.get("views"), inline=True)
+        embed.add_field(name="Downloads", value=creation_stats.downloads, inline=True)
+        embed.add_field(name="Views", value=creation_stats.views, inline=True)
         
-        if creation_stats.get("tags") != None:
-            embed.add_field(name="Tags", value=creation_stats.get("tags"), inline=False)
+        if creation_stats.tags != None:
+            embed.add_field(name="Tags", value=creation_stats.tags, inline=False)
             
-        embed.add_field(name="Created", value=convert_datetime_to_discord_date(creation_stats.get("createdAt")), inline=False)
+        embed.add_field(name="Created", value=convert_datetime_to_discord_date(creation_stats.created_at), inline=False)
         
         embed.set_footer(text=f"Requested by: {interaction.user}", icon_url=interaction.user.display_avatar.url)
 
@@ -248,7 +291,8 @@ class Creation(commands.Cog):
         creation_name="Name to search",
         creation_type="Type of creation",
         platform="Platform",
-        is_mnr="Is MNR?"
+        is_mnr="Is MNR?",
+        sort="Sort results (served from the local catalog mirror)"
     )
     @app_commands.choices(creation_type=[
         app_commands.Choice(name="Track", value="TRACK"),
@@ -260,6 +304,7 @@ class Creation(commands.Cog):
         app_commands.Choice(name="PSV", value="PSV"),
         app_commands.Choice(name="PSP", value="PSP")
     ])
+    @app_commands.choices(sort=CATALOG_SORT_CHOICES)
     async def creation_query(
         self,
         interaction: discord.Interaction,
@@ -267,15 +312,17 @@ class Creation(commands.Cog):
         creation_type: str | None = None,
         platform: str | None = None,
         is_mnr: bool | None = None,
+        sort: str | None = None,
     ):
         await send_paginated_creation_list(
             interaction,
-            fetch_function=get_creations_stats_by_query,
+            fetch_function=search_creations,
             fetch_kwargs={
                 "query": creation_name,
                 "creation_type": creation_type,
                 "platform": platform,
                 "is_mnr": is_mnr,
+                "sort": sort,
             }
         )
 
@@ -284,8 +331,10 @@ class Creation(commands.Cog):
         username="Player username to search",
         creation_type="Type of creation",
         platform="Platform",
-        is_mnr="Is MNR?"
+        is_mnr="Is MNR?",
+        sort="Sort results (served from the local catalog mirror)"
     )
+    @app_commands.autocomplete(username=username_autocomplete)
     @app_commands.choices(creation_type=[
             app_commands.Choice(name="Track", value="TRACK"),
             app_commands.Choice(name="Kart", value="KART"),
@@ -296,6 +345,7 @@ class Creation(commands.Cog):
             app_commands.Choice(name="PSV", value="PSV"),
             app_commands.Choice(name="PSP", value="PSP")
     ])
+    @app_commands.choices(sort=CATALOG_SORT_CHOICES)
     async def creation_player(
         self,
         interaction: discord.Interaction,
@@ -303,15 +353,17 @@ class Creation(commands.Cog):
         creation_type: str | None = None,
         platform: str | None = None,
         is_mnr: bool | None = None,
+        sort: str | None = None,
     ):
         await send_paginated_creation_list(
             interaction,
-            fetch_function=get_creations_stats_by_username,
+            fetch_function=search_creations_by_username,
             fetch_kwargs={
                 "username": username,
                 "creation_type": creation_type,
                 "platform": platform,
                 "is_mnr": is_mnr,
+                "sort": sort,
             }
         )
 
@@ -328,7 +380,7 @@ class Creation(commands.Cog):
             return
 
         embed = build_topcreations_embed(top_mods, interaction, title="Top Mods")
-        embed.set_thumbnail(url=f"{URL}/player_creations/{top_mods[0].get('id')}/preview_image.png")
+        embed.set_thumbnail(url=f"{URL}/player_creations/{top_mods[0].id}/preview_image.png")
         await interaction.followup.send(embed=embed)
         
     @app_commands.command(name="topkarts", description="Get the top karts.")
@@ -344,7 +396,7 @@ class Creation(commands.Cog):
             return
 
         embed = build_topcreations_embed(top_karts, interaction, title="Top Karts")
-        embed.set_thumbnail(url=f"{URL}/player_creations/{top_karts[0].get('id')}/preview_image.png")
+        embed.set_thumbnail(url=f"{URL}/player_creations/{top_karts[0].id}/preview_image.png")
         await interaction.followup.send(embed=embed)
         
     @app_commands.command(name="toptracks", description="Get the top tracks.")
@@ -360,7 +412,7 @@ class Creation(commands.Cog):
             return
 
         embed = build_topcreations_embed(top_tracks, interaction, title="Top Tracks")
-        embed.set_thumbnail(url=f"{URL}/player_creations/{top_tracks[0].get('id')}/preview_image.png")
+        embed.set_thumbnail(url=f"{URL}/player_creations/{top_tracks[0].id}/preview_image.png")
         await interaction.followup.send(embed=embed)
         
 
@@ -0,0 +1,483 @@
+import discord
+from discord import app_commands
+from discord.ext import commands
+import asyncio
+import io
+import logging
+import os
+from typing import Literal
+
+import endpoints
+from config import METRICS_HOST, METRICS_PORT, LOOP_WATCHDOG_INTERVAL
+from memory import MemoryReport, describe_frame, format_report, memory_tracker
+from metrics import EndpointSummary, Histogram, MetricsServer, request_metrics
+from profiler import SamplingProfiler, describe_code
+from stalls import Stall, loop_watchdog
+from tracing import Trace, traces
+from utils import *
+
+
+logger = logging.getLogger("skidplate.debug")
+
+EMBED_DESCRIPTION_LIMIT = 4096
+EMBED_FIELD_LIMIT = 1024
+TRACE_UPSTREAM_ROWS = 5
+STALL_ROWS = 3
+STALL_FRAMES = 6
+PROFILE_SUMMARY_ROWS = 8
+MEMORY_SUMMARY_ROWS = 5
+
+
+def format_seconds(seconds: float | None) -> str:
+    if seconds is None:
+        return "-"
+    if seconds < 1:
+        return f"{seconds * 1000:.0f}ms"
+    return f"{seconds:.2f}s"
+
+
+def format_bytes(size: float) -> str:
+    if size < 1024:
+        return f"{size:.0f}B"
+    return f"{size / 1024:.1f}K"
+
+
+def build_metrics_embed(
+    summaries: list[EndpointSummary],
+    interaction: discord.Interaction,
+    since: float,
+) -> discord.Embed:
+    embed = discord.Embed(
+        title="PLGarage API Metrics",
+        color=discord.Color.blurple(),
+    )
+
+    if not summaries:
+        embed.description = f"No upstream calls recorded since <t:{int(since)}:R>."
+    else:
+        header = f"{'endpoint':<24} {'calls':>5} {'fail':>4} {'p50':>6} {'p95':>6} {'max':>6} {'size':>6}"
+        rows = [header]
+        for summary in summaries:
+            rows.append(
+                f"{summary.endpoint[:24]:<24} {summary.requests:>5} {summary.failures:>4} "
+                f"{format_seconds(summary.p50):>6} {format_seconds(summary.p95):>6} "
+                f"{format_seconds(summary.max):>6} {format_bytes(summary.average_size):>6}"
+            )
+
+        table = ""
+        for row in rows:
+            if len(table) + len(row) + 64 > EMBED_DESCRIPTION_LIMIT:
+                break
+            table += row + "\n"
+
+        embed.description = f"Since <t:{int(since)}:R>, slowest p95 first.\n```\n{table}```"
+
+        problems = []
+        for summary in summaries:
+            details = [f"{status}×{count}" for status, count in sorted(summary.statuses.items()) if status >= 400]
+            details += [f"{error}×{count}" for error, count in sorted(summary.errors.items())]
+            if details:
+                problems.append(f"`{summary.endpoint}`: {', '.join(details)}")
+
+        if problems:
+            embed.add_field(name="Failures", value="\n".join(problems)[:1024], inline=False)
+
+    events: dict[str, int] = {}
+    for key, count in endpoints.counters.items():
+        event = key.rpartition(".")[2]
+        events[event] = events.get(event, 0) + count
+
+    embed.add_field(
+        name="Client",
+        value=(
+            f"Cache hits: `{events.get('cache_hits', 0)}` | "
+            f"Coalesced: `{events.get('coalesced', 0)}` | "
+            f"Retries: `{events.get('retries', 0)}`"
+        ),
+        inline=False,
+    )
+
+    embed.set_footer(
+        text=f"Requested by: {interaction.user}",
+        icon_url=interaction.user.display_avatar.url,
+    )
+    return embed
+
+
+def format_trace(trace: Trace) -> str:
+    lines = [f"<t:{int(trace.started_at)}:R> by <@{trace.user_id}>" + (f" | **{trace.error}**" if trace.error else "")]
+
+    for trace_span in trace.spans:
+        lines.append(
+            f"`{trace_span.name}` {format_seconds(trace_span.duration)} "
+            f"(at +{format_seconds(trace_span.offset)})"
+        )
+
+    if trace.upstream:
+        lines.append(
+            f"Upstream: **{len(trace.upstream)}** calls, "
+            f"{format_seconds(trace.upstream_time)} total"
+        )
+        for record in sorted(trace.upstream, key=lambda record: record.elapsed, reverse=True)[:TRACE_UPSTREAM_ROWS]:
+            lines.append(f"- `{record.endpoint}` {record.status or record.error} {format_seconds(record.elapsed)}")
+
+    return "\n".join(lines)[:EMBED_FIELD_LIMIT]
+
+
+def build_traces_embed(
+    slowest: list[Trace],
+    percentiles: dict[str, tuple[int, float, float, float]],
+    interaction: discord.Interaction,
+) -> discord.Embed:
+    embed = discord.Embed(
+        title="Command Traces",
+        color=discord.Color.blurple(),
+    )
+
+    if not percentiles:
+        embed.description = "No commands traced yet."
+    else:
+        header = f"{'command':<24} {'n':>4} {'p50':>6} {'p95':>6} {'p99':>6}"
+        rows = [header]
+        for command, (count, p50, p95, p99) in sorted(percentiles.items(), key=lambda item: item[1][2], reverse=True):
+            rows.append(
+                f"{command[:24]:<24} {count:>4} {format_seconds(p50):>6} "
+                f"{format_seconds(p95):>6} {format_seconds(p99):>6}"
+            )
+
+        table = ""
+        for row in rows:
+            if len(table) + len(row) + 16 > EMBED_DESCRIPTION_LIMIT // 2:
+                break
+            table += row + "\n"
+
+        embed.description = f"```\n{table}```"
+
+    for trace in slowest:
+        embed.add_field(
+            name=f"#{trace.id} /{trace.command} | {format_seconds(trace.duration)}",
+            value=format_trace(trace),
+            inline=False,
+        )
+
+    embed.set_footer(
+        text=f"Requested by: {interaction.user}",
+        icon_url=interaction.user.display_avatar.url,
+    )
+    return embed
+
+
+def format_stall(stall: Stall) -> str:
+    # frames from our own code point at the offender, the innermost frame shows what it was waiting on
+    frames = stall.project_frames[-STALL_FRAMES:]
+    if stall.stack and (not frames or frames[-1] is not stall.stack[-1]):
+        frames.append(stall.stack[-1])
+
+    stack = "\n".join(
+        f"{os.path.basename(frame.filename)}:{frame.lineno} in {frame.name}\n    {frame.line or ''}"
+        for frame in frames
+    )
+    gateway = format_seconds(stall.gateway_latency) if stall.gateway_latency is not None else "-"
+    header = f"<t:{int(stall.started_at)}:R> | gateway latency {gateway}" + (" | **still blocked**" if stall.ongoing else "")
+    return f"{header}\n```\n{stack[:EMBED_FIELD_LIMIT - len(header) - 16]}\n```"
+
+
+def build_loop_embed(
+    lag: Histogram,
+    stalls: list[Stall],
+    gateway_latency: float | None,
+    interaction: discord.Interaction,
+    since: float,
+) -> discord.Embed:
+    embed = discord.Embed(
+        title="Event Loop",
+        color=discord.Color.blurple(),
+    )
+
+    embed.description = (
+        f"Since <t:{int(since)}:R>, sampled every {format_seconds(loop_watchdog.interval)}.\n"
+        f"Lag p50: `{format_seconds(lag.quantile(0.50))}` | "
+        f"p95: `{format_seconds(lag.quantile(0.95))}` | "
+        f"p99: `{format_seconds(lag.quantile(0.99))}` | "
+        f"max: `{format_seconds(lag.max if lag.count else None)}`\n"
+        f"Gateway heartbeat latency: `{format_seconds(gateway_latency)}`\n"
+        f"Blocked for more than {format_seconds(loop_watchdog.threshold)}: **{len(stalls)}** times"
+    )
+
+    for stall in sorted(stalls, key=lambda stall: stall.duration, reverse=True)[:STALL_ROWS]:
+        embed.add_field(
+            name=f"Blocked {format_seconds(stall.duration)}",
+            value=format_stall(stall),
+            inline=False,
+        )
+
+    embed.set_footer(
+        text=f"Requested by: {interaction.user}",
+        icon_url=interaction.user.display_avatar.url,
+    )
+    return embed
+
+
+def build_profile_embed(profiler: SamplingProfiler, interaction: discord.Interaction) -> discord.Embed:
+    busy = profiler.samples - profiler.idle
+    embed = discord.Embed(
+        title="Profile",
+        description=(
+            f"Sampled **{format_seconds(profiler.duration)}** every {format_seconds(profiler.interval)}, "
+            f"**{profiler.commands}** commands completed.\n"
+            f"Samples: `{profiler.samples}` | Busy: `{busy}` | Idle: `{profiler.idle}`"
+        ),
+        color=discord.Color.blurple(),
+    )
+
+    if busy:
+        rows = "\n".join(
+            f"{count / busy:>6.1%} {describe_code(code)}"
+            for code, count in profiler.self_counts.most_common(PROFILE_SUMMARY_ROWS)
+        )
+        embed.add_field(name="Hottest functions (self)", value=f"```\n{rows[:EMBED_FIELD_LIMIT - 8]}\n```", inline=False)
+
+    embed.set_footer(
+        text=f"Requested by: {interaction.user}",
+        icon_url=interaction.user.display_avatar.url,
+    )
+    return embed
+
+
+def build_memory_embed(report: MemoryReport, interaction: discord.Interaction) -> discord.Embed:
+    def size(value: int | None) -> str:
+        return "-" if value is None else f"{value / 1024 / 1024:.1f} MiB"
+
+    embed = discord.Embed(
+        title="Memory",
+        description=f"RSS: `{size(report.rss)}` | Traced: `{size(report.traced)}` | Traced peak: `{size(report.peak)}`",
+        color=discord.Color.blurple(),
+    )
+
+    if report.traced is None:
+        embed.description += "\nAllocation tracing is off, run `/debug memory action:start` to begin."
+
+    embed.add_field(
+        name="Live views",
+        value="\n".join(f"`{name}`: **{count}**" for name, count in report.views.most_common(10)) or "None",
+        inline=False,
+    )
+
+    if report.growth:
+        rows = "\n".join(
+            f"{diff.size_diff / 1024:>+9.1f}K {describe_frame(diff.traceback[0])}"
+            for diff in report.growth[:MEMORY_SUMMARY_ROWS]
+        )
+        embed.add_field(
+            name=f"Growth since <t:{int(report.since)}:R>" if report.since else "Growth",
+            value=f"```\n{rows[:EMBED_FIELD_LIMIT - 8]}\n```",
+            inline=False,
+        )
+
+    if report.top:
+        rows = "\n".join(
+            f"{statistic.size / 1024:>9.1f}K {describe_frame(statistic.traceback[0])}"
+            for statistic in report.top[:MEMORY_SUMMARY_ROWS]
+        )
+        embed.add_field(name="Largest allocation sites", value=f"```\n{rows[:EMBED_FIELD_LIMIT - 8]}\n```", inline=False)
+
+    embed.set_footer(
+        text=f"Requested by: {interaction.user}",
+        icon_url=interaction.user.display_avatar.url,
+    )
+    return embed
+
+
+async def traced_command_autocomplete(
+    interaction: discord.Interaction,
+    current: str,
+) -> list[app_commands.Choice[str]]:
+    current = current.casefold()
+    commands_seen = sorted({trace.command for trace in traces.snapshot()})
+    return [
+        app_commands.Choice(name=command, value=command)
+        for command in commands_seen
+        if current in command.casefold()
+    ][:25]
+
+
+class Debug(commands.Cog):
+    def __init__(self, bot: commands.Bot) -> None:
+        self.bot = bot
+        self.metrics_server = MetricsServer(METRICS_HOST, METRICS_PORT) if METRICS_PORT else None
+        self.profiler: SamplingProfiler | None = None
+        self.profile_command_limit: int | None = None
+        self.profile_done = asyncio.Event()
+
+    async def cog_load(self) -> None:
+        if LOOP_WATCHDOG_INTERVAL:
+            loop_watchdog.start(lambda: self.bot.latency)
+
+        if self.metrics_server is None:
+            return
+
+        try:
+            await self.metrics_server.start()
+        except OSError as exc:
+            logger.error("Unable to serve metrics on %s:%s: %s", METRICS_HOST, METRICS_PORT, exc)
+
+    async def cog_unload(self) -> None:
+        await loop_watchdog.stop()
+
+        if self.metrics_server is not None:
+            await self.metrics_server.stop()
+
+    @commands.Cog.listener()
+    async def on_app_command_completion(self, interaction: discord.Interaction, command) -> None:
+        if self.profiler is None:
+            return
+
+        self.profiler.commands += 1
+        if self.profile_command_limit is not None and self.profiler.commands >= self.profile_command_limit:
+            self.profile_done.set()
+
+    async def _require_moderator_role(self, interaction: discord.Interaction) -> bool:
+        if has_moderator_role(interaction):
+            return True
+
+        await interaction.response.send_message(
+            "Error: You do not have permission to use debug commands.",
+            ephemeral=True,
+        )
+        return False
+
+    debug = app_commands.Group(name="debug", description="Bot diagnostics")
+
+    @debug.command(name="metrics", description="Latency, status codes and errors per PLGarage endpoint")
+    @app_commands.describe(reset="Clear the collected metrics after showing them")
+    async def metrics(self, interaction: discord.Interaction, reset: bool = False):
+        if not await self._require_moderator_role(interaction):
+            return
+
+        embed = build_metrics_embed(request_metrics.summaries(), interaction, request_metrics.started_at)
+        if reset:
+            request_metrics.reset()
+            endpoints.counters.clear()
+
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @debug.command(name="traces", description="Slowest recent commands and latency percentiles")
+    @app_commands.describe(
+        command="Only show traces for this command",
+        limit="How many of the slowest traces to show",
+    )
+    @app_commands.autocomplete(command=traced_command_autocomplete)
+    async def show_traces(
+        self,
+        interaction: discord.Interaction,
+        command: str | None = None,
+        limit: app_commands.Range[int, 1, 10] = 5,
+    ):
+        if not await self._require_moderator_role(interaction):
+            return
+
+        percentiles = traces.percentiles()
+        if command is not None:
+            percentiles = {name: values for name, values in percentiles.items() if name == command}
+
+        embed = build_traces_embed(traces.slowest(limit, command), percentiles, interaction)
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @debug.command(name="loop", description="Event loop lag, gateway latency and callbacks that blocked the loop")
+    @app_commands.describe(reset="Clear the collected lag samples and stalls after showing them")
+    async def show_loop(self, interaction: discord.Interaction, reset: bool = False):
+        if not await self._require_moderator_role(interaction):
+            return
+
+        if not loop_watchdog.running:
+            await interaction.response.send_message(
+                "Error: The event loop watchdog is disabled, set LOOP_WATCHDOG_INTERVAL to enable it.",
+                ephemeral=True,
+            )
+            return
+
+        lag, stalls = loop_watchdog.snapshot()
+        embed = build_loop_embed(lag, stalls, loop_watchdog.gateway_latency(), interaction, loop_watchdog.started_at)
+        if reset:
+            loop_watchdog.reset()
+
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @debug.command(name="profile", description="Sample every thread for a while and attach the hottest functions")
+    @app_commands.describe(
+        seconds="How long to profile for",
+        command_count="Stop early once this many commands have completed",
+    )
+    async def profile(
+        self,
+        interaction: discord.Interaction,
+        seconds: app_commands.Range[int, 5, 600] = 30,
+        command_count: app_commands.Range[int, 1, 10000] | None = None,
+    ):
+        if not await self._require_moderator_role(interaction):
+            return
+
+        if self.profiler is not None:
+            await interaction.response.send_message("Error: A profile is already running.", ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True, thinking=True)
+
+        profiler = self.profiler = SamplingProfiler()
+        self.profile_command_limit = command_count
+        self.profile_done.clear()
+        profiler.start()
+        try:
+            await asyncio.wait_for(self.profile_done.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self.profiler = None
+            await asyncio.to_thread(profiler.stop)
+
+        report, folded = await asyncio.to_thread(lambda: (profiler.report(), profiler.folded()))
+        await interaction.followup.send(
+            embed=build_profile_embed(profiler, interaction),
+            files=[
+                discord.File(io.BytesIO(report.encode()), filename="profile.txt"),
+                discord.File(io.BytesIO(folded.encode()), filename="profile.folded"),
+            ],
+            ephemeral=True,
+        )
+
+    @debug.command(name="memory", description="Live views, allocation sites and memory growth between snapshots")
+    @app_commands.describe(action="Take a snapshot, or start/stop allocation tracing")
+    async def memory(
+        self,
+        interaction: discord.Interaction,
+        action: Literal["snapshot", "start", "stop"] = "snapshot",
+    ):
+        if not await self._require_moderator_role(interaction):
+            return
+
+        if action == "stop":
+            if not memory_tracker.tracing:
+                await interaction.response.send_message("Error: Allocation tracing is not running.", ephemeral=True)
+                return
+
+            await asyncio.to_thread(memory_tracker.stop)
+            await interaction.response.send_message("Stopped tracing allocations.", ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True, thinking=True)
+
+        if action == "start":
+            # tracing slows every allocation down, it stays off until someone asks for it
+            await asyncio.to_thread(memory_tracker.start)
+
+        report = await asyncio.to_thread(memory_tracker.report)
+        text = format_report(report)
+        await interaction.followup.send(
+            embed=build_memory_embed(report, interaction),
+            file=discord.File(io.BytesIO(text.encode()), filename="memory.txt"),
+            ephemeral=True,
+        )
+
+
+async def setup(bot: commands.Bot) -> None:
+    await bot.add_cog(Debug(bot))
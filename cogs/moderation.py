@@ -6,7 +6,10 @@ import time
 import math
 from typing import Any, Callable, Literal, TypeGuard
 
-from config import MODERATOR_ROLE_ID, MAX_QUOTA, MODERATOR_PERMISSIONS
+from config import MAX_QUOTA, MODERATOR_PERMISSIONS, PAGINATION_DEBOUNCE
+from indexes import username_autocomplete
+from models import Complaint
+from ratelimits import Debounce
 from utils import *
 
 
@@ -99,6 +102,7 @@ class GoToPageModal(discord.ui.Modal, title="Go to page"):
 class ModerationPaginatedView(discord.ui.View):
     def __init__(self, requester_id: int, current_page: int = 1, total_pages: int = 1):
         super().__init__(timeout=180)
+        self.debounce = Debounce(PAGINATION_DEBOUNCE)
         self.requester_id = requester_id
         self.current_page = current_page
         self.total_pages = total_pages
@@ -125,14 +129,14 @@ class ModerationPaginatedView(discord.ui.View):
     @discord.ui.button(label="Previous", style=discord.ButtonStyle.secondary, row=0)
     async def previous_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         await interaction.response.defer()
-        if self.current_page <= 1:
+        if self.current_page <= 1 or not self.debounce.ready():
             return
         await self._load_page(interaction, self.current_page - 1)
 
     @discord.ui.button(label="Next", style=discord.ButtonStyle.secondary, row=0)
     async def next_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         await interaction.response.defer()
-        if self.current_page >= self.total_pages:
+        if self.current_page >= self.total_pages or not self.debounce.ready():
             return
         await self._load_page(interaction, self.current_page + 1)
 
@@ -508,7 +512,7 @@ class CreationComplaintsListView(ModerationPaginatedView):
         self.per_page = per_page
         self.total_results = 0
 
-    def _build_embed(self, complaints: list[dict]) -> discord.Embed:
+    def _build_embed(self, complaints: list[Complaint]) -> discord.Embed:
         embed = build_moderation_embed(
             self.interaction,
             "Creation Complaints",
@@ -517,11 +521,11 @@ class CreationComplaintsListView(ModerationPaginatedView):
         )
 
         for complaint in complaints:
-            user_id = complaint.get("UserId")
-            player_id = complaint.get("PlayerId")
-            creation_id = complaint.get("PlayerCreationId")
-            reason = complaint.get("Reason")
-            comments = complaint.get("Comments")
+            user_id = complaint.user_id
+            player_id = complaint.player_id
+            creation_id = complaint.player_creation_id
+            reason = complaint.reason
+            comments = complaint.comments
 
             embed.add_field(
                 name=f"{get_creation_name(creation_id)} `{creation_id}`",
@@ -579,7 +583,8 @@ class CreationComplaintsListView(ModerationPaginatedView):
         self.total_pages = max(1, math.ceil(total_results / self.per_page))
         self.current_page = min(max(page, 1), self.total_pages)
         self._update_page_buttons()
-        await interaction.edit_original_response(embed=self._build_embed(complaints), view=self)
+        embed = await asyncio.to_thread(self._build_embed, complaints)
+        await interaction.edit_original_response(embed=embed, view=self)
 
 
 class PlayerComplaintsListView(ModerationPaginatedView):
@@ -590,7 +595,7 @@ class PlayerComplaintsListView(ModerationPaginatedView):
         self.per_page = per_page
         self.total_results = 0
 
-    def _build_embed(self, complaints: list[dict]) -> discord.Embed:
+    def _build_embed(self, complaints: list[Complaint]) -> discord.Embed:
         embed = build_moderation_embed(
             self.interaction,
             "Player Complaints",
@@ -599,10 +604,10 @@ class PlayerComplaintsListView(ModerationPaginatedView):
         )
 
         for complaint in complaints:
-            user_id = complaint.get("UserId")
-            player_id = complaint.get("PlayerId")
-            reason = complaint.get("Reason")
-            comments = complaint.get("Comments")
+            user_id = complaint.user_id
+            player_id = complaint.player_id
+            reason = complaint.reason
+            comments = complaint.comments
 
             embed.add_field(
                 name=f"`{get_player_username(player_id)}`",
@@ -659,7 +664,8 @@ class PlayerComplaintsListView(ModerationPaginatedView):
         self.total_pages = max(1, math.ceil(total_results / self.per_page))
         self.current_page = min(max(page, 1), self.total_pages)
         self._update_page_buttons()
-        await interaction.edit_original_response(embed=self._build_embed(complaints), view=self)
+        embed = await asyncio.to_thread(self._build_embed, complaints)
+        await interaction.edit_original_response(embed=embed, view=self)
 
 
 class AnnouncementsListView(ModerationPaginatedView):
@@ -815,19 +821,7 @@ class Moderation(commands.Cog):
         self.moderation_tokens: dict[int, str] = token_store
 
     def _has_moderator_role(self, interaction: discord.Interaction) -> bool:
-        if not MODERATOR_ROLE_ID:
-            return False
-
-        try:
-            moderator_role_id = int(MODERATOR_ROLE_ID)
-        except ValueError:
-            return False
-
-        member = interaction.user
-        if not isinstance(member, discord.Member):
-            return False
-
-        return any(role.id == moderator_role_id for role in member.roles)
+        return has_moderator_role(interaction)
 
     def _embed(
         self,
@@ -901,6 +895,7 @@ class Moderation(commands.Cog):
 
     @moderation.command(name="ban_player", description="Ban or unban a player")
     @app_commands.describe(username="Player username", is_banned="True to ban, false to unban")
+    @app_commands.autocomplete(username=username_autocomplete)
     async def ban_player(self, interaction: discord.Interaction, username: str, is_banned: bool):
         if not await self._require_moderator_role(interaction):
             return
@@ -987,7 +982,7 @@ class Moderation(commands.Cog):
         
         embed.add_field(
             name="Creation Name",
-            value=creation_stats.get("name"),
+            value=creation_stats.name,
             inline=True
         )
         
@@ -1005,6 +1000,7 @@ class Moderation(commands.Cog):
         
     @moderation.command(name="set_quota", description="Set a player's quota (creation slots)")
     @app_commands.describe(username="Player username", quota="New quota (creation slots) value")
+    @app_commands.autocomplete(username=username_autocomplete)
     async def set_quota(self, interaction: discord.Interaction, username: str, quota: int):
         if not await self._require_moderator_role(interaction):
             return
@@ -1049,6 +1045,7 @@ class Moderation(commands.Cog):
         
     @moderation.command(name="allow_opposite_platform", description="Basically link PSN and RPCN accounts")
     @app_commands.describe(username="Player username", allow_opposite_platform="True to allow, false to disallow")
+    @app_commands.autocomplete(username=username_autocomplete)
     async def allow_opposite_platform(self, interaction: discord.Interaction, username: str, allow_opposite_platform: bool):
         if not await self._require_moderator_role(interaction):
             return
@@ -1087,6 +1084,7 @@ class Moderation(commands.Cog):
     @moderation.command(name="reset_user_profile", description="Reset user profile and optionally remove creations")
     @app_commands.describe(username="Player username")
     @app_commands.describe(remove_creations="Also remove all player creations")
+    @app_commands.autocomplete(username=username_autocomplete)
     async def reset_user_profile(self, interaction: discord.Interaction, username: str, remove_creations: bool = False):
         if not await self._require_moderator_role(interaction):
             return
@@ -1125,6 +1123,7 @@ class Moderation(commands.Cog):
     @moderation.command(name="delete_avatar", description="Remove a player's avatars")
     @app_commands.describe(username="Player username")
     @app_commands.describe(is_mnr="True to remove MNR avatars, false to remove LBPK avatars")
+    @app_commands.autocomplete(username=username_autocomplete)
     async def delete_avatars(self, interaction: discord.Interaction, username: str, is_mnr: bool = True):
         if not await self._require_moderator_role(interaction):
             return
@@ -1322,6 +1321,7 @@ class Moderation(commands.Cog):
 
     @moderation.command(name="delete_player_creations", description="Remove all creations from a player")
     @app_commands.describe(username="Player username")
+    @app_commands.autocomplete(username=username_autocomplete)
     async def delete_player_creations(self, interaction: discord.Interaction, username: str):
         if not await self._require_moderator_role(interaction):
             return
@@ -1397,6 +1397,7 @@ class Moderation(commands.Cog):
 
     @moderation.command(name="ban_console_id_by_session", description="Ban a console ID from a player's active session")
     @app_commands.describe(username="Player username")
+    @app_commands.autocomplete(username=username_autocomplete)
     async def ban_console_id_by_session(self, interaction: discord.Interaction, username: str):
         if not await self._require_moderator_role(interaction):
             return
@@ -5,6 +5,7 @@ import asyncio
 import time
 
 from config import URL
+from indexes import username_autocomplete
 from utils import *
 
 
@@ -14,6 +15,7 @@ class Player(commands.Cog):
 
     @app_commands.command(name="player", description="Get a player's stats.")
     @app_commands.describe(username="The player to get stats for")
+    @app_commands.autocomplete(username=username_autocomplete)
     async def player(self, interaction: discord.Interaction, username: str) -> None:
         await interaction.response.defer()
         player_stats = await asyncio.to_thread(get_player_stats, username)
@@ -22,14 +24,14 @@ class Player(commands.Cog):
             await interaction.followup.send(player_stats, ephemeral=True)
             return
         
-        user_id = player_stats.get("userId")
-        is_banned = player_stats.get("isBanned")
-        created_at = player_stats.get("createdAt")
-        presence = player_stats.get("presence")
-        skill_level_id = player_stats.get("skillLevelId")
+        user_id = player_stats.user_id
+        is_banned = player_stats.is_banned
+        created_at = player_stats.created_at
+        presence = player_stats.presence
+        skill_level_id = player_stats.skill_level_id
         
         embed = discord.Embed(title=f"{username}")
-        embed.description = f"{player_stats.get('quote', '')}"
+        embed.description = f"{player_stats.quote or ''}"
         embed.set_image(url=f"{URL}/player_avatars/MNR/{user_id}/secondary.png?{int(time.time())}")  # Just to prevent caching issues
         
         embed, file = skill_level_id_to_image(skill_level_id, embed)
@@ -39,12 +41,12 @@ class Player(commands.Cog):
         else:
             embed.color = discord.Color.green()
             
-        embed.add_field(name="Star Rating", value=player_stats.get("starRating"), inline=False)
-        embed.add_field(name="Skill Level", value=player_stats.get("skillLevelName"), inline=True)
-        embed.add_field(name="Online Races", value=player_stats.get("onlineRaces"), inline=True)
-        embed.add_field(name="Online Wins", value=player_stats.get("onlineWins"), inline=True)
-        embed.add_field(name="Creation XP", value=player_stats.get("creationPoints"), inline=True)
-        embed.add_field(name="Race XP", value=player_stats.get("raceXp"), inline=True)
+        embed.add_field(name="Star Rating", value=player_stats.star_rating, inline=False)
+        embed.add_field(name="Skill Level", value=player_stats.skill_level_name, inline=True)
+        embed.add_field(name="Online Races", value=player_stats.online_races, inline=True)
+        embed.add_field(name="Online Wins", value=player_stats.online_wins, inline=True)
+        embed.add_field(name="Creation XP", value=player_stats.creation_points, inline=True)
+        embed.add_field(name="Race XP", value=player_stats.race_xp, inline=True)
         embed.add_field(name="Presence", value=rename_presence(presence), inline=False)
         embed.add_field(name="Created", value=convert_datetime_to_discord_date(created_at), inline=False)
         
@@ -54,6 +56,7 @@ class Player(commands.Cog):
         
     @app_commands.command(name="avatar", description="Get a player's avatar.")
     @app_commands.describe(username="The player to get the avatar for")
+    @app_commands.autocomplete(username=username_autocomplete)
     @app_commands.describe(avatar_type="Avatar type: 'primary' or 'secondary'")
     @app_commands.choices(avatar_type=[
         app_commands.Choice(name="Primary", value="primary"),
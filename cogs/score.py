@@ -1,16 +1,396 @@
 import discord
 from discord import app_commands
-from discord.ext import commands
+from discord.ext import commands, tasks
 import asyncio
+import math
+import re
 import time
+from typing import Any, Callable
 
-from config import URL
+from config import URL, HOTLAP_CHANNEL_IDS, HOTLAP_IDLE_INTERVAL, PAGINATION_DEBOUNCE
+from hotlap import HotlapRecord, HotlapTracker
+from indexes import username_autocomplete
+import models
+from models import LapTime
+from ratelimits import Debounce
 from utils import *
 
 
+COMPARE_MAX_TRACKS = 10
+COMPARE_CONCURRENCY = 4
+COMPARE_LEADERBOARD_DEPTH = 50
+COMPARE_STANDINGS_ROWS = 10
+
+
+def build_hotlap_records_embed(hotlap_scores: dict, records: list[HotlapRecord]) -> discord.Embed:
+    embed = discord.Embed(
+        title="New Hot Lap Record" if len(records) == 1 else "New Hot Lap Records",
+        description=f"`{hotlap_scores.get('name')}` by _{hotlap_scores.get('creatorUsername')}_",
+        color=discord.Color.yellow(),
+    )
+    embed.set_thumbnail(url=f"{URL}/player_creations/{hotlap_scores.get('id')}/preview_image.png")
+
+    for record in records[:25]:
+        value = f"`{format_time(record.best_lap_time)}`"
+        if record.is_improvement:
+            value += f" (improved by `{format_time(record.previous_time - record.best_lap_time)}`)"
+
+        embed.add_field(
+            name=f"**#{record.rank}** {record.player_username} (`{record.score_id}`)",
+            value=value,
+            inline=False,
+        )
+
+    embed.add_field(
+        name="Reset In",
+        value=reset_in_seconds_to_discord_timestamp(hotlap_scores.get("resetInSeconds") or 0),
+        inline=False,
+    )
+    return embed
+
+
+def build_time_trial_embed(
+    time_trial_scores: dict,
+    interaction: discord.Interaction,
+    current_page: int,
+    total_pages: int,
+    highlight: str | None = None,
+) -> discord.Embed:
+    embed = discord.Embed(
+        title="Time Trial Leaderboard",
+        description=f"Total: **{time_trial_scores.get('total')}** | Page: **{current_page}/{total_pages}**",
+    )
+    embed.color = discord.Color.yellow()
+    embed.set_thumbnail(url=f"{URL}/player_creations/{time_trial_scores.get('id')}/preview_image.png")
+    embed.add_field(name="Rating", value=time_trial_scores.get("rating"), inline=True)
+    embed.add_field(name=f"`{time_trial_scores.get('name')}`", value=f"By: _{time_trial_scores.get('creatorUsername')}_", inline=True)
+
+    top_times = time_trial_scores.get("scores", [])
+
+    if top_times:
+        for time in top_times:
+            marker = "➡️ " if highlight and str(time.player_username or "").casefold() == highlight else ""
+            embed.add_field(
+                name=f"{marker}**#{time.rank}** {time.player_username} (`{time.id}`)",
+                value=f"`{format_time(time.best_lap_time)}`",
+                inline=False
+            )
+    else:
+        embed.add_field(
+            name="Top Times",
+            value="No times have been set yet.",
+            inline=False
+        )
+
+    embed.set_footer(
+        text=f"Requested by: {interaction.user}",
+        icon_url=interaction.user.display_avatar.url,
+    )
+    return embed
+
+
+class JumpToPlayerModal(discord.ui.Modal, title="Jump to player"):
+    def __init__(self, on_username_submit: Callable[[discord.Interaction, str], Any]):
+        super().__init__()
+        self.on_username_submit = on_username_submit
+        self.username_input = discord.ui.TextInput(
+            label="Username",
+            required=True,
+            max_length=32,
+        )
+        self.add_item(self.username_input)
+
+    async def on_submit(self, interaction: discord.Interaction):
+        await interaction.response.defer()
+        await self.on_username_submit(interaction, self.username_input.value.strip())
+
+
+class TimeTrialListView(discord.ui.View):
+    def __init__(
+        self,
+        interaction: discord.Interaction,
+        track_id: int,
+        per_page: int,
+        first_page: dict,
+    ):
+        super().__init__(timeout=120)
+        self.debounce = Debounce(PAGINATION_DEBOUNCE)
+        self.interaction = interaction
+        self.track_id = track_id
+        self.per_page = per_page
+        self.current_page = 1
+        self.total_results = first_page.get("total", 0)
+        self.total_pages = max(1, math.ceil(self.total_results / self.per_page))
+        self.page_cache: dict[int, dict] = {1: first_page}
+        self.highlight: str | None = None
+
+        self._update_buttons()
+
+    def _update_buttons(self):
+        self.previous_button.disabled = self.current_page <= 1
+        self.next_button.disabled = self.current_page >= self.total_pages
+
+    async def _get_page(self, page: int) -> dict | str:
+        if page in self.page_cache:
+            return self.page_cache[page]
+
+        data = await asyncio.to_thread(get_time_trial_scores, self.track_id, page, self.per_page)
+        if isinstance(data, dict):
+            self.page_cache[page] = data
+        return data
+
+    async def _fetch_and_update(self, interaction: discord.Interaction, page: int):
+        data = await self._get_page(page)
+
+        if isinstance(data, str):
+            await interaction.edit_original_response(content=data, embed=None, view=None)
+            return
+
+        self.total_results = data.get("total", self.total_results)
+        self.total_pages = max(1, math.ceil(self.total_results / self.per_page))
+        self.current_page = min(max(page, 1), self.total_pages)
+        self._update_buttons()
+
+        embed = build_time_trial_embed(
+            data,
+            self.interaction,
+            self.current_page,
+            self.total_pages,
+            self.highlight,
+        )
+        await interaction.edit_original_response(content=None, embed=embed, view=self)
+
+    async def _jump_to_player(self, interaction: discord.Interaction, username: str):
+        score = await asyncio.to_thread(find_time_trial_score, self.track_id, username)
+
+        if isinstance(score, str):
+            await interaction.followup.send(score, ephemeral=True)
+            return
+
+        if score is None or not score.rank:
+            await interaction.followup.send(f"**{username}** has no time on this track.", ephemeral=True)
+            return
+
+        self.highlight = username.casefold()
+        await self._fetch_and_update(interaction, math.ceil(score.rank / self.per_page))
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.id == self.interaction.user.id:
+            return True
+
+        await interaction.response.send_message("Only the original user can change pages.", ephemeral=True)
+        return False
+
+    @discord.ui.button(label="Previous", style=discord.ButtonStyle.secondary)
+    async def previous_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await interaction.response.defer()
+        if self.current_page <= 1 or not self.debounce.ready():
+            return
+        await self._fetch_and_update(interaction, self.current_page - 1)
+
+    @discord.ui.button(label="Next", style=discord.ButtonStyle.secondary)
+    async def next_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await interaction.response.defer()
+        if self.current_page >= self.total_pages or not self.debounce.ready():
+            return
+        await self._fetch_and_update(interaction, self.current_page + 1)
+
+    @discord.ui.button(label="Jump to player", style=discord.ButtonStyle.primary)
+    async def jump_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await interaction.response.send_modal(JumpToPlayerModal(on_username_submit=self._jump_to_player))
+
+
+async def send_paginated_time_trials(
+    interaction: discord.Interaction,
+    track_id: int,
+    per_page: int = 10,
+):
+    await interaction.response.defer()
+    time_trial_scores = await asyncio.to_thread(get_time_trial_scores, track_id, 1, per_page)
+
+    if isinstance(time_trial_scores, str):
+        await interaction.followup.send(time_trial_scores, ephemeral=True)
+        return
+
+    view = TimeTrialListView(
+        interaction=interaction,
+        track_id=track_id,
+        per_page=per_page,
+        first_page=time_trial_scores,
+    )
+    embed = build_time_trial_embed(time_trial_scores, interaction, 1, view.total_pages)
+
+    await interaction.followup.send(embed=embed, view=view)
+
+
+def parse_track_ids(track_ids: str) -> list[int]:
+    parsed = []
+    for value in re.split(r"[\s,;]+", track_ids):
+        if value.isdigit() and int(value) not in parsed:
+            parsed.append(int(value))
+    return parsed
+
+
+async def fetch_track_comparisons(
+    track_ids: list[int],
+    player: str | None = None,
+    per_page: int = COMPARE_LEADERBOARD_DEPTH,
+    concurrency: int = COMPARE_CONCURRENCY,
+) -> list[tuple[int, dict | str, models.Score | None]]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(track_id: int) -> tuple[int, dict | str, dict | None]:
+        async with semaphore:
+            leaderboard = await asyncio.to_thread(get_time_trial_scores, track_id, 1, per_page)
+            if isinstance(leaderboard, str) or not player:
+                return track_id, leaderboard, None
+
+            folded = player.casefold()
+            player_score = next(
+                (s for s in leaderboard.get("scores", []) if str(s.player_username or "").casefold() == folded),
+                None,
+            )
+            if player_score is None and leaderboard.get("total", 0) > per_page:
+                # walk the rest serially, the semaphore slot is the only concurrency this track gets
+                player_score = await asyncio.to_thread(
+                    find_time_trial_score,
+                    track_id,
+                    player,
+                    per_page=per_page,
+                    max_workers=1,
+                    first_page=leaderboard,
+                )
+                if isinstance(player_score, str):
+                    player_score = None
+
+            return track_id, leaderboard, player_score
+
+    return await asyncio.gather(*(fetch(track_id) for track_id in track_ids))
+
+
+def build_combined_standings(leaderboards: list[dict]) -> list[tuple[str, int, LapTime]]:
+    totals: dict[str, list] = {}
+    for leaderboard in leaderboards:
+        for score in leaderboard.get("scores", []):
+            username = score.player_username
+            if not username or score.best_lap_time is None:
+                continue
+
+            entry = totals.setdefault(username, [0, LapTime(0)])
+            entry[0] += 1
+            entry[1] += score.best_lap_time
+
+    # more tracks completed first, then the lowest combined time
+    return sorted(
+        ((username, tracks, total_time) for username, (tracks, total_time) in totals.items()),
+        key=lambda row: (-row[1], row[2]),
+    )
+
+
+def build_comparison_embed(
+    results: list[tuple[int, dict | str, models.Score | None]],
+    interaction: discord.Interaction,
+    player: str | None = None,
+) -> discord.Embed:
+    embed = discord.Embed(title="Time Trial Comparison", color=discord.Color.yellow())
+    leaderboards = []
+
+    for track_id, leaderboard, player_score in results:
+        if isinstance(leaderboard, str):
+            embed.add_field(name=f"`{track_id}`", value=leaderboard, inline=False)
+            continue
+
+        leaderboards.append(leaderboard)
+        scores = leaderboard.get("scores", [])
+        if not scores:
+            embed.add_field(name=f"{leaderboard.get('name')} `{track_id}`", value="No times have been set yet.", inline=False)
+            continue
+
+        leader = scores[0]
+        leader_time = leader.best_lap_time
+        lines = [f"🥇 {leader.player_username} " + ("no time" if leader_time is None else f"`{format_time(leader_time)}`")]
+
+        if player:
+            if player_score is None:
+                lines.append(f"{player}: no time set")
+            elif player_score.best_lap_time is None:
+                lines.append(f"{player_score.player_username}: **#{player_score.rank}** no time")
+            else:
+                player_time = player_score.best_lap_time
+                delta = "" if leader_time is None else f" (`{player_time.delta(leader_time)}`)"
+                lines.append(f"{player_score.player_username}: **#{player_score.rank}** `{format_time(player_time)}`{delta}")
+
+        embed.add_field(name=f"{leaderboard.get('name')} `{track_id}`", value="\n".join(lines), inline=False)
+
+    standings = build_combined_standings(leaderboards)
+    if standings:
+        track_count = len(leaderboards)
+        rows = [
+            f"{rank:>2}. {username[:16]:<16} {tracks}/{track_count} {format_time(total_time)}"
+            for rank, (username, tracks, total_time) in enumerate(standings[:COMPARE_STANDINGS_ROWS], start=1)
+        ]
+
+        if player:
+            folded = player.casefold()
+            for rank, (username, tracks, total_time) in enumerate(standings, start=1):
+                if username.casefold() == folded and rank > COMPARE_STANDINGS_ROWS:
+                    rows.append(f"{rank:>2}. {username[:16]:<16} {tracks}/{track_count} {format_time(total_time)}")
+                    break
+
+        embed.add_field(name=f"Combined Standings (top {COMPARE_LEADERBOARD_DEPTH} per track)", value="```\n" + "\n".join(rows) + "\n```", inline=False)
+
+    embed.set_footer(
+        text=f"Requested by: {interaction.user}",
+        icon_url=interaction.user.display_avatar.url,
+    )
+    return embed
+
+
 class Score(commands.Cog):
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
+        self.hotlap_tracker = HotlapTracker()
+
+    async def cog_load(self) -> None:
+        if HOTLAP_CHANNEL_IDS:
+            await asyncio.to_thread(self.hotlap_tracker.load)
+            self.hotlap_watch.start()
+
+    async def cog_unload(self) -> None:
+        self.hotlap_watch.cancel()
+
+    @tasks.loop(seconds=HOTLAP_IDLE_INTERVAL)
+    async def hotlap_watch(self) -> None:
+        try:
+            hotlap_scores = await asyncio.to_thread(get_hotlap_scores)
+        except requests.RequestException:
+            return
+
+        if isinstance(hotlap_scores, str):
+            return
+
+        records = await asyncio.to_thread(self.hotlap_tracker.update, hotlap_scores)
+        self.hotlap_watch.change_interval(
+            seconds=self.hotlap_tracker.next_interval(hotlap_scores.get("resetInSeconds"))
+        )
+
+        if not records:
+            return
+
+        embed = build_hotlap_records_embed(hotlap_scores, records)
+        for channel_id in HOTLAP_CHANNEL_IDS:
+            channel = self.bot.get_channel(channel_id)
+            if not isinstance(channel, discord.abc.Messageable):
+                continue
+
+            try:
+                await channel.send(embed=embed)
+            except discord.HTTPException:
+                continue
+
+    @hotlap_watch.before_loop
+    async def before_hotlap_watch(self) -> None:
+        await self.bot.wait_until_ready()
 
     @app_commands.command(name="hotlap", description="Get the current hotlap best times.")
     async def hotlap(self, interaction: discord.Interaction) -> None:
@@ -33,8 +413,8 @@ class Score(commands.Cog):
         if top_times:
             for time in top_times:
                 embed.add_field(
-                    name=f"**#{time['rank']}** {time['playerUsername']} (`{time['scoreId']}`)",
-                    value=f"`{format_time(time['bestLapTime'])}`",
+                    name=f"**#{time.rank}** {time.player_username} (`{time.id}`)",
+                    value=f"`{format_time(time.best_lap_time)}`",
                     inline=False
                 )   
         else:
@@ -49,36 +429,31 @@ class Score(commands.Cog):
     @app_commands.command(name="time-trials", description="Get a time trial by track ID.")
     @app_commands.describe(track_id="The track ID to get time trials for")
     async def time_trials(self, interaction: discord.Interaction, track_id: int) -> None:
-        await interaction.response.defer()
-        time_trial_scores = await asyncio.to_thread(get_time_trial_scores, track_id)
-        
-        if isinstance(time_trial_scores, str):
-            await interaction.followup.send(time_trial_scores, ephemeral=True)
-            return
+        await send_paginated_time_trials(interaction, track_id)
 
-        embed = discord.Embed(title="Time Trial Leaderboard")
-        embed.color = discord.Color.yellow()
-        embed.set_thumbnail(url=f"{URL}/player_creations/{time_trial_scores.get('id')}/preview_image.png")
-        embed.add_field(name="Rating", value=time_trial_scores.get("rating"), inline=True)
-        embed.add_field(name=f"`{time_trial_scores.get('name')}`", value=f"By: _{time_trial_scores.get('creatorUsername')}_", inline=True)
-        
-        top_times = time_trial_scores.get("scores", [])
+    @app_commands.command(name="time-trials-compare", description="Compare time trials across several tracks.")
+    @app_commands.describe(
+        track_ids="Track IDs separated by commas or spaces",
+        player="Optional player to compare against the leaders",
+    )
+    @app_commands.autocomplete(player=username_autocomplete)
+    async def time_trials_compare(self, interaction: discord.Interaction, track_ids: str, player: str | None = None) -> None:
+        parsed_track_ids = parse_track_ids(track_ids)
 
-        if top_times:
-            for time in top_times:
-                embed.add_field(
-                    name=f"**#{time['rank']}** {time['playerUsername']} (`{time['scoreId']}`)",
-                    value=f"`{format_time(time['bestLapTime'])}`",
-                    inline=False
-                )
-        else:
-            embed.add_field(
-                name="Top Times",
-                value="No times have been set yet.",
-                inline=False
+        if not parsed_track_ids:
+            await interaction.response.send_message("Error: No valid track IDs provided.", ephemeral=True)
+            return
+
+        if len(parsed_track_ids) > COMPARE_MAX_TRACKS:
+            await interaction.response.send_message(
+                f"Error: You can compare up to {COMPARE_MAX_TRACKS} tracks at once.",
+                ephemeral=True,
             )
+            return
 
-        await interaction.followup.send(embed=embed)
+        await interaction.response.defer()
+        results = await fetch_track_comparisons(parsed_track_ids, player)
+        await interaction.followup.send(embed=build_comparison_embed(results, interaction, player))
 
 
 async def setup(bot: commands.Bot) -> None:
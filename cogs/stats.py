@@ -1,15 +1,29 @@
 import discord
 from discord import app_commands
-from discord.ext import commands
+from discord.ext import commands, tasks
 import asyncio
+import io
 import math
+import time
 from typing import Any, Callable
 
+from config import LIVE_BOARD_DURATION, PRESENCE_EVENT_INTERVAL, PRESENCE_EVENT_CHANNEL_IDS, HISTORY_SAMPLE_INTERVAL, PAGINATION_DEBOUNCE
+from charts import get_history_chart, shutdown_chart_pool
+from history import DAY, MetricSummary, history_store
+from models import Presence
+from presence import PresenceChanges, PresenceSnapshot, PresenceWatcher, presence_poller
+from ratelimits import Debounce
+from tracing import span
 from utils import *
 
 
+LIVE_BOARD_MAX_PLAYERS = 20
+EMBED_FIELD_LIMIT = 1024
+PRESENCE_WATCHER_KEY = "presence_events"
+
+
 def build_players_online_embed(
-    players: list[dict],
+    players: list[Presence],
     interaction: discord.Interaction,
     current_page: int,
     total_pages: int,
@@ -22,11 +36,11 @@ def build_players_online_embed(
     )
 
     for player in players:
-        username = player.get("username")
-        user_id = player.get("id")
-        presence = rename_presence(player.get("presence"))
-        platform = player.get("platform")
-        is_rpcn = player.get("IsRpcn")
+        username = player.username
+        user_id = player.id
+        presence = rename_presence(player.presence)
+        platform = player.platform
+        is_rpcn = player.is_rpcn
         rpcn_label = "RPCN" if is_rpcn else "PSN"
 
         embed.add_field(
@@ -42,7 +56,7 @@ def build_players_online_embed(
     return embed
 
 
-def normalize_players_payload(data: Any) -> tuple[list[dict], int]:
+def normalize_players_payload(data: Any) -> tuple[list[Presence], int]:
     if isinstance(data, list):
         return data, len(data)
 
@@ -65,6 +79,7 @@ class PlayersOnlineView(discord.ui.View):
         total_results: int,
     ) -> None:
         super().__init__(timeout=120)
+        self.debounce = Debounce(PAGINATION_DEBOUNCE)
         self.interaction = interaction
         self.fetch_function = fetch_function
         self.fetch_kwargs = fetch_kwargs
@@ -116,7 +131,7 @@ class PlayersOnlineView(discord.ui.View):
             return
 
         await interaction.response.defer()
-        if self.current_page <= 1:
+        if self.current_page <= 1 or not self.debounce.ready():
             return
         await self._update_page(interaction, self.current_page - 1)
 
@@ -127,7 +142,7 @@ class PlayersOnlineView(discord.ui.View):
             return
 
         await interaction.response.defer()
-        if self.current_page >= self.total_pages:
+        if self.current_page >= self.total_pages or not self.debounce.ready():
             return
         await self._update_page(interaction, self.current_page + 1)
 
@@ -166,14 +181,279 @@ async def send_paginated_players_online(
     await interaction.followup.send(embed=embed, view=view)
 
 
+def build_live_players_embed(snapshot: PresenceSnapshot, started_by: str, expires_at: float) -> discord.Embed:
+    embed = discord.Embed(
+        title="Players Online (Live)",
+        description=(
+            f"Total: **{snapshot.total}** | Updated: <t:{int(snapshot.fetched_at)}:R>\n"
+            f"Live updates end <t:{int(expires_at)}:R>"
+        ),
+        color=discord.Color.green(),
+    )
+
+    for player in snapshot.players[:LIVE_BOARD_MAX_PLAYERS]:
+        rpcn_label = "RPCN" if player.is_rpcn else "PSN"
+        embed.add_field(
+            name=f"{player.username} `{player.id}`",
+            value=f"Presence: {rename_presence(player.presence)}\nPlatform: {player.platform} | Network: {rpcn_label}",
+            inline=False,
+        )
+
+    hidden = snapshot.total - LIVE_BOARD_MAX_PLAYERS
+    if hidden > 0:
+        embed.add_field(name="\u200b", value=f"...and **{hidden}** more.", inline=False)
+
+    embed.set_footer(text=f"Started by: {started_by}")
+    return embed
+
+
+def counters_to_samples(players_online_count, total_players_count, creations_count) -> dict[str, float]:
+    samples = {}
+
+    for metric, value in (
+        ("players_online", players_online_count),
+        ("total_players", total_players_count),
+    ):
+        if isinstance(value, str) and value.strip().isdigit():
+            samples[metric] = int(value)
+
+    if isinstance(creations_count, dict):
+        for metric, key in (
+            ("total_creations", "totalMNR"),
+            ("total_mods", "totalMods"),
+            ("total_karts", "totalKarts"),
+            ("total_tracks", "totalTracks"),
+        ):
+            if isinstance(creations_count.get(key), (int, float)):
+                samples[metric] = creations_count[key]
+
+    return samples
+
+
+def format_trend(summary: MetricSummary) -> str:
+    if summary.trend is None:
+        return "n/a"
+    return f"{summary.trend:+.1f}%"
+
+
+def format_history_summary(players_online: MetricSummary, total_creations: MetricSummary) -> str | None:
+    lines = []
+
+    if players_online.peak is not None:
+        lines.append(
+            f"Players Online (24h): Peak **{players_online.peak:.0f}** | "
+            f"Avg **{players_online.average:.1f}** | Trend **{format_trend(players_online)}**"
+        )
+
+    if total_creations.growth is not None:
+        lines.append(f"New Creations (7d): **{total_creations.growth:+.0f}** | Trend **{format_trend(total_creations)}**")
+
+    return "\n".join(lines) if lines else None
+
+
+def join_lines_within_limit(lines: list[str], limit: int = EMBED_FIELD_LIMIT) -> str:
+    value = ""
+    for index, line in enumerate(lines):
+        remaining = len(lines) - index
+        more = f"...and **{remaining}** more."
+        candidate = f"{value}\n{line}" if value else line
+        if len(candidate) + len(more) + 1 > limit and remaining > 1:
+            return f"{value}\n{more}" if value else more
+        value = candidate
+
+    return value
+
+
+def build_presence_events_embed(changes: PresenceChanges) -> discord.Embed:
+    embed = discord.Embed(
+        title="Presence Updates",
+        color=discord.Color.blurple(),
+        timestamp=discord.utils.utcnow(),
+    )
+
+    def by_username(player: Presence) -> str:
+        return str(player.username or "").casefold()
+
+    if changes.joined:
+        embed.add_field(
+            name=f"Came Online ({len(changes.joined)})",
+            value=join_lines_within_limit([
+                f"**{p.username}** ({rename_presence(p.presence)})"
+                for p in sorted(changes.joined, key=by_username)
+            ]),
+            inline=False,
+        )
+
+    if changes.left:
+        embed.add_field(
+            name=f"Went Offline ({len(changes.left)})",
+            value=join_lines_within_limit([
+                f"**{p.username}**"
+                for p in sorted(changes.left, key=by_username)
+            ]),
+            inline=False,
+        )
+
+    if changes.changed:
+        embed.add_field(
+            name=f"Activity Changes ({len(changes.changed)})",
+            value=join_lines_within_limit([
+                f"**{after.username}**: {rename_presence(before.presence)} → {rename_presence(after.presence)}"
+                for before, after in sorted(changes.changed, key=lambda pair: by_username(pair[1]))
+            ]),
+            inline=False,
+        )
+
+    return embed
+
+
+class LivePlayersBoard:
+    def __init__(
+        self,
+        message: discord.Message,
+        started_by: str,
+        boards: dict,
+        duration: int = LIVE_BOARD_DURATION,
+    ) -> None:
+        self.message = message
+        self.started_by = started_by
+        self.boards = boards
+        self.expires_at = time.time() + duration
+        self.fingerprint: tuple | None = None
+
+    @property
+    def key(self) -> tuple[str, int]:
+        return ("live_players", self.message.channel.id)
+
+    def stop(self) -> None:
+        presence_poller.unsubscribe(self.key)
+        if self.boards.get(self.key) is self:
+            del self.boards[self.key]
+
+    async def update(self, snapshot: PresenceSnapshot) -> None:
+        if time.time() >= self.expires_at:
+            self.stop()
+            embed = build_live_players_embed(snapshot, self.started_by, self.expires_at)
+            embed.title = "Players Online (Live updates ended)"
+            try:
+                await self.message.edit(embed=embed)
+            except discord.NotFound:
+                pass
+            return
+
+        # only touch discord when somebody joined, left or changed presence
+        if snapshot.fingerprint == self.fingerprint:
+            return
+
+        try:
+            await self.message.edit(embed=build_live_players_embed(snapshot, self.started_by, self.expires_at))
+        except discord.NotFound:
+            self.stop()
+            return
+
+        self.fingerprint = snapshot.fingerprint
+
+
 class Stats(commands.Cog):
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
+        self.live_boards: dict[tuple[str, int], LivePlayersBoard] = {}
+        self.presence_watcher = PresenceWatcher()
+
+    async def cog_load(self) -> None:
+        if PRESENCE_EVENT_CHANNEL_IDS:
+            presence_poller.subscribe(PRESENCE_WATCHER_KEY, self.presence_watcher.observe)
+            self.publish_presence_events.start()
+
+        self.record_history.start()
+
+    async def cog_unload(self) -> None:
+        for board in list(self.live_boards.values()):
+            board.stop()
+
+        presence_poller.unsubscribe(PRESENCE_WATCHER_KEY)
+        self.publish_presence_events.cancel()
+        self.record_history.cancel()
+        shutdown_chart_pool()
+
+    @tasks.loop(seconds=HISTORY_SAMPLE_INTERVAL)
+    async def record_history(self) -> None:
+        try:
+            players_online_count, total_players_count, creations_count = await asyncio.gather(
+                asyncio.to_thread(get_players_online_count),
+                asyncio.to_thread(get_total_players_count),
+                asyncio.to_thread(get_total_creations_count),
+            )
+        except requests.RequestException:
+            return
+
+        samples = counters_to_samples(players_online_count, total_players_count, creations_count)
+        await asyncio.to_thread(history_store.record, samples)
 
+    @tasks.loop(seconds=PRESENCE_EVENT_INTERVAL)
+    async def publish_presence_events(self) -> None:
+        changes = self.presence_watcher.flush()
+        if not changes:
+            return
+
+        embed = build_presence_events_embed(changes)
+        for channel_id in PRESENCE_EVENT_CHANNEL_IDS:
+            channel = self.bot.get_channel(channel_id)
+            if not isinstance(channel, discord.abc.Messageable):
+                continue
+
+            try:
+                await channel.send(embed=embed)
+            except discord.HTTPException:
+                continue
+
+    @publish_presence_events.before_loop
+    async def before_publish_presence_events(self) -> None:
+        await self.bot.wait_until_ready()
+
+    async def _start_live_board(self, interaction: discord.Interaction, is_mnr: bool | None) -> None:
+        channel = interaction.channel
+        if not isinstance(channel, discord.abc.Messageable):
+            await interaction.response.send_message("Error: Live boards need a text channel.", ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True)
+
+        snapshot = presence_poller.snapshots.get(True if is_mnr is None else is_mnr)
+        if snapshot is None or time.time() - snapshot.fetched_at > presence_poller.interval:
+            snapshot = await presence_poller.fetch(is_mnr)
+
+        if isinstance(snapshot, str):
+            await interaction.followup.send(snapshot, ephemeral=True)
+            return
+
+        previous = self.live_boards.get(("live_players", channel.id))
+        if previous is not None:
+            previous.stop()
+
+        started_by = str(interaction.user)
+        try:
+            message = await channel.send(
+                embed=build_live_players_embed(snapshot, started_by, time.time() + LIVE_BOARD_DURATION)
+            )
+        except discord.HTTPException:
+            await interaction.followup.send("Error: Unable to post the live board in this channel.", ephemeral=True)
+            return
+
+        board = LivePlayersBoard(message, started_by, self.live_boards)
+        board.fingerprint = snapshot.fingerprint
+        self.live_boards[board.key] = board
+        presence_poller.subscribe(board.key, board.update, is_mnr)
+
+        await interaction.followup.send("Live players board started.", ephemeral=True)
 
     @app_commands.command(name="players_online", description="Get players online count and their presence.")
-    @app_commands.describe(is_mnr="Is MNR?")
-    async def players_online(self, interaction: discord.Interaction, is_mnr: bool | None = None) -> None:
+    @app_commands.describe(is_mnr="Is MNR?", live="Post a board in this channel that keeps itself updated")
+    async def players_online(self, interaction: discord.Interaction, is_mnr: bool | None = None, live: bool = False) -> None:
+        if live:
+            await self._start_live_board(interaction, is_mnr)
+            return
+
         await send_paginated_players_online(
             interaction=interaction,
             fetch_function=get_players_online_presence,
@@ -182,20 +462,57 @@ class Stats(commands.Cog):
             },
         )
         
-    @app_commands.command(name="server_stats", description="Get the server stats.")
-    async def server_stats(self, interaction: discord.Interaction) -> None:
+    async def _send_history_chart(self, interaction: discord.Interaction, window_name: str) -> None:
         await interaction.response.defer()
-        instance_name, players_online_count, total_players_count, creations_count = await asyncio.gather(
-            asyncio.to_thread(get_instance_name),
-            asyncio.to_thread(get_players_online_count),
-            asyncio.to_thread(get_total_players_count),
-            asyncio.to_thread(get_total_creations_count),
+        image = await get_history_chart(window_name)
+
+        if image is None:
+            await interaction.followup.send("No history has been recorded yet.", ephemeral=True)
+            return
+
+        file = discord.File(io.BytesIO(image), filename="server_history.png")
+        embed = discord.Embed(title=f"Server History ({window_name})", color=discord.Color.blue())
+        embed.set_image(url="attachment://server_history.png")
+        embed.set_footer(
+            text=f"Requested by: {interaction.user}",
+            icon_url=interaction.user.display_avatar.url,
         )
 
+        await interaction.followup.send(embed=embed, file=file)
+
+    @app_commands.command(name="server_stats", description="Get the server stats.")
+    @app_commands.describe(history="Show a chart of players online and creations over this window")
+    @app_commands.choices(history=[
+        app_commands.Choice(name="Last 24 hours", value="24h"),
+        app_commands.Choice(name="Last 7 days", value="7d"),
+        app_commands.Choice(name="Last 30 days", value="30d"),
+    ])
+    async def server_stats(self, interaction: discord.Interaction, history: str | None = None) -> None:
+        if history is not None:
+            await self._send_history_chart(interaction, history)
+            return
+
+        with span("defer"):
+            await interaction.response.defer()
+
+        with span("fetch"):
+            instance_name, players_online_count, total_players_count, creations_count = await asyncio.gather(
+                asyncio.to_thread(get_instance_name),
+                asyncio.to_thread(get_players_online_count),
+                asyncio.to_thread(get_total_players_count),
+                asyncio.to_thread(get_total_creations_count),
+            )
+
         if isinstance(creations_count, str):
             await interaction.followup.send(creations_count, ephemeral=True)
             return
 
+        with span("history"):
+            players_online_summary, creations_summary = await asyncio.gather(
+                asyncio.to_thread(history_store.summary, "players_online", DAY),
+                asyncio.to_thread(history_store.summary, "total_creations", 7 * DAY),
+            )
+
         embed = discord.Embed(
             title=instance_name,
             description=(
@@ -207,6 +524,10 @@ class Stats(commands.Cog):
             ),
             color=discord.Color.blue(),
         )
+
+        history_summary = format_history_summary(players_online_summary, creations_summary)
+        if history_summary:
+            embed.add_field(name="History", value=history_summary, inline=False)
         
         if self.bot.user is not None:
             embed.set_thumbnail(url=self.bot.user.display_avatar.url)
@@ -216,7 +537,8 @@ class Stats(commands.Cog):
             icon_url=interaction.user.display_avatar.url,
         )
 
-        await interaction.followup.send(embed=embed)
+        with span("followup"):
+            await interaction.followup.send(embed=embed)
         
 
 async def setup(bot: commands.Bot) -> None:
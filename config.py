@@ -24,6 +24,66 @@ URL = os.getenv("URL")
 COMMAND_PREFIX = os.getenv("COMMAND_PREFIX", "!")
 MODERATOR_ROLE_ID = os.getenv("MODERATOR_ROLE_ID")
 MAX_QUOTA = int(os.getenv("MAX_QUOTA", 0))
+DATA_DIR = os.getenv("DATA_DIR", "data")
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+# "text" or "json"
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()
+# comma separated logger=rate pairs, e.g. skidplate.endpoints=0.1 keeps 10% of that logger's records below WARNING
+LOG_SAMPLING = os.getenv("LOG_SAMPLING", "")
+
+CATALOG_PATH = os.getenv("CATALOG_PATH", os.path.join(DATA_DIR, "catalog.sqlite3"))
+CATALOG_SYNC_INTERVAL = int(os.getenv("CATALOG_SYNC_INTERVAL", 60))
+CATALOG_PAGES_PER_SYNC = int(os.getenv("CATALOG_PAGES_PER_SYNC", 5))
+CATALOG_MAX_AGE = int(os.getenv("CATALOG_MAX_AGE", 86400))
+
+PRESENCE_POLL_INTERVAL = int(os.getenv("PRESENCE_POLL_INTERVAL", 30))
+LIVE_BOARD_DURATION = int(os.getenv("LIVE_BOARD_DURATION", 3600))
+PRESENCE_EVENT_INTERVAL = int(os.getenv("PRESENCE_EVENT_INTERVAL", 120))
+PRESENCE_EVENT_CHANNEL_IDS = [
+    int(channel_id)
+    for channel_id in os.getenv("PRESENCE_EVENT_CHANNEL_IDS", "").split(",")
+    if channel_id.strip().isdigit()
+]
+
+HOTLAP_CHANNEL_IDS = [
+    int(channel_id)
+    for channel_id in os.getenv("HOTLAP_CHANNEL_IDS", "").split(",")
+    if channel_id.strip().isdigit()
+]
+HOTLAP_STATE_PATH = os.getenv("HOTLAP_STATE_PATH", os.path.join(DATA_DIR, "hotlap_state.json"))
+HOTLAP_FAST_INTERVAL = int(os.getenv("HOTLAP_FAST_INTERVAL", 30))
+HOTLAP_IDLE_INTERVAL = int(os.getenv("HOTLAP_IDLE_INTERVAL", 300))
+
+HISTORY_PATH = os.getenv("HISTORY_PATH", os.path.join(DATA_DIR, "history.sqlite3"))
+HISTORY_SAMPLE_INTERVAL = int(os.getenv("HISTORY_SAMPLE_INTERVAL", 300))
+HISTORY_RAW_RETENTION = int(os.getenv("HISTORY_RAW_RETENTION", 7 * 86400))
+
+REQUEST_TIMEOUT = float(os.getenv("REQUEST_TIMEOUT", 15))
+REQUEST_RETRIES = int(os.getenv("REQUEST_RETRIES", 2))
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", 1024))
+TOKEN_REFRESH_INTERVAL = int(os.getenv("TOKEN_REFRESH_INTERVAL", 60))
+
+# token buckets as "commands/seconds", empty or 0 disables; groups are command names, group names or cog names
+RATE_LIMIT_USER = os.getenv("RATE_LIMIT_USER", "5/10")
+RATE_LIMIT_GUILD = os.getenv("RATE_LIMIT_GUILD", "30/10")
+RATE_LIMIT_GROUPS = os.getenv("RATE_LIMIT_GROUPS", "")
+# minimum seconds between page changes on paginated views
+PAGINATION_DEBOUNCE = float(os.getenv("PAGINATION_DEBOUNCE", 1))
+
+# 0 disables the prometheus listener
+METRICS_PORT = int(os.getenv("METRICS_PORT", 0))
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+TRACE_BUFFER_SIZE = int(os.getenv("TRACE_BUFFER_SIZE", 500))
+SLOW_COMMAND_THRESHOLD = float(os.getenv("SLOW_COMMAND_THRESHOLD", 3))
+# event loop lag sampling (0 disables) and how long a callback may block it before its stack is captured
+LOOP_WATCHDOG_INTERVAL = float(os.getenv("LOOP_WATCHDOG_INTERVAL", 0.25))
+BLOCKING_CALL_THRESHOLD = float(os.getenv("BLOCKING_CALL_THRESHOLD", 0.5))
+
+# "record" saves PLGarage responses to CASSETTE_PATH, "replay" serves them back instead of the network
+CASSETTE_MODE = os.getenv("CASSETTE_MODE", "").lower()
+CASSETTE_PATH = os.getenv("CASSETTE_PATH", os.path.join(DATA_DIR, "plgarage.cassette.gz"))
+CASSETTE_TIMING = os.getenv("CASSETTE_TIMING", "original").lower()
 
 MODERATOR_PERMISSIONS = {
     "ManageModerators",
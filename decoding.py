@@ -0,0 +1,47 @@
+import json
+
+import requests
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+# fastest decoder that is installed wins, stdlib json is always there as a fallback
+if orjson is not None:
+    JSON_BACKEND = "orjson"
+    _loads = orjson.loads
+elif msgspec is not None:
+    JSON_BACKEND = "msgspec"
+    _loads = msgspec.json.Decoder().decode
+else:
+    JSON_BACKEND = "json"
+    _loads = json.loads
+
+
+def loads(data: bytes | str):
+    try:
+        return _loads(data)
+    except ValueError:
+        raise
+    except Exception as exc:
+        # msgspec raises its own DecodeError, callers only expect ValueError like response.json()
+        raise ValueError(str(exc)) from exc
+
+
+def decode_json(response):
+    try:
+        return loads(response.content)
+    except ValueError as exc:
+        # what response.json() raises, a RequestException the background tasks already catch
+        raise requests.exceptions.JSONDecodeError(
+            getattr(exc, "msg", str(exc)),
+            getattr(exc, "doc", None) or response.text,
+            getattr(exc, "pos", 0),
+        ) from exc
@@ -0,0 +1,298 @@
+import contextvars
+import logging
+import string
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import cassettes
+from config import (
+    URL,
+    REQUEST_TIMEOUT,
+    REQUEST_RETRIES,
+    RESPONSE_CACHE_SIZE,
+    TOKEN_REFRESH_INTERVAL,
+    CASSETTE_MODE,
+    CASSETTE_PATH,
+    CASSETTE_TIMING,
+)
+
+
+logger = logging.getLogger("skidplate.endpoints")
+
+RETRY_STATUSES = {502, 503, 504}
+RETRY_BACKOFF = 0.25
+
+
+def parse_ok(messages: dict[str, str] | None = None) -> Callable[[requests.Response], str | None]:
+    # most write endpoints answer "ok" on success and a short error code otherwise
+    def parse(response: requests.Response) -> str | None:
+        if response.text == "ok":
+            return "ok"
+        return (messages or {}).get(response.text)
+
+    return parse
+
+
+def parse_text(response: requests.Response) -> str:
+    return response.text
+
+
+@dataclass(frozen=True)
+class Endpoint:
+    name: str
+    method: str
+    path: str
+    error: str
+    parse: Callable[[requests.Response], Any] = parse_ok()
+    errors: dict[int, str] = field(default_factory=dict)
+    params: dict[str, Any] = field(default_factory=dict)
+    auth: bool = False
+    cache_ttl: float = 0
+    idempotent: bool | None = None
+    clears_cache: bool | None = None
+
+    def __post_init__(self) -> None:
+        if self.idempotent is None:
+            object.__setattr__(self, "idempotent", self.method == "GET")
+        if self.clears_cache is None:
+            object.__setattr__(self, "clears_cache", not self.idempotent)
+        registry[self.name] = self
+
+    @property
+    def path_fields(self) -> set[str]:
+        return {name for _, name, _, _ in string.Formatter().parse(self.path) if name}
+
+
+@dataclass(frozen=True)
+class RequestRecord:
+    endpoint: str
+    method: str
+    status: int | None
+    elapsed: float
+    size: int
+    error: str | None
+    attempt: int
+
+
+registry: dict[str, Endpoint] = {}
+request_hooks: list[Callable[[RequestRecord], None]] = []
+counters: Counter = Counter()
+
+_session = requests.Session()
+_session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=32))
+_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=32))
+if CASSETTE_MODE:
+    cassettes.install(_session, CASSETTE_MODE, CASSETTE_PATH, CASSETTE_TIMING, pool_connections=4, pool_maxsize=32)
+
+_lock = threading.Lock()
+_cache: dict[tuple, tuple[float, Any]] = {}
+_inflight: dict[tuple, Future] = {}
+_refreshed_at: dict[str, float] = {}
+
+
+def add_request_hook(hook: Callable[[RequestRecord], None]) -> None:
+    request_hooks.append(hook)
+
+
+def is_error(value: Any) -> bool:
+    return isinstance(value, str) and value.startswith("Error:")
+
+
+def clear_cache() -> None:
+    with _lock:
+        _cache.clear()
+
+
+def _detach(value: Any) -> Any:
+    # fresh dicts and lists all the way down, the frozen models inside are safe to share
+    if isinstance(value, dict):
+        return {key: _detach(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_detach(item) for item in value]
+    return value
+
+
+def _query_value(value: Any) -> Any:
+    if isinstance(value, bool):
+        return str(value).lower()
+    return value
+
+
+def _emit(record: RequestRecord) -> None:
+    for hook in request_hooks:
+        try:
+            hook(record)
+        except Exception:
+            logger.exception("Request hook %r failed.", hook)
+
+
+def _send(endpoint: Endpoint, token: str | None, arguments: dict[str, Any]) -> requests.Response:
+    path_fields = endpoint.path_fields
+    url = URL + endpoint.path.format(**{k: v for k, v in arguments.items() if k in path_fields})
+    params = {
+        key: _query_value(value)
+        for key, value in {**endpoint.params, **arguments}.items()
+        if key not in path_fields and value is not None
+    }
+    headers = {"Authorization": f"Bearer {token}"} if token is not None else None
+
+    attempts = 1 + (REQUEST_RETRIES if endpoint.idempotent else 0)
+    for attempt in range(1, attempts + 1):
+        started = time.perf_counter()
+        try:
+            response = _session.request(
+                endpoint.method,
+                url,
+                params=params,
+                headers=headers,
+                timeout=REQUEST_TIMEOUT,
+            )
+        except (requests.ConnectionError, requests.Timeout) as exc:
+            _emit(RequestRecord(endpoint.name, endpoint.method, None, time.perf_counter() - started, 0, type(exc).__name__, attempt))
+            if attempt == attempts:
+                raise
+        else:
+            elapsed = time.perf_counter() - started
+            _emit(RequestRecord(
+                endpoint.name,
+                endpoint.method,
+                response.status_code,
+                elapsed,
+                len(response.content),
+                None,
+                attempt,
+            ))
+            logger.debug(
+                "%s %s -> %s in %.0fms",
+                endpoint.method,
+                endpoint.name,
+                response.status_code,
+                elapsed * 1000,
+                extra={"endpoint": endpoint.name, "status": response.status_code, "latency": elapsed},
+            )
+            if response.status_code not in RETRY_STATUSES or attempt == attempts:
+                return response
+
+        counters[f"{endpoint.name}.retries"] += 1
+        time.sleep(RETRY_BACKOFF * 2 ** (attempt - 1))
+
+
+def _refresh_token(token: str) -> None:
+    # every moderator call used to refresh first; once a minute per token is plenty
+    now = time.monotonic()
+    with _lock:
+        if now - _refreshed_at.get(token, float("-inf")) < TOKEN_REFRESH_INTERVAL:
+            return
+        _refreshed_at[token] = now
+
+    call(REFRESH_TOKEN, token)
+
+
+def _execute(endpoint: Endpoint, token: str | None, arguments: dict[str, Any]) -> Any:
+    if endpoint.auth and endpoint is not REFRESH_TOKEN:
+        _refresh_token(token)
+
+    response = _send(endpoint, token, arguments)
+
+    if response.status_code == 200:
+        value = endpoint.parse(response)
+        if value is not None:
+            return value
+    elif response.status_code in endpoint.errors:
+        return endpoint.errors[response.status_code]
+
+    return endpoint.error
+
+
+def call(endpoint: Endpoint, token: str | None = None, **arguments: Any) -> Any:
+    key = (endpoint.name, token if endpoint.auth else None, tuple(sorted(arguments.items())))
+
+    if endpoint.cache_ttl:
+        with _lock:
+            cached = _cache.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            counters[f"{endpoint.name}.cache_hits"] += 1
+            return _detach(cached[1])
+
+    if not endpoint.idempotent:
+        value = _execute(endpoint, token, arguments)
+        if endpoint.clears_cache and not is_error(value):
+            # a successful write can change anything we have cached
+            clear_cache()
+        return value
+
+    # identical reads that arrive while one is in flight wait for its result
+    with _lock:
+        future = _inflight.get(key)
+        owner = future is None
+        if owner:
+            future = _inflight[key] = Future()
+
+    if not owner:
+        counters[f"{endpoint.name}.coalesced"] += 1
+        return _detach(future.result())
+
+    try:
+        value = _execute(endpoint, token, arguments)
+        # callers are free to change what they get back, the cache and waiters share a copy nobody is handed
+        shared = _detach(value)
+        if endpoint.cache_ttl and not is_error(value):
+            with _lock:
+                _cache[key] = (time.monotonic() + endpoint.cache_ttl, shared)
+                while len(_cache) > RESPONSE_CACHE_SIZE:
+                    _cache.pop(next(iter(_cache)))
+    except BaseException as exc:
+        future.set_exception(exc)
+        raise
+    else:
+        future.set_result(shared)
+    finally:
+        with _lock:
+            _inflight.pop(key, None)
+
+    return value
+
+
+def call_many(
+    endpoint: Endpoint,
+    arguments: Iterable[dict[str, Any]],
+    token: str | None = None,
+    max_workers: int = 4,
+) -> list[Any]:
+    arguments = list(arguments)
+    if len(arguments) <= 1:
+        return [call(endpoint, token, **kwargs) for kwargs in arguments]
+
+    # pool threads don't inherit the caller's context, hand each call its own copy
+    contexts = [contextvars.copy_context() for _ in arguments]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(
+            lambda context, kwargs: context.run(call, endpoint, token, **kwargs),
+            contexts,
+            arguments,
+        ))
+
+
+def _parse_refreshed_token(response: requests.Response) -> str | None:
+    if response.text == "ok":
+        return response.cookies.get("Token")
+    return None
+
+
+REFRESH_TOKEN = Endpoint(
+    name="refresh_token",
+    method="POST",
+    path="/api/moderation/refresh_token",
+    parse=_parse_refreshed_token,
+    error="Error: Unable to refresh moderator token.",
+    auth=True,
+    idempotent=False,
+    clears_cache=False,
+)
@@ -0,0 +1,188 @@
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+
+from config import HISTORY_PATH, HISTORY_RAW_RETENTION
+
+
+HOUR = 3600
+DAY = 86400
+
+ROLLUP_PERIODS = (HOUR, DAY)
+ROLLUP_RETENTION = {
+    HOUR: 90 * DAY,
+    DAY: None,
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS samples (
+    metric TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (metric, ts)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS rollups (
+    metric TEXT NOT NULL,
+    period INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    total REAL NOT NULL,
+    min REAL NOT NULL,
+    max REAL NOT NULL,
+    last REAL NOT NULL,
+    PRIMARY KEY (metric, period, bucket)
+) WITHOUT ROWID;
+"""
+
+UPSERT_ROLLUP = """
+INSERT INTO rollups (metric, period, bucket, count, total, min, max, last)
+VALUES (?, ?, ?, 1, ?, ?, ?, ?)
+ON CONFLICT (metric, period, bucket) DO UPDATE SET
+    count = count + 1,
+    total = total + excluded.total,
+    min = MIN(min, excluded.min),
+    max = MAX(max, excluded.max),
+    last = excluded.last
+"""
+
+
+@dataclass(frozen=True)
+class MetricSummary:
+    metric: str
+    window: int
+    peak: float | None
+    low: float | None
+    average: float | None
+    previous_average: float | None
+    latest: float | None
+    previous_latest: float | None
+
+    @property
+    def trend(self) -> float | None:
+        if self.average is None or not self.previous_average:
+            return None
+        return (self.average - self.previous_average) / self.previous_average * 100
+
+    @property
+    def growth(self) -> float | None:
+        if self.latest is None:
+            return None
+        # with less history than the window, fall back to growth since the oldest sample
+        baseline = self.previous_latest if self.previous_latest is not None else self.low
+        return self.latest - baseline
+
+
+class HistoryStore:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.last_sample_at: int | None = None
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(SCHEMA)
+            row = connection.execute("SELECT MAX(ts) FROM samples").fetchone()
+            self.last_sample_at = row[0] if row else None
+            self._connection = connection
+
+        return self._connection
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def latest_sample_at(self) -> int | None:
+        with self._lock:
+            self._connect()
+            return self.last_sample_at
+
+    def record(self, values: dict[str, float], ts: int | None = None) -> None:
+        ts = int(time.time()) if ts is None else int(ts)
+        values = {metric: float(value) for metric, value in values.items() if value is not None}
+        if not values:
+            return
+
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                # a repeated (metric, ts) sample is dropped, folding it in again would count it twice
+                inserted = {
+                    metric: value
+                    for metric, value in values.items()
+                    if connection.execute(
+                        "INSERT INTO samples (metric, ts, value) VALUES (?, ?, ?) "
+                        "ON CONFLICT (metric, ts) DO NOTHING",
+                        (metric, ts, value),
+                    ).rowcount == 1
+                }
+                # rollups are folded in as samples arrive so reads never touch raw rows
+                connection.executemany(
+                    UPSERT_ROLLUP,
+                    [
+                        (metric, period, ts - ts % period, value, value, value, value)
+                        for metric, value in inserted.items()
+                        for period in ROLLUP_PERIODS
+                    ],
+                )
+                self._prune(connection, ts)
+
+            self.last_sample_at = ts
+
+    def _prune(self, connection: sqlite3.Connection, now: int) -> None:
+        connection.execute("DELETE FROM samples WHERE ts < ?", (now - HISTORY_RAW_RETENTION,))
+        for period, retention in ROLLUP_RETENTION.items():
+            if retention is not None:
+                connection.execute(
+                    "DELETE FROM rollups WHERE period = ? AND bucket < ?",
+                    (period, now - retention),
+                )
+
+    def rollups(self, metric: str, period: int, since: int, until: int | None = None) -> list[tuple]:
+        until = int(time.time()) if until is None else until
+        with self._lock:
+            return self._connect().execute(
+                "SELECT bucket, count, total, min, max, last FROM rollups "
+                "WHERE metric = ? AND period = ? AND bucket >= ? AND bucket <= ? "
+                "ORDER BY bucket",
+                (metric, period, since - since % period, until),
+            ).fetchall()
+
+    def summary(self, metric: str, window: int, now: int | None = None) -> MetricSummary:
+        now = int(time.time()) if now is None else now
+        period = HOUR if window <= 7 * DAY else DAY
+
+        rows = self.rollups(metric, period, now - 2 * window, now)
+        split = now - window
+        current = [row for row in rows if row[0] + period > split]
+        previous = [row for row in rows if row[0] + period <= split]
+
+        def average(buckets: list[tuple]) -> float | None:
+            count = sum(row[1] for row in buckets)
+            return sum(row[2] for row in buckets) / count if count else None
+
+        return MetricSummary(
+            metric=metric,
+            window=window,
+            peak=max((row[4] for row in current), default=None),
+            low=min((row[3] for row in current), default=None),
+            average=average(current),
+            previous_average=average(previous),
+            latest=current[-1][5] if current else None,
+            previous_latest=previous[-1][5] if previous else None,
+        )
+
+
+history_store = HistoryStore(HISTORY_PATH)
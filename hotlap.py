@@ -0,0 +1,110 @@
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+
+from config import HOTLAP_STATE_PATH, HOTLAP_FAST_INTERVAL, HOTLAP_IDLE_INTERVAL
+from models import LapTime
+
+
+HOTLAP_RESET_WINDOW = 600
+HOTLAP_ACTIVE_WINDOW = 600
+
+
+@dataclass(frozen=True)
+class HotlapRecord:
+    rank: int | None
+    score_id: str
+    player_username: str | None
+    best_lap_time: LapTime
+    previous_time: LapTime | None
+    updated_at: str | None
+
+    @property
+    def is_improvement(self) -> bool:
+        return self.previous_time is not None
+
+
+class HotlapTracker:
+    def __init__(self, path: str = HOTLAP_STATE_PATH) -> None:
+        self.path = path
+        self.track_id = None
+        self.times: dict[str, LapTime] = {}
+        self.last_change_at = 0.0
+        self._has_baseline = False
+        self._lock = threading.Lock()
+
+    def load(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as state_file:
+                state = json.load(state_file)
+        except (OSError, ValueError):
+            return
+
+        self.track_id = state.get("trackId")
+        self.times = {str(k): LapTime(v) for k, v in state.get("times", {}).items()}
+        self._has_baseline = True
+
+    def save(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as state_file:
+            json.dump({"trackId": self.track_id, "times": self.times}, state_file)
+        os.replace(temp_path, self.path)
+
+    def update(self, hotlap: dict) -> list[HotlapRecord]:
+        current = {}
+        for entry in hotlap.get("topTimes", []):
+            if entry.id is None or entry.best_lap_time is None:
+                continue
+            current[str(entry.id)] = (entry, entry.best_lap_time)
+
+        with self._lock:
+            # first run or a new hotlap track: remember what is there without announcing it
+            if not self._has_baseline or hotlap.get("id") != self.track_id:
+                self.track_id = hotlap.get("id")
+                self.times = {score_id: lap_time for score_id, (_, lap_time) in current.items()}
+                self._has_baseline = True
+                self.save()
+                return []
+
+            records = []
+            for score_id, (entry, lap_time) in current.items():
+                previous_time = self.times.get(score_id)
+                if previous_time is not None and lap_time >= previous_time:
+                    continue
+
+                records.append(HotlapRecord(
+                    rank=entry.rank,
+                    score_id=score_id,
+                    player_username=entry.player_username,
+                    best_lap_time=lap_time,
+                    previous_time=previous_time,
+                    updated_at=entry.updated_at,
+                ))
+                self.times[score_id] = lap_time
+
+            if records:
+                self.last_change_at = time.time()
+                self.save()
+
+        records.sort(key=lambda record: (record.rank is None, record.rank or 0))
+        return records
+
+    def next_interval(self, reset_in_seconds) -> float:
+        interval = HOTLAP_IDLE_INTERVAL
+
+        if time.time() - self.last_change_at < HOTLAP_ACTIVE_WINDOW:
+            interval = HOTLAP_FAST_INTERVAL
+
+        if isinstance(reset_in_seconds, (int, float)) and reset_in_seconds >= 0:
+            if reset_in_seconds <= HOTLAP_RESET_WINDOW:
+                interval = HOTLAP_FAST_INTERVAL
+            # wake up just after the reset so the new track gets its baseline straight away
+            interval = min(interval, reset_in_seconds + 5)
+
+        return max(interval, 5)
@@ -0,0 +1,237 @@
+import threading
+from bisect import bisect_left, insort
+from itertools import islice
+from typing import Iterable, NamedTuple
+
+import discord
+from discord import app_commands
+
+
+MAX_AUTOCOMPLETE_CHOICES = 25
+MAX_CHOICE_NAME_LENGTH = 100
+MAX_SEARCH_CANDIDATES = 256
+
+
+class UsernameIndex:
+    # sorted array of casefolded names, swapped on write so lookups never take the lock
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._keys: list[str] = []
+        self._names: dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, username: object) -> bool:
+        return isinstance(username, str) and username.strip().casefold() in self._names
+
+    def add(self, username) -> None:
+        self.add_many((username,))
+
+    def add_many(self, usernames: Iterable) -> None:
+        cleaned = {}
+        for username in usernames:
+            if not isinstance(username, str):
+                continue
+
+            username = username.strip()
+            if username:
+                cleaned[username.casefold()] = username
+
+        if not cleaned:
+            return
+
+        with self._lock:
+            names = self._names
+            new_keys = [key for key in cleaned if key not in names]
+
+            if any(names.get(key) != username for key, username in cleaned.items()):
+                updated_names = dict(names)
+                updated_names.update(cleaned)
+                self._names = updated_names
+
+            if new_keys:
+                self._keys = sorted(self._keys + new_keys)
+
+    def search(self, prefix: str, limit: int = MAX_AUTOCOMPLETE_CHOICES) -> list[str]:
+        keys = self._keys
+        names = self._names
+        prefix = (prefix or "").strip().casefold()
+
+        start = bisect_left(keys, prefix)
+        results = []
+        for key in keys[start:start + limit]:
+            if not key.startswith(prefix):
+                break
+            results.append(names[key])
+
+        return results
+
+
+known_players = UsernameIndex()
+
+
+async def username_autocomplete(
+    interaction: discord.Interaction,
+    current: str,
+) -> list[app_commands.Choice[str]]:
+    return [
+        app_commands.Choice(name=username, value=username)
+        for username in known_players.search(current)
+    ]
+
+
+def _trigrams(text: str) -> frozenset[str]:
+    padded = f"  {text.casefold()} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+class IndexedCreation(NamedTuple):
+    id: int
+    name: str
+    creator_username: str | None
+    type: str | None
+    grams: frozenset[str]
+    folded: str
+
+
+class CreationIndex:
+    # writers update in place with single dict/list operations, which readers can interleave with without the lock.
+    # an entry is stored before any posting points at it, so a search never sees an id it cannot resolve
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: dict[int, IndexedCreation] = {}
+        self._postings: dict[str, list[int]] = {}
+        self._id_keys: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, creation_id: int) -> IndexedCreation | None:
+        return self._entries.get(creation_id)
+
+    def add(self, creation_id, name, creator_username=None, creation_type=None) -> None:
+        self.add_many(((creation_id, name, creator_username, creation_type),))
+
+    def add_many(self, creations: Iterable[tuple]) -> None:
+        with self._lock:
+            entries = self._entries
+            postings = self._postings
+
+            for creation_id, name, creator_username, creation_type in creations:
+                try:
+                    creation_id = int(creation_id)
+                except (TypeError, ValueError):
+                    continue
+
+                if not isinstance(name, str) or not name.strip():
+                    continue
+
+                previous = entries.get(creation_id)
+                if previous is None:
+                    entry = IndexedCreation(creation_id, name, creator_username, creation_type, _trigrams(name), name.casefold())
+                else:
+                    entry = IndexedCreation(
+                        creation_id,
+                        name,
+                        creator_username or previous.creator_username,
+                        creation_type or previous.type,
+                        previous.grams if previous.name == name else _trigrams(name),
+                        name.casefold(),
+                    )
+                    if entry == previous:
+                        continue
+
+                entries[creation_id] = entry
+
+                if previous is None:
+                    grams = entry.grams
+                    insort(self._id_keys, str(creation_id))
+                elif previous.name != name:
+                    for gram in previous.grams - entry.grams:
+                        ids = postings[gram]
+                        ids.remove(creation_id)
+                        if not ids:
+                            del postings[gram]
+                    grams = entry.grams - previous.grams
+                else:
+                    continue
+
+                for gram in grams:
+                    ids = postings.get(gram)
+                    if ids is None:
+                        postings[gram] = [creation_id]
+                    else:
+                        ids.append(creation_id)
+
+    def search(self, query: str, limit: int = MAX_AUTOCOMPLETE_CHOICES) -> list[IndexedCreation]:
+        query = (query or "").strip()
+        if not query:
+            return []
+
+        if query.isdigit():
+            return self._search_id(query, limit)
+
+        folded = query.casefold()
+        query_grams = _trigrams(query)
+        postings = self._postings
+        entries = self._entries
+
+        # candidates come from the rarest grams first, common grams like " tr" would otherwise pull in most of the index
+        candidates: set[int] = set()
+        for ids in sorted((postings.get(gram, ()) for gram in query_grams), key=len):
+            if not ids:
+                continue
+            if len(candidates) + len(ids) > MAX_SEARCH_CANDIDATES:
+                candidates.update(islice(ids, MAX_SEARCH_CANDIDATES - len(candidates)))
+                break
+            candidates.update(ids)
+
+        scored = []
+        for creation_id in candidates:
+            entry = entries.get(creation_id)
+            if entry is None:
+                continue
+            # dice coefficient, nudged towards names that start with or contain the query
+            score = 2 * len(query_grams & entry.grams) / (len(query_grams) + len(entry.grams))
+            if entry.folded.startswith(folded):
+                score += 1
+            elif folded in entry.folded:
+                score += 0.5
+            scored.append((score, entry.folded, entry))
+
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return [entry for _, _, entry in scored[:limit]]
+
+    def _search_id(self, prefix: str, limit: int) -> list[IndexedCreation]:
+        keys = self._id_keys
+        entries = self._entries
+        start = bisect_left(keys, prefix)
+        results = []
+        for key in keys[start:start + limit]:
+            if not key.startswith(prefix):
+                break
+            results.append(entries[int(key)])
+
+        return results
+
+
+known_creations = CreationIndex()
+
+
+def creation_choice_name(entry: IndexedCreation) -> str:
+    label = f"{entry.name} by {entry.creator_username}" if entry.creator_username else entry.name
+    suffix = f" ({entry.id})"
+    if len(label) + len(suffix) > MAX_CHOICE_NAME_LENGTH:
+        label = label[:MAX_CHOICE_NAME_LENGTH - len(suffix) - 3] + "..."
+    return label + suffix
+
+
+async def creation_id_autocomplete(
+    interaction: discord.Interaction,
+    current: str,
+) -> list[app_commands.Choice[int]]:
+    return [
+        app_commands.Choice(name=creation_choice_name(entry), value=entry.id)
+        for entry in known_creations.search(str(current))
+    ]
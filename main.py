@@ -3,20 +3,33 @@ import os
 import discord
 import requests
 import logging
+from discord import app_commands
 from discord.ext import commands
 
 import config
+from logs import parse_sampling, setup_logging
+from ratelimits import rate_limit_message, rate_limiter
+from tracing import finish_trace, start_trace
 
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
-)
+setup_logging(config.LOG_LEVEL, config.LOG_FORMAT, parse_sampling(config.LOG_SAMPLING))
 logger = logging.getLogger("skidplate")
 
 intents = discord.Intents.default()
 intents.message_content = True
 
+class Tree(app_commands.CommandTree):
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        # checked before the command runs, so a rejected command never reaches PLGarage
+        if interaction.type is discord.InteractionType.application_command:
+            limited = rate_limiter.acquire(interaction)
+            if limited is not None:
+                await interaction.response.send_message(rate_limit_message(*limited), ephemeral=True)
+                return False
+
+        start_trace(interaction)
+        return True
+
 class Bot(commands.Bot):
     async def setup_hook(self) -> None:
         await load_extensions()
@@ -26,12 +39,18 @@ class Bot(commands.Bot):
 
 bot = Bot(
     command_prefix=config.COMMAND_PREFIX,
-    intents=intents
+    intents=intents,
+    tree_cls=Tree,
 )
 
+@bot.event
+async def on_app_command_completion(interaction: discord.Interaction, command) -> None:
+    finish_trace(interaction)
+
 @bot.tree.error
 async def on_app_command_error(interaction: discord.Interaction, error: Exception) -> None:
     original = getattr(error, "original", error)
+    finish_trace(interaction, original)
 
     if isinstance(original, discord.NotFound) and getattr(original, "code", None) == 10062:
         command_name = interaction.command.qualified_name if interaction.command else "unknown"
@@ -0,0 +1,147 @@
+import gc
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from dataclasses import dataclass
+
+import discord
+
+
+logger = logging.getLogger("skidplate.memory")
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+TRACE_FRAMES = 1
+
+SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+@dataclass(frozen=True)
+class MemoryReport:
+    taken_at: float
+    rss: int | None
+    traced: int | None
+    peak: int | None
+    views: Counter
+    top: list[tracemalloc.Statistic]
+    growth: list[tracemalloc.StatisticDiff]
+    since: float | None
+
+
+def resident_memory() -> int | None:
+    try:
+        with open("/proc/self/statm", "r", encoding="ascii") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+def count_live_views() -> Counter:
+    # views stay referenced by the view store until they time out, which is what we want to see
+    return Counter(
+        type(obj).__name__
+        for obj in gc.get_objects()
+        if isinstance(obj, discord.ui.View)
+    )
+
+
+def describe_frame(frame: tracemalloc.Frame) -> str:
+    filename = frame.filename
+    if filename.startswith(ROOT):
+        filename = os.path.relpath(filename, ROOT)
+    else:
+        filename = "/".join(filename.split(os.sep)[-2:])
+    return f"{filename}:{frame.lineno}"
+
+
+class MemoryTracker:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._previous: tracemalloc.Snapshot | None = None
+        self._previous_at: float | None = None
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self, frames: int = TRACE_FRAMES) -> None:
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(frames)
+                logger.info("Started tracing allocations with %s frames per traceback.", frames)
+            self._previous = self._take()
+            self._previous_at = time.time()
+
+    def stop(self) -> None:
+        with self._lock:
+            tracemalloc.stop()
+            self._previous = None
+            self._previous_at = None
+            logger.info("Stopped tracing allocations.")
+
+    def _take(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+
+    def report(self, limit: int = 25, key_type: str = "lineno") -> MemoryReport:
+        # slow on a big heap, call it from a worker thread
+        views = count_live_views()
+        if not tracemalloc.is_tracing():
+            return MemoryReport(time.time(), resident_memory(), None, None, views, [], [], None)
+
+        with self._lock:
+            snapshot = self._take()
+            previous, since = self._previous, self._previous_at
+            self._previous, self._previous_at = snapshot, time.time()
+
+        traced, peak = tracemalloc.get_traced_memory()
+        growth = []
+        if previous is not None:
+            growth = [
+                diff for diff in snapshot.compare_to(previous, key_type)
+                if diff.size_diff > 0
+            ][:limit]
+
+        return MemoryReport(
+            taken_at=time.time(),
+            rss=resident_memory(),
+            traced=traced,
+            peak=peak,
+            views=views,
+            top=snapshot.statistics(key_type)[:limit],
+            growth=growth,
+            since=since,
+        )
+
+
+def format_report(report: MemoryReport) -> str:
+    def size(value: int | None) -> str:
+        return "-" if value is None else f"{value / 1024 / 1024:.1f} MiB"
+
+    lines = [
+        f"RSS: {size(report.rss)} | traced: {size(report.traced)} | traced peak: {size(report.peak)}",
+        "",
+        "Live views",
+    ]
+    lines += [f"{count:>8}  {name}" for name, count in report.views.most_common()] or ["       0"]
+
+    if report.growth:
+        lines += ["", "Growth since previous snapshot", f"{'size':>12} {'count':>8}  site"]
+        for diff in report.growth:
+            lines.append(f"{diff.size_diff:>+12,} {diff.count_diff:>+8,}  {describe_frame(diff.traceback[0])}")
+
+    if report.top:
+        lines += ["", "Largest allocation sites", f"{'size':>12} {'count':>8}  site"]
+        for statistic in report.top:
+            lines.append(f"{statistic.size:>12,} {statistic.count:>8,}  {describe_frame(statistic.traceback[0])}")
+
+    return "\n".join(lines) + "\n"
+
+
+memory_tracker = MemoryTracker()
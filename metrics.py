@@ -0,0 +1,225 @@
+import bisect
+import logging
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+
+from aiohttp import web
+
+import endpoints
+from endpoints import RequestRecord, add_request_hook
+
+
+logger = logging.getLogger("skidplate.metrics")
+
+LATENCY_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+
+class Histogram:
+    __slots__ = ("bounds", "counts", "count", "total", "max")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float | None:
+        # linear interpolation inside the bucket, same estimate prometheus' histogram_quantile makes
+        if not self.count:
+            return None
+
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = self.bounds[index - 1] if index else 0.0
+                upper = self.bounds[index] if index < len(self.bounds) else self.max
+                return min(lower + (upper - lower) * (rank - seen) / bucket_count, self.max)
+            seen += bucket_count
+
+        return self.max
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        buckets = []
+        running = 0
+        for bound, bucket_count in zip(self.bounds, self.counts):
+            running += bucket_count
+            buckets.append((f"{bound:g}", running))
+        buckets.append(("+Inf", self.count))
+        return buckets
+
+
+@dataclass
+class EndpointMetrics:
+    latency: Histogram = field(default_factory=lambda: Histogram(LATENCY_BUCKETS))
+    size: Histogram = field(default_factory=lambda: Histogram(SIZE_BUCKETS))
+    statuses: Counter = field(default_factory=Counter)
+    errors: Counter = field(default_factory=Counter)
+
+    @property
+    def failures(self) -> int:
+        return sum(self.errors.values()) + sum(
+            count for status, count in self.statuses.items() if status >= 400
+        )
+
+
+@dataclass(frozen=True)
+class EndpointSummary:
+    endpoint: str
+    requests: int
+    failures: int
+    p50: float | None
+    p95: float | None
+    max: float
+    average_size: float
+    statuses: dict[int, int]
+    errors: dict[str, int]
+
+
+class RequestMetrics:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._endpoints: dict[str, EndpointMetrics] = {}
+        self.started_at = time.time()
+
+    def observe(self, record: RequestRecord) -> None:
+        with self._lock:
+            metrics = self._endpoints.get(record.endpoint)
+            if metrics is None:
+                metrics = self._endpoints[record.endpoint] = EndpointMetrics()
+
+            metrics.latency.observe(record.elapsed)
+            if record.status is None:
+                metrics.errors[record.error or "Unknown"] += 1
+            else:
+                metrics.statuses[record.status] += 1
+                metrics.size.observe(record.size)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._endpoints.clear()
+            self.started_at = time.time()
+
+    def summaries(self) -> list[EndpointSummary]:
+        with self._lock:
+            summaries = [
+                EndpointSummary(
+                    endpoint=name,
+                    requests=metrics.latency.count,
+                    failures=metrics.failures,
+                    p50=metrics.latency.quantile(0.5),
+                    p95=metrics.latency.quantile(0.95),
+                    max=metrics.latency.max,
+                    average_size=metrics.size.total / metrics.size.count if metrics.size.count else 0.0,
+                    statuses=dict(metrics.statuses),
+                    errors=dict(metrics.errors),
+                )
+                for name, metrics in self._endpoints.items()
+            ]
+
+        return sorted(summaries, key=lambda summary: summary.p95 or 0.0, reverse=True)
+
+    def render_prometheus(self) -> str:
+        lines = [
+            "# HELP skidplate_upstream_request_duration_seconds PLGarage request latency per attempt.",
+            "# TYPE skidplate_upstream_request_duration_seconds histogram",
+        ]
+
+        with self._lock:
+            endpoints_metrics = sorted(self._endpoints.items())
+
+            for name, metrics in endpoints_metrics:
+                for bound, count in metrics.latency.cumulative():
+                    lines.append(
+                        f'skidplate_upstream_request_duration_seconds_bucket{{endpoint="{name}",le="{bound}"}} {count}'
+                    )
+                lines.append(f'skidplate_upstream_request_duration_seconds_sum{{endpoint="{name}"}} {metrics.latency.total:.6f}')
+                lines.append(f'skidplate_upstream_request_duration_seconds_count{{endpoint="{name}"}} {metrics.latency.count}')
+
+            lines += [
+                "# HELP skidplate_upstream_response_size_bytes PLGarage response body size.",
+                "# TYPE skidplate_upstream_response_size_bytes histogram",
+            ]
+            for name, metrics in endpoints_metrics:
+                for bound, count in metrics.size.cumulative():
+                    lines.append(f'skidplate_upstream_response_size_bytes_bucket{{endpoint="{name}",le="{bound}"}} {count}')
+                lines.append(f'skidplate_upstream_response_size_bytes_sum{{endpoint="{name}"}} {metrics.size.total:.0f}')
+                lines.append(f'skidplate_upstream_response_size_bytes_count{{endpoint="{name}"}} {metrics.size.count}')
+
+            lines += [
+                "# HELP skidplate_upstream_responses_total PLGarage responses by status code.",
+                "# TYPE skidplate_upstream_responses_total counter",
+            ]
+            for name, metrics in endpoints_metrics:
+                for status, count in sorted(metrics.statuses.items()):
+                    lines.append(f'skidplate_upstream_responses_total{{endpoint="{name}",status="{status}"}} {count}')
+
+            lines += [
+                "# HELP skidplate_upstream_errors_total PLGarage requests that failed without a response.",
+                "# TYPE skidplate_upstream_errors_total counter",
+            ]
+            for name, metrics in endpoints_metrics:
+                for error, count in sorted(metrics.errors.items()):
+                    lines.append(f'skidplate_upstream_errors_total{{endpoint="{name}",error="{error}"}} {count}')
+
+        lines += [
+            "# HELP skidplate_client_events_total Response cache hits, coalesced reads and retries.",
+            "# TYPE skidplate_client_events_total counter",
+        ]
+        for key, count in sorted(endpoints.counters.items()):
+            name, _, event = key.rpartition(".")
+            lines.append(f'skidplate_client_events_total{{endpoint="{name}",event="{event}"}} {count}')
+
+        return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    def __init__(self, host: str, port: int) -> None:
+        self.host = host
+        self.port = port
+        self._runner: web.AppRunner | None = None
+
+    async def start(self) -> None:
+        if self._runner is not None:
+            return
+
+        app = web.Application()
+        app.router.add_get("/metrics", self._handle_metrics)
+
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        try:
+            await web.TCPSite(runner, self.host, self.port).start()
+        except OSError:
+            await runner.cleanup()
+            raise
+
+        self._runner = runner
+        logger.info("Serving metrics on http://%s:%s/metrics", self.host, self.port)
+
+    async def stop(self) -> None:
+        if self._runner is None:
+            return
+
+        await self._runner.cleanup()
+        self._runner = None
+
+    async def _handle_metrics(self, request: web.Request) -> web.Response:
+        return web.Response(
+            body=request_metrics.render_prometheus().encode(),
+            headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"},
+        )
+
+
+request_metrics = RequestMetrics()
+add_request_hook(request_metrics.observe)
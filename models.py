@@ -0,0 +1,250 @@
+from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from functools import lru_cache
+
+
+@lru_cache(maxsize=4096)
+def _format_ms(ms: int) -> str:
+    sign = "-" if ms < 0 else ""
+    ms = abs(ms)
+    return f"{sign}{ms // 60000:02}:{ms % 60000 // 1000:02}:{ms % 1000:03}"
+
+
+class LapTime(int):
+    # lap times are parsed once into whole milliseconds, so sorting, comparing
+    # and subtracting them is plain int arithmetic
+    __slots__ = ()
+
+    @classmethod
+    def parse(cls, value) -> "LapTime | None":
+        if value is None or isinstance(value, LapTime):
+            return value
+
+        if isinstance(value, str):
+            value = value.strip()
+            if ":" in value:
+                # only a leading sign, as written by delta(); "1:-5:000" is not a time
+                sign = -1 if value.startswith("-") else 1
+                parts = value.removeprefix("-").split(":")
+                if not all(part.isdigit() for part in parts):
+                    return None
+                if len(parts) == 3:
+                    return cls(sign * (int(parts[0]) * 60000 + int(parts[1]) * 1000 + int(parts[2])))
+                if len(parts) == 2:
+                    return cls(sign * (int(parts[0]) * 1000 + int(parts[1])))
+                return None
+
+        # plain numbers from the api are seconds
+        if isinstance(value, int) and not isinstance(value, bool):
+            return cls(value * 1000)
+
+        try:
+            return cls((Decimal(str(value)) * 1000).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+        except (InvalidOperation, ValueError):
+            return None
+
+    @property
+    def seconds(self) -> float:
+        return int(self) / 1000
+
+    def format(self) -> str:
+        return _format_ms(int(self))
+
+    def delta(self, other: int) -> str:
+        difference = int(self) - int(other)
+        return ("+" if difference >= 0 else "") + _format_ms(difference)
+
+    def __add__(self, other):
+        if isinstance(other, int):
+            return LapTime(int(self) + int(other))
+        return NotImplemented
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if isinstance(other, int):
+            return LapTime(int(self) - int(other))
+        return NotImplemented
+
+    def __rsub__(self, other):
+        if isinstance(other, int):
+            return LapTime(int(other) - int(self))
+        return NotImplemented
+
+    def __str__(self) -> str:
+        return self.format()
+
+    def __format__(self, spec: str) -> str:
+        return self.format() if not spec else int.__format__(int(self), spec)
+
+    def __repr__(self) -> str:
+        return f"LapTime({int(self)})"
+
+
+def _all_time(value):
+    # counters are {"all_time": n, ...} on most endpoints and a bare number on the top lists
+    return value.get("all_time") if isinstance(value, dict) else value
+
+
+@dataclass(frozen=True, slots=True)
+class Player:
+    user_id: int | None
+    username: str | None
+    quote: str | None
+    star_rating: float | None
+    online_races: int
+    online_wins: int | None
+    win_streak: int | None
+    longest_win_streak: int | None
+    skill_level_id: int | None
+    skill_level_name: str | None
+    creation_points: int | None
+    race_xp: int | None
+    skill_rating: float | None
+    longest_drift: LapTime | None
+    longest_hang_time: LapTime | None
+    presence: str | None
+    is_banned: bool | None
+    created_at: str | None
+    total_mods: int | None
+    total_karts: int | None
+    total_tracks: int | None
+
+    @classmethod
+    def from_payload(cls, r: dict, username: str | None = None) -> "Player":
+        skill_level = r.get("skillLevels", {}).get("PS3", {})
+        creations_count = r.get("creationsCount", {}).get("mnr", {}).get("PS3", {})
+
+        return cls(
+            user_id=r.get("userId"),
+            username=r.get("username") or username,
+            quote=r.get("quote"),
+            star_rating=r.get("starRating"),
+            online_races=sum(r.get(key) or 0 for key in ("onlineRaces", "onlineFinished", "onlineForfeits")),
+            online_wins=r.get("onlineWins"),
+            win_streak=r.get("winStreak"),
+            longest_win_streak=r.get("longestWinStreak"),
+            skill_level_id=skill_level.get("id"),
+            skill_level_name=skill_level.get("name"),
+            creation_points=skill_level.get("creationPoints"),
+            race_xp=skill_level.get("raceXp"),
+            skill_rating=r.get("skillRating"),
+            longest_drift=LapTime.parse(r.get("longestDrift")),
+            longest_hang_time=LapTime.parse(r.get("longestHangTime")),
+            presence=r.get("presence"),
+            is_banned=r.get("isBanned"),
+            created_at=r.get("createdAt"),
+            total_mods=creations_count.get("CHARACTER"),
+            total_karts=creations_count.get("KART"),
+            total_tracks=creations_count.get("TRACK"),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class Creation:
+    id: int | None
+    name: str | None
+    creator_username: str | None
+    type: str | None
+    description: str | None = None
+    rating: float | None = None
+    tags: list | str | None = None
+    is_mnr: bool | None = None
+    created_at: str | None = None
+    downloads: int | None = None
+    views: int | None = None
+    points: int | None = None
+    best_lap_time: LapTime | None = None
+    longest_drift: LapTime | None = None
+    longest_hang_time: LapTime | None = None
+
+    @classmethod
+    def from_payload(cls, c: dict) -> "Creation":
+        is_track = c.get("type") == "TRACK"
+        records = c.get("records") or {}
+
+        # the single creation endpoint nests drift and hang time records in their own objects
+        longest_drift = records.get("longestDrift")
+        if longest_drift is None and isinstance(c.get("longestDrift"), dict):
+            longest_drift = c["longestDrift"].get("longestDrift")
+
+        longest_hang_time = records.get("longestHangTime")
+        if longest_hang_time is None and isinstance(c.get("longestHangTime"), dict):
+            longest_hang_time = c["longestHangTime"].get("longestHangTime")
+
+        return cls(
+            id=c.get("playerCreationId", c.get("id")),
+            name=c.get("name"),
+            creator_username=c.get("creatorUsername"),
+            type=c.get("type"),
+            description=c.get("description"),
+            rating=c.get("rating"),
+            tags=c.get("tags"),
+            is_mnr=c.get("isMNR"),
+            created_at=c.get("createdAt"),
+            downloads=_all_time(c.get("downloads")),
+            views=_all_time(c.get("views")),
+            points=_all_time(c.get("points")),
+            best_lap_time=LapTime.parse(records.get("bestLapTime")) if is_track else None,
+            longest_drift=LapTime.parse(longest_drift) if is_track else None,
+            longest_hang_time=LapTime.parse(longest_hang_time) if is_track else None,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class Score:
+    rank: int | None
+    id: int | None
+    player_username: str | None
+    best_lap_time: LapTime | None
+    updated_at: str | None
+
+    @classmethod
+    def from_payload(cls, t: dict) -> "Score":
+        return cls(
+            rank=t.get("rank"),
+            id=t.get("scoreId", t.get("id")),
+            player_username=t.get("playerUsername"),
+            best_lap_time=LapTime.parse(t.get("bestLapTime")),
+            updated_at=t.get("updatedAt"),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class Presence:
+    id: int | None
+    username: str | None
+    presence: str | None
+    platform: str | None
+    is_mnr: bool | None
+    is_rpcn: bool | None
+
+    @classmethod
+    def from_payload(cls, p: dict) -> "Presence":
+        return cls(
+            id=p.get("userId"),
+            username=p.get("username"),
+            presence=p.get("presence"),
+            platform=p.get("platform"),
+            is_mnr=p.get("isMNR"),
+            is_rpcn=p.get("isRpcn"),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class Complaint:
+    user_id: int | None
+    player_id: int | None
+    player_creation_id: int | None
+    reason: str | None
+    comments: str | None
+
+    @classmethod
+    def from_payload(cls, c: dict) -> "Complaint":
+        return cls(
+            user_id=c.get("UserId"),
+            player_id=c.get("PlayerId"),
+            player_creation_id=c.get("PlayerCreationId"),
+            reason=c.get("Reason"),
+            comments=c.get("Comments"),
+        )
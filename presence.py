@@ -0,0 +1,153 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Hashable
+
+import requests
+
+from config import PRESENCE_POLL_INTERVAL
+from models import Presence
+from utils import get_all_players_online_presence
+
+
+logger = logging.getLogger("skidplate.presence")
+
+PresenceCallback = Callable[["PresenceSnapshot"], Awaitable[Any]]
+
+
+@dataclass(frozen=True)
+class PresenceSnapshot:
+    is_mnr: bool
+    players: tuple[Presence, ...]
+    fetched_at: float = field(default_factory=time.time)
+
+    @property
+    def total(self) -> int:
+        return len(self.players)
+
+    @property
+    def fingerprint(self) -> tuple:
+        return tuple(
+            (p.id, p.presence, p.platform, p.is_rpcn)
+            for p in self.players
+        )
+
+
+@dataclass(frozen=True)
+class PresenceChanges:
+    joined: tuple[Presence, ...] = ()
+    left: tuple[Presence, ...] = ()
+    changed: tuple[tuple[Presence, Presence], ...] = ()
+
+    def __bool__(self) -> bool:
+        return bool(self.joined or self.left or self.changed)
+
+
+def diff_presence(previous: PresenceSnapshot, current: PresenceSnapshot) -> PresenceChanges:
+    before = {p.id: p for p in previous.players}
+    after = {p.id: p for p in current.players}
+
+    joined_ids = after.keys() - before.keys()
+    left_ids = before.keys() - after.keys()
+    stayed_ids = before.keys() & after.keys()
+
+    return PresenceChanges(
+        joined=tuple(after[i] for i in joined_ids),
+        left=tuple(before[i] for i in left_ids),
+        changed=tuple(
+            (before[i], after[i])
+            for i in stayed_ids
+            if before[i].presence != after[i].presence
+        ),
+    )
+
+
+class PresenceWatcher:
+    # diffs against the snapshot from the last flush, so a player that joins and leaves
+    # inside one interval (or flips presence back and forth) produces nothing
+    def __init__(self) -> None:
+        self.baseline: PresenceSnapshot | None = None
+        self.latest: PresenceSnapshot | None = None
+
+    async def observe(self, snapshot: PresenceSnapshot) -> None:
+        if self.baseline is None:
+            self.baseline = snapshot
+        self.latest = snapshot
+
+    def flush(self) -> PresenceChanges:
+        if self.baseline is None or self.latest is None or self.latest is self.baseline:
+            return PresenceChanges()
+
+        changes = diff_presence(self.baseline, self.latest)
+        self.baseline = self.latest
+        return changes
+
+
+class PresencePoller:
+    # one upstream poll per is_mnr value, fanned out to every subscriber
+    def __init__(self, interval: float = PRESENCE_POLL_INTERVAL) -> None:
+        self.interval = interval
+        self.snapshots: dict[bool, PresenceSnapshot] = {}
+        self._subscribers: dict[Hashable, tuple[bool, PresenceCallback]] = {}
+        self._task: asyncio.Task | None = None
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._subscribers
+
+    def subscribe(self, key: Hashable, callback: PresenceCallback, is_mnr: bool | None = None) -> None:
+        self._subscribers[key] = (True if is_mnr is None else is_mnr, callback)
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def unsubscribe(self, key: Hashable) -> None:
+        self._subscribers.pop(key, None)
+
+    def stop(self) -> None:
+        self._subscribers.clear()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def fetch(self, is_mnr: bool | None = None) -> PresenceSnapshot | str:
+        is_mnr = True if is_mnr is None else is_mnr
+        data = await asyncio.to_thread(get_all_players_online_presence, is_mnr)
+        if isinstance(data, str):
+            return data
+
+        players = sorted(
+            data.get("creations", []),
+            key=lambda p: str(p.username or "").casefold(),
+        )
+        snapshot = PresenceSnapshot(is_mnr=is_mnr, players=tuple(players))
+        self.snapshots[is_mnr] = snapshot
+        return snapshot
+
+    async def _run(self) -> None:
+        while self._subscribers:
+            for is_mnr in {is_mnr for is_mnr, _ in self._subscribers.values()}:
+                try:
+                    snapshot = await self.fetch(is_mnr)
+                except requests.RequestException as exc:
+                    logger.warning("Presence poll failed: %s", exc)
+                    continue
+
+                if isinstance(snapshot, str):
+                    logger.warning("Presence poll failed: %s", snapshot)
+                    continue
+
+                for key, (subscriber_is_mnr, callback) in list(self._subscribers.items()):
+                    if subscriber_is_mnr != is_mnr:
+                        continue
+
+                    try:
+                        await callback(snapshot)
+                    except Exception:
+                        logger.exception("Presence subscriber %r failed, unsubscribing.", key)
+                        self.unsubscribe(key)
+
+            await asyncio.sleep(self.interval)
+
+
+presence_poller = PresencePoller()
@@ -0,0 +1,128 @@
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from types import CodeType
+
+
+logger = logging.getLogger("skidplate.profiler")
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SAMPLE_INTERVAL = 0.005
+MAX_DEPTH = 64
+
+# innermost python frames of a thread that is parked, not working
+IDLE_FRAMES = {
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+}
+
+
+def describe_code(code: CodeType) -> str:
+    filename = code.co_filename
+    if filename.startswith(ROOT):
+        filename = os.path.relpath(filename, ROOT)
+    else:
+        # keep the package and module for third party code, the full path is just noise
+        filename = "/".join(filename.split(os.sep)[-2:])
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    def __init__(self, interval: float = SAMPLE_INTERVAL) -> None:
+        self.interval = interval
+        self.samples = 0
+        self.idle = 0
+        self.commands = 0
+        self.duration = 0.0
+        self.threads: Counter = Counter()
+        self.self_counts: Counter = Counter()
+        self.total_counts: Counter = Counter()
+        self.stacks: Counter = Counter()
+        self._loop_thread_id: int | None = None
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._started = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        # called from the loop, which is the one thread worth telling apart from the pool
+        self._loop_thread_id = threading.get_ident()
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.duration = time.perf_counter() - self._started
+
+    def _thread_name(self, thread_id: int, names: dict[int, str]) -> str:
+        if thread_id == self._loop_thread_id:
+            return "event loop"
+        return re.sub(r"[_-]?\d+$", "", names.get(thread_id, "unknown"))
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        names: dict[int, str] = {}
+
+        while not self._stopped.wait(self.interval):
+            frames = sys._current_frames()
+            if frames.keys() - names.keys():
+                names = {thread.ident: thread.name for thread in threading.enumerate()}
+
+            for thread_id, frame in frames.items():
+                if thread_id == own_id:
+                    continue
+
+                self.samples += 1
+                code = frame.f_code
+                if (os.path.basename(code.co_filename), code.co_name) in IDLE_FRAMES:
+                    self.idle += 1
+                    continue
+
+                stack = []
+                while frame is not None and len(stack) < MAX_DEPTH:
+                    stack.append(frame.f_code)
+                    frame = frame.f_back
+
+                thread_name = self._thread_name(thread_id, names)
+                self.threads[thread_name] += 1
+                self.self_counts[stack[0]] += 1
+                for code in set(stack):
+                    self.total_counts[code] += 1
+                self.stacks[(thread_name, tuple(reversed(stack)))] += 1
+
+    def report(self, limit: int = 40) -> str:
+        busy = self.samples - self.idle
+        lines = [
+            f"Sampled {self.duration:.1f}s every {self.interval * 1000:g}ms across all threads: "
+            f"{self.samples} samples, {busy} busy, {self.idle} idle, {self.commands} commands completed.",
+            "Busy samples per thread: " + ", ".join(f"{name} {count}" for name, count in self.threads.most_common()),
+            "",
+        ]
+
+        for title, counts in (("Self (innermost frame)", self.self_counts), ("Cumulative (anywhere on the stack)", self.total_counts)):
+            lines.append(title)
+            lines.append(f"{'samples':>8} {'busy%':>6}  function")
+            for code, count in counts.most_common(limit):
+                lines.append(f"{count:>8} {count / max(busy, 1):>6.1%}  {describe_code(code)}")
+            lines.append("")
+
+        return "\n".join(lines)
+
+    def folded(self) -> str:
+        # one "thread;outer;...;inner count" line per stack, what flamegraph.pl and speedscope read
+        return "\n".join(
+            ";".join([thread_name, *(describe_code(code) for code in stack)]) + f" {count}"
+            for (thread_name, stack), count in self.stacks.most_common()
+        ) + "\n"
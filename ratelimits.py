@@ -0,0 +1,152 @@
+import logging
+import time
+from collections import Counter
+
+import discord
+
+from config import RATE_LIMIT_USER, RATE_LIMIT_GUILD, RATE_LIMIT_GROUPS
+
+
+logger = logging.getLogger("skidplate.ratelimits")
+
+PRUNE_EVERY = 1000
+
+
+def parse_limit(value: str) -> tuple[int, float] | None:
+    # "5/10" allows bursts of 5 commands, refilling one every 2 seconds; empty or 0 disables the limit
+    count, _, seconds = value.strip().partition("/")
+    try:
+        count, seconds = int(count), float(seconds or 1)
+    except ValueError:
+        return None
+    if count <= 0 or seconds <= 0:
+        return None
+    return count, seconds
+
+
+def parse_group_limits(value: str) -> dict[str, tuple[int, float]]:
+    limits = {}
+    for item in value.split(","):
+        name, _, limit = item.partition("=")
+        parsed = parse_limit(limit)
+        if name.strip() and parsed is not None:
+            limits[name.strip()] = parsed
+    return limits
+
+
+class TokenBucket:
+    __slots__ = ("capacity", "rate", "tokens", "updated")
+
+    def __init__(self, capacity: int, per: float) -> None:
+        self.capacity = capacity
+        self.rate = capacity / per
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def retry_after(self) -> float:
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+
+def command_groups(command: discord.app_commands.Command | discord.app_commands.ContextMenu) -> list[str]:
+    # most specific first: the command itself, its top level group, then the cog it lives in
+    names = [command.qualified_name]
+    root = command.qualified_name.split(" ", 1)[0]
+    if root != names[0]:
+        names.append(root)
+    binding = getattr(command, "binding", None)
+    if binding is not None:
+        names.append(type(binding).__name__)
+    return names
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        user: tuple[int, float] | None,
+        guild: tuple[int, float] | None,
+        groups: dict[str, tuple[int, float]],
+    ) -> None:
+        self.user = user
+        self.guild = guild
+        self.groups = groups
+        self.rejected: Counter = Counter()
+        self._buckets: dict[tuple, TokenBucket] = {}
+        self._checks = 0
+
+    def _bucket(self, key: tuple, limit: tuple[int, float]) -> TokenBucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(*limit)
+        return bucket
+
+    def _prune(self, now: float) -> None:
+        # a full bucket behaves exactly like a missing one, so idle users don't need to be remembered
+        for key, bucket in list(self._buckets.items()):
+            bucket.refill(now)
+            if bucket.tokens >= bucket.capacity:
+                del self._buckets[key]
+
+    def acquire(self, interaction: discord.Interaction) -> tuple[str, float] | None:
+        now = time.monotonic()
+        self._checks += 1
+        if self._checks % PRUNE_EVERY == 0:
+            self._prune(now)
+
+        buckets: list[tuple[str, TokenBucket]] = []
+        if self.user is not None:
+            buckets.append(("user", self._bucket(("user", interaction.user.id), self.user)))
+        if self.guild is not None and interaction.guild_id is not None:
+            buckets.append(("guild", self._bucket(("guild", interaction.guild_id), self.guild)))
+        if interaction.command is not None:
+            for name in command_groups(interaction.command):
+                if name in self.groups:
+                    buckets.append((name, self._bucket(("group", name, interaction.user.id), self.groups[name])))
+                    break
+
+        # take a token only when every bucket has one, a rejected command shouldn't drain the others
+        for _, bucket in buckets:
+            bucket.refill(now)
+
+        blocked = [(scope, bucket.retry_after()) for scope, bucket in buckets if bucket.tokens < 1]
+        if blocked:
+            scope, retry_after = max(blocked, key=lambda item: item[1])
+            self.rejected[scope] += 1
+            logger.debug("Rate limited %s on %s for %.1fs.", interaction.user.id, scope, retry_after)
+            return scope, retry_after
+
+        for _, bucket in buckets:
+            bucket.tokens -= 1
+        return None
+
+
+def rate_limit_message(scope: str, retry_after: float) -> str:
+    retry_at = int(time.time() + retry_after) + 1
+    if scope == "guild":
+        return f"Error: This server is using commands too quickly. Try again <t:{retry_at}:R>."
+    if scope != "user":
+        return f"Error: You are using this command too quickly. Try again <t:{retry_at}:R>."
+    return f"Error: You are using commands too quickly. Try again <t:{retry_at}:R>."
+
+
+class Debounce:
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self._last = float("-inf")
+
+    def ready(self) -> bool:
+        now = time.monotonic()
+        if now - self._last < self.interval:
+            return False
+        self._last = now
+        return True
+
+
+rate_limiter = RateLimiter(
+    parse_limit(RATE_LIMIT_USER),
+    parse_limit(RATE_LIMIT_GUILD),
+    parse_group_limits(RATE_LIMIT_GROUPS),
+)
@@ -0,0 +1,149 @@
+import asyncio
+import logging
+import math
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable
+
+from config import LOOP_WATCHDOG_INTERVAL, BLOCKING_CALL_THRESHOLD
+from metrics import Histogram
+
+
+logger = logging.getLogger("skidplate.stalls")
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STALL_BUFFER_SIZE = 20
+
+
+@dataclass
+class Stall:
+    started_at: float
+    duration: float
+    stack: traceback.StackSummary
+    gateway_latency: float | None
+    ongoing: bool = True
+
+    @property
+    def project_frames(self) -> list[traceback.FrameSummary]:
+        return [frame for frame in self.stack if frame.filename.startswith(ROOT)]
+
+
+class LoopWatchdog:
+    def __init__(self, interval: float, threshold: float) -> None:
+        self.interval = interval
+        self.threshold = threshold
+        self.started_at = time.time()
+        self.lag = Histogram(LAG_BUCKETS)
+        self.stalls: deque[Stall] = deque(maxlen=STALL_BUFFER_SIZE)
+        self._lock = threading.Lock()
+        self._latency: Callable[[], float] | None = None
+        self._beat = time.monotonic()
+        self._loop_thread_id: int | None = None
+        self._task: asyncio.Task | None = None
+        self._thread: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def gateway_latency(self) -> float | None:
+        if self._latency is None:
+            return None
+        latency = self._latency()
+        return latency if math.isfinite(latency) else None
+
+    def start(self, latency: Callable[[], float] | None = None) -> None:
+        if self._task is not None:
+            return
+
+        self._latency = latency
+        self._beat = time.monotonic()
+        self._loop_thread_id = threading.get_ident()
+        self._stopped.clear()
+        self._task = asyncio.create_task(self._tick())
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+        logger.info("Watching the event loop every %ss, stalls over %ss are reported.", self.interval, self.threshold)
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._stopped.set()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def reset(self) -> None:
+        with self._lock:
+            self.started_at = time.time()
+            self.lag = Histogram(LAG_BUCKETS)
+            self.stalls.clear()
+
+    def snapshot(self) -> tuple[Histogram, list[Stall]]:
+        with self._lock:
+            return self.lag, list(self.stalls)
+
+    async def _tick(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            self._beat = time.monotonic()
+            with self._lock:
+                self.lag.observe(lag)
+
+    def _watch(self) -> None:
+        # runs outside the loop, so it can still look at the loop thread while a callback hogs it
+        stall: Stall | None = None
+        poll = max(0.05, self.threshold / 4)
+
+        while not self._stopped.wait(poll):
+            blocked = time.monotonic() - self._beat - self.interval
+
+            if blocked >= self.threshold:
+                if stall is None:
+                    stall = self._capture(blocked)
+                else:
+                    stall.duration = blocked
+                continue
+
+            if stall is not None:
+                stall.ongoing = False
+                logger.warning("Event loop resumed after being blocked for %.2fs.", stall.duration)
+                stall = None
+
+    def _capture(self, blocked: float) -> Stall:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = traceback.extract_stack(frame) if frame is not None else traceback.StackSummary()
+        stall = Stall(
+            started_at=time.time() - blocked,
+            duration=blocked,
+            stack=stack,
+            gateway_latency=self.gateway_latency(),
+        )
+        with self._lock:
+            self.stalls.append(stall)
+
+        # logged straight away, a loop that never comes back can't serve /debug loop
+        logger.warning(
+            "Event loop blocked for more than %.2fs (gateway latency %s):\n%s",
+            blocked,
+            f"{stall.gateway_latency * 1000:.0f}ms" if stall.gateway_latency is not None else "unknown",
+            "".join(stack.format()),
+        )
+        return stall
+
+
+loop_watchdog = LoopWatchdog(LOOP_WATCHDOG_INTERVAL, BLOCKING_CALL_THRESHOLD)
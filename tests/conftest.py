@@ -0,0 +1,63 @@
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+# config.py loads .env from the working directory and exits without one
+_workdir = tempfile.mkdtemp(prefix="skidplate-tests-")
+with open(os.path.join(_workdir, ".env"), "w", encoding="utf-8") as env_file:
+    env_file.write(
+        "TOKEN=test\n"
+        "URL=http://127.0.0.1:9\n"
+        f"DATA_DIR={os.path.join(_workdir, 'data')}\n"
+        "CASSETTE_MODE=\n"
+        "REQUEST_TIMEOUT=5\n"
+    )
+os.chdir(_workdir)
+
+SMALL_WORLD = dict(players=50, creations=100, online=10, scores_per_track=20)
+
+
+@pytest.fixture(scope="session")
+def mock_loop():
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield loop
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+
+
+@pytest.fixture
+def plgarage(mock_loop, monkeypatch):
+    # serve(**MockConfig overrides) starts a mock PLGarage, points endpoints at it and returns its request counter
+    import endpoints
+    import requests
+    from mock_plgarage import MockConfig, start_mock_server
+
+    runners = []
+
+    def serve(**overrides):
+        runner, url = asyncio.run_coroutine_threadsafe(
+            start_mock_server(MockConfig(**{**SMALL_WORLD, **overrides})),
+            mock_loop,
+        ).result()
+        runners.append(runner)
+        monkeypatch.setattr(endpoints, "URL", url)
+        return lambda: requests.get(f"{url}/_mock/stats", timeout=5).json()
+
+    endpoints.clear_cache()
+    endpoints.counters.clear()
+    endpoints._refreshed_at.clear()
+    monkeypatch.setattr(endpoints, "RETRY_BACKOFF", 0)
+    yield serve
+
+    for runner in runners:
+        asyncio.run_coroutine_threadsafe(runner.cleanup(), mock_loop).result()
@@ -0,0 +1,39 @@
+import json
+
+import pytest
+
+import bench_helpers
+
+CASES = bench_helpers.build_cases()
+
+
+@pytest.mark.parametrize("name", sorted(CASES))
+def test_case_runs(name):
+    function, args = CASES[name]
+    function(*args)
+
+
+def test_baseline_covers_every_case():
+    with open(bench_helpers.BASELINE_PATH, "r", encoding="utf-8") as baseline_file:
+        baseline = json.load(baseline_file)["results"]
+
+    assert sorted(baseline) == sorted(CASES)
+
+
+def test_measure_and_format():
+    seconds = bench_helpers.measure(sum, ([1, 2, 3],), repeat=2, budget=0.001)
+
+    assert 0 < seconds < 0.001
+    assert bench_helpers.format_duration(2.5e-7) == "250ns"
+    assert bench_helpers.format_duration(2.5e-5) == "25.00µs"
+    assert bench_helpers.format_duration(0.0025) == "2.50ms"
+
+
+def test_index_benchmark_cases_run():
+    import bench_indexes
+
+    index = bench_indexes.build_index(200)
+    for case in bench_indexes.build_cases(index, 200).values():
+        case()
+
+    assert len(index) == 201
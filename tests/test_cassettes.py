@@ -0,0 +1,104 @@
+import gzip
+import json
+import os
+import signal
+import subprocess
+import sys
+
+import pytest
+import requests
+
+import cassettes
+import endpoints
+from cassettes import REDACTED, request_key
+
+
+def session_with(mode: str, path: str) -> tuple[requests.Session, object]:
+    session = requests.Session()
+    return session, cassettes.install(session, mode, path, timing="fast")
+
+
+def test_request_key_drops_host_and_redacts_secrets():
+    assert request_key("POST", "https://plgarage.example/api/moderation/login?password=hunter2&login=mod") == (
+        f"POST /api/moderation/login?login=mod&password={REDACTED}"
+    )
+    assert request_key("GET", "http://127.0.0.1:1/api/player?username=a") == request_key("GET", "http://other/api/player?username=a")
+
+
+def test_record_then_replay(plgarage, tmp_path):
+    plgarage()
+    path = str(tmp_path / "plgarage.cassette.gz")
+
+    session, adapter = session_with("record", path)
+    live = [
+        session.get(f"{endpoints.URL}/api/usernameToId", params={"username": "player_1"}, timeout=5),
+        session.get(f"{endpoints.URL}/api/player", params={"username": "player_2"}, timeout=5),
+        session.post(f"{endpoints.URL}/api/moderation/login", params={"login": "mod", "password": "secret"}, timeout=5),
+    ]
+    adapter.close()
+
+    with gzip.open(path, "rt", encoding="utf-8") as cassette_file:
+        recorded = cassette_file.read()
+    assert "secret" not in recorded and "mock-token" not in recorded
+    assert len(recorded.splitlines()) == 3
+
+    session, adapter = session_with("replay", path)
+    replayed = [
+        session.get("http://replay.invalid/api/usernameToId", params={"username": "player_1"}),
+        session.get("http://replay.invalid/api/player", params={"username": "player_2"}),
+        session.post("http://replay.invalid/api/moderation/login", params={"login": "mod", "password": "other"}),
+    ]
+
+    assert [r.status_code for r in replayed] == [r.status_code for r in live]
+    assert replayed[0].text == live[0].text
+    assert replayed[1].json() == live[1].json()
+    assert replayed[2].cookies.get("Token") == REDACTED
+
+    # the last recorded response repeats, an unknown request is a connection error
+    assert session.get("http://replay.invalid/api/usernameToId", params={"username": "player_1"}).text == live[0].text
+    with pytest.raises(requests.ConnectionError):
+        session.get("http://replay.invalid/api/player", params={"username": "nobody"})
+    assert adapter.misses == 1
+
+
+def test_replay_survives_a_killed_recorder(plgarage, tmp_path):
+    plgarage()
+    path = str(tmp_path / "killed.cassette.gz")
+    script = (
+        "import os, signal, requests, cassettes\n"
+        "session = requests.Session()\n"
+        f"cassettes.install(session, 'record', {path!r})\n"
+        "for n in (1, 2, 3):\n"
+        f"    session.get({endpoints.URL!r} + '/api/usernameToId', params={{'username': f'player_{{n}}'}}, timeout=5)\n"
+        "os.kill(os.getpid(), signal.SIGKILL)\n"
+    )
+    recorder = subprocess.run([sys.executable, "-c", script], cwd=os.path.dirname(cassettes.__file__))
+    assert recorder.returncode == -signal.SIGKILL
+
+    session, _ = session_with("replay", path)
+    assert [session.get("http://replay.invalid/api/usernameToId", params={"username": f"player_{n}"}).text for n in (1, 2, 3)] == ["1", "2", "3"]
+
+    # killed in the middle of writing the third record
+    with open(path, "r+b") as cassette_file:
+        cassette_file.truncate(os.path.getsize(path) - 12)
+
+    session, adapter = session_with("replay", path)
+    assert session.get("http://replay.invalid/api/usernameToId", params={"username": "player_2"}).text == "2"
+    with pytest.raises(requests.ConnectionError):
+        session.get("http://replay.invalid/api/usernameToId", params={"username": "player_3"})
+    assert adapter.misses == 1
+
+
+def test_binary_bodies_survive(tmp_path):
+    path = str(tmp_path / "binary.cassette.gz")
+    with gzip.open(path, "wt", encoding="utf-8") as cassette_file:
+        cassette_file.write(json.dumps({"request": "GET /preview.png", "elapsed": 0, "status": 200, **cassettes._encode_body(b"\x89PNG\xff")}) + "\n")
+
+    session, _ = session_with("replay", path)
+
+    assert session.get("http://replay.invalid/preview.png").content == b"\x89PNG\xff"
+
+
+def test_unknown_mode_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        cassettes.install(requests.Session(), "rewind", str(tmp_path / "x.gz"))
@@ -0,0 +1,128 @@
+import pytest
+
+import catalog
+from catalog import CreationCatalog, search_creations
+from models import Creation
+
+
+class Feed:
+    # stands in for the search endpoint: newest first, split by isMnr
+    def __init__(self, ids: dict[bool, list[int]]) -> None:
+        self.ids = ids
+        self.calls = []
+
+    def __call__(self, query, creation_type=None, platform=None, is_mnr=None, page=1, per_page=6):
+        self.calls.append((is_mnr, page))
+        ids = sorted(self.ids[is_mnr is not False], reverse=True)
+        return {
+            "total": len(ids),
+            "creations": [
+                Creation(id=creation_id, name=f"Track {creation_id}", creator_username="maker", type="TRACK", is_mnr=is_mnr is not False)
+                for creation_id in ids[(page - 1) * per_page:page * per_page]
+            ],
+        }
+
+
+@pytest.fixture
+def mirror(tmp_path, monkeypatch):
+    mirror = CreationCatalog(str(tmp_path / "catalog.sqlite3"))
+    monkeypatch.setattr(catalog, "creation_catalog", mirror)
+    yield mirror
+    mirror.close()
+
+
+def mirrored_ids(mirror: CreationCatalog, is_mnr: bool) -> set[int]:
+    with mirror._lock:
+        rows = mirror._connect().execute("SELECT id FROM creations WHERE is_mnr = ?", (int(is_mnr),))
+        return {row[0] for row in rows}
+
+
+def test_sync_mirrors_both_platforms(mirror, monkeypatch):
+    feed = Feed({True: list(range(1, 8)), False: list(range(101, 104))})
+    monkeypatch.setattr(catalog, "get_creations_stats_by_query", feed)
+
+    mirror.sync_step(pages=10, per_page=3)
+
+    assert mirrored_ids(mirror, True) == set(range(1, 8))
+    assert mirrored_ids(mirror, False) == set(range(101, 104))
+    assert mirror.is_fresh(True) and mirror.is_fresh(False)
+    assert {creation.id for creation in mirror.search("track", is_mnr=False, per_page=10)["creations"]} == {101, 102, 103}
+
+
+def test_sync_resumes_from_cursor_when_new_creations_shift_pages(mirror, monkeypatch):
+    feed = Feed({True: list(range(1, 10)), False: []})
+    monkeypatch.setattr(catalog, "get_creations_stats_by_query", feed)
+
+    mirror.sync_step(pages=1, per_page=3)
+    assert mirrored_ids(mirror, True) == {7, 8, 9}
+
+    # two new creations push 7 and 8 onto page 2, the cursor keeps them from being counted twice
+    feed.ids[True] += [10, 11]
+    feed.calls.clear()
+    mirror.sync_step(pages=4, per_page=3)
+
+    assert (True, 1) in feed.calls
+    assert (True, 2) in feed.calls and (True, 1) not in feed.calls[feed.calls.index((True, 2)):]
+    assert mirrored_ids(mirror, True) == set(range(1, 12))
+    assert mirror.is_fresh(True)
+
+
+def test_head_scan_picks_up_new_creations_between_passes(mirror, monkeypatch):
+    feed = Feed({True: list(range(1, 7)), False: []})
+    monkeypatch.setattr(catalog, "get_creations_stats_by_query", feed)
+    mirror.sync_step(pages=10, per_page=3)
+
+    feed.ids[True].append(7)
+    feed.calls.clear()
+    mirror.sync_step(pages=10, per_page=3)
+
+    # the pass is recent, so only the first page is read
+    assert [call for call in feed.calls if call[0]] == [(True, 1)]
+    assert 7 in mirrored_ids(mirror, True)
+
+
+def test_prune_only_touches_crawled_scope_after_two_passes(mirror, monkeypatch):
+    feed = Feed({True: [1, 2, 3], False: [101]})
+    monkeypatch.setattr(catalog, "get_creations_stats_by_query", feed)
+    monkeypatch.setattr(catalog, "CATALOG_MAX_AGE", 0)
+
+    # a creation only ever seen through the API fallback, outside any crawled scope
+    mirror.upsert([Creation(id=500, name="Stray", creator_username="maker", type="TRACK", is_mnr=None)], seen_at=0)
+
+    mirror.sync_step(pages=10, per_page=10)
+    feed.ids[True].remove(2)
+    mirror.sync_step(pages=10, per_page=10)
+    assert 2 in mirrored_ids(mirror, True)
+
+    mirror.sync_step(pages=10, per_page=10)
+    assert mirrored_ids(mirror, True) == {1, 3}
+    assert mirrored_ids(mirror, False) == {101}
+    with mirror._lock:
+        assert mirror._connect().execute("SELECT COUNT(*) FROM creations WHERE id = 500").fetchone()[0] == 1
+
+
+def test_sync_falls_back_to_plain_paging_when_unsorted(mirror, monkeypatch):
+    feed = Feed({True: [], False: []})
+
+    def unsorted(query, creation_type=None, platform=None, is_mnr=None, page=1, per_page=6):
+        data = feed(query, creation_type, platform, is_mnr, page, per_page)
+        data["creations"].reverse()
+        return data
+
+    feed.ids[True] = list(range(1, 6))
+    monkeypatch.setattr(catalog, "get_creations_stats_by_query", unsorted)
+    mirror.sync_step(pages=10, per_page=2)
+
+    assert mirrored_ids(mirror, True) == set(range(1, 6))
+    assert mirror._load_state(True)["ordered"] == "0"
+
+
+def test_sorted_search_is_refused_without_mirror(mirror, monkeypatch):
+    feed = Feed({True: [1], False: []})
+    monkeypatch.setattr(catalog, "get_creations_stats_by_query", feed)
+
+    assert search_creations("track", sort="rating").startswith("Error: ")
+    assert search_creations("track", platform="PS3", sort="rating").startswith("Error: ")
+    assert feed.calls == []
+
+    assert search_creations("track")["total"] == 1
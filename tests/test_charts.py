@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+
+import charts
+from history import HOUR, HistoryStore
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = HistoryStore(str(tmp_path / "history.sqlite3"))
+    monkeypatch.setattr(charts, "history_store", store)
+    monkeypatch.setattr(charts, "_chart_cache", {})
+    yield store
+    charts.shutdown_chart_pool()
+    store.close()
+
+
+def test_render_returns_png():
+    image = charts.render_history_chart("Server History (24h)", [(0, 3.0, 5.0), (HOUR, 4.0, 6.0)], [(0, 10.0), (HOUR, 12.0)])
+
+    assert image.startswith(b"\x89PNG")
+
+
+def test_chart_is_rendered_once_per_sample(store, monkeypatch):
+    renders = []
+    render = charts._render_history_chart
+
+    async def counted(window_name, last_sample_at):
+        renders.append((window_name, last_sample_at))
+        return await render(window_name, last_sample_at)
+
+    monkeypatch.setattr(charts, "_render_history_chart", counted)
+
+    async def run():
+        store.record({"players_online": 3, "total_creations": 10})
+        images = await asyncio.gather(*(charts.get_history_chart("24h") for _ in range(3)))
+        cached = await charts.get_history_chart("24h")
+        store.record({"players_online": 5, "total_creations": 11}, ts=store.latest_sample_at() + 60)
+        refreshed = await charts.get_history_chart("24h")
+        return images, cached, refreshed
+
+    images, cached, refreshed = asyncio.run(run())
+
+    assert all(image.startswith(b"\x89PNG") for image in images)
+    assert images[0] is images[1] is images[2] is cached
+    assert refreshed is not cached
+    assert len(renders) == 2
+
+
+def test_no_chart_without_samples(store):
+    assert asyncio.run(charts.get_history_chart("7d")) is None
@@ -0,0 +1,34 @@
+import pytest
+import requests
+
+import decoding
+from decoding import decode_json, loads
+
+
+def response(body: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response._content = body
+    response.encoding = "utf-8"
+    return response
+
+
+def test_decodes_with_installed_backend():
+    assert decoding.JSON_BACKEND in ("orjson", "msgspec", "json")
+    assert decode_json(response(b'{"name": "Track", "ids": [1, 2]}')) == {"name": "Track", "ids": [1, 2]}
+    assert loads('{"a": null}') == {"a": None}
+
+
+@pytest.mark.parametrize("body", [b"<html>502 Bad Gateway</html>", b"", b'{"truncated": '])
+def test_bad_body_raises_request_exception(body):
+    with pytest.raises(requests.exceptions.JSONDecodeError) as caught:
+        decode_json(response(body))
+
+    # the background loops only catch RequestException, a plain decoder error would kill them
+    assert isinstance(caught.value, requests.RequestException)
+    assert isinstance(caught.value, ValueError)
+
+
+def test_loads_raises_value_error():
+    with pytest.raises(ValueError):
+        loads(b"not json")
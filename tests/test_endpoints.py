@@ -0,0 +1,94 @@
+import dataclasses
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import endpoints
+from endpoints import call, registry
+from mock_plgarage import MOCK_TOKEN
+from utils import PLAYER_ID, SET_PLAYER_BAN
+
+
+@pytest.fixture
+def short_ttl_endpoint():
+    endpoint = dataclasses.replace(PLAYER_ID, name="test_player_id_short_ttl", cache_ttl=0.2)
+    yield endpoint
+    registry.pop(endpoint.name, None)
+
+
+def test_identical_reads_are_coalesced(plgarage):
+    stats = plgarage(latency=0.2)
+
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        results = list(executor.map(lambda _: call(PLAYER_ID, username="player_1"), range(5)))
+
+    assert results == ["1"] * 5
+    assert stats()["GET /api/usernameToId"] == 1
+    assert endpoints.counters["player_id.coalesced"] == 4
+
+
+def test_cache_serves_until_ttl(plgarage, short_ttl_endpoint):
+    stats = plgarage()
+
+    assert call(short_ttl_endpoint, username="player_1") == "1"
+    assert call(short_ttl_endpoint, username="player_1") == "1"
+    assert stats()["GET /api/usernameToId"] == 1
+
+    threading.Event().wait(0.3)
+    assert call(short_ttl_endpoint, username="player_1") == "1"
+    assert stats()["GET /api/usernameToId"] == 2
+
+
+def test_cached_values_are_not_shared(plgarage):
+    plgarage()
+    endpoint = dataclasses.replace(PLAYER_ID, name="test_player_json", path="/api/player", parse=lambda r: r.json(), cache_ttl=60)
+    try:
+        first = call(endpoint, username="player_1")
+        first["username"] = "changed"
+        assert call(endpoint, username="player_1")["username"] == "player_1"
+    finally:
+        registry.pop(endpoint.name, None)
+
+
+def test_successful_write_clears_cache(plgarage):
+    stats = plgarage()
+
+    call(PLAYER_ID, username="player_1")
+    assert call(SET_PLAYER_BAN, MOCK_TOKEN, id=1, isBanned=True) == "ok"
+    call(PLAYER_ID, username="player_1")
+
+    assert stats()["GET /api/usernameToId"] == 2
+
+
+def test_token_refresh_is_throttled(plgarage):
+    stats = plgarage()
+
+    for _ in range(3):
+        call(SET_PLAYER_BAN, MOCK_TOKEN, id=1, isBanned=False)
+
+    assert stats()["POST /api/moderation/refresh_token"] == 1
+    assert stats()["POST /api/moderation/setban"] == 3
+
+
+def test_token_refresh_is_a_write_that_keeps_cache(plgarage):
+    stats = plgarage()
+
+    call(PLAYER_ID, username="player_1")
+    assert call(endpoints.REFRESH_TOKEN, MOCK_TOKEN) == MOCK_TOKEN
+    call(PLAYER_ID, username="player_1")
+
+    assert not endpoints.REFRESH_TOKEN.idempotent
+    assert stats()["GET /api/usernameToId"] == 1
+
+
+def test_reads_retry_on_503_and_writes_do_not(plgarage):
+    stats = plgarage(error_rate=1.0)
+
+    assert call(PLAYER_ID, username="player_1") == PLAYER_ID.error
+    assert stats()["GET /api/usernameToId"] == 1 + endpoints.REQUEST_RETRIES
+    assert endpoints.counters["player_id.retries"] == endpoints.REQUEST_RETRIES
+
+    endpoints._refreshed_at[MOCK_TOKEN] = float("inf")
+    call(SET_PLAYER_BAN, MOCK_TOKEN, id=1, isBanned=True)
+    assert stats()["POST /api/moderation/setban"] == 1
@@ -0,0 +1,47 @@
+import pytest
+
+from history import DAY, HOUR, HistoryStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.sqlite3"))
+    yield store
+    store.close()
+
+
+def test_rollups_fold_samples_per_bucket(store):
+    start = 10 * DAY
+    store.record({"players": 4}, ts=start)
+    store.record({"players": 8}, ts=start + 60)
+    store.record({"players": 2}, ts=start + HOUR)
+
+    assert store.rollups("players", HOUR, start, start + HOUR) == [
+        (start, 2, 12.0, 4.0, 8.0, 8.0),
+        (start + HOUR, 1, 2.0, 2.0, 2.0, 2.0),
+    ]
+    assert store.rollups("players", DAY, start, start + HOUR) == [(start, 3, 14.0, 2.0, 8.0, 2.0)]
+
+
+def test_repeated_sample_is_not_counted_twice(store):
+    start = 10 * DAY
+    store.record({"players": 4, "creations": 1}, ts=start)
+    store.record({"players": 40, "creations": 1}, ts=start)
+    store.record({"creations": 2}, ts=start + 60)
+
+    assert store.rollups("players", HOUR, start, start) == [(start, 1, 4.0, 4.0, 4.0, 4.0)]
+    assert store.rollups("creations", HOUR, start, start) == [(start, 2, 3.0, 1.0, 2.0, 2.0)]
+    assert store.latest_sample_at() == start + 60
+
+
+def test_summary_compares_windows(store):
+    now = 20 * DAY
+    store.record({"players": 10}, ts=now - DAY - HOUR)
+    store.record({"players": 30}, ts=now - HOUR)
+
+    summary = store.summary("players", DAY, now=now)
+
+    assert summary.average == 30
+    assert summary.previous_average == 10
+    assert summary.trend == 200
+    assert summary.growth == 20
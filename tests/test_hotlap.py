@@ -0,0 +1,62 @@
+from types import SimpleNamespace
+
+from config import HOTLAP_FAST_INTERVAL, HOTLAP_IDLE_INTERVAL
+from hotlap import HotlapTracker
+from models import LapTime
+
+
+def board(track_id: int, *times: tuple[int, str, int]) -> dict:
+    return {
+        "id": track_id,
+        "topTimes": [
+            SimpleNamespace(id=score_id, rank=rank, player_username=username, best_lap_time=LapTime(ms), updated_at=None)
+            for rank, (score_id, username, ms) in enumerate(times, start=1)
+        ],
+    }
+
+
+def test_first_board_is_a_silent_baseline(tmp_path):
+    tracker = HotlapTracker(str(tmp_path / "hotlap.json"))
+
+    assert tracker.update(board(7, (1, "alice", 60000))) == []
+    assert tracker.update(board(7, (1, "alice", 60000))) == []
+
+
+def test_new_and_improved_times_are_announced(tmp_path):
+    tracker = HotlapTracker(str(tmp_path / "hotlap.json"))
+    tracker.update(board(7, (1, "alice", 60000), (2, "bob", 61000)))
+
+    records = tracker.update(board(7, (2, "bob", 59000), (1, "alice", 60000), (3, "carol", 62000)))
+
+    assert [(r.player_username, r.rank, r.is_improvement) for r in records] == [("bob", 1, True), ("carol", 3, False)]
+    assert records[0].previous_time == 61000
+
+
+def test_new_track_resets_baseline(tmp_path):
+    tracker = HotlapTracker(str(tmp_path / "hotlap.json"))
+    tracker.update(board(7, (1, "alice", 60000)))
+
+    assert tracker.update(board(8, (5, "dave", 30000))) == []
+
+
+def test_state_survives_restart(tmp_path):
+    path = str(tmp_path / "hotlap.json")
+    HotlapTracker(path).update(board(7, (1, "alice", 60000)))
+
+    restarted = HotlapTracker(path)
+    restarted.load()
+
+    assert restarted.update(board(7, (1, "alice", 60000))) == []
+    assert [r.player_username for r in restarted.update(board(7, (1, "alice", 59000)))] == ["alice"]
+
+
+def test_interval_speeds_up_near_reset_and_after_changes(tmp_path):
+    tracker = HotlapTracker(str(tmp_path / "hotlap.json"))
+
+    assert tracker.next_interval(None) == HOTLAP_IDLE_INTERVAL
+    assert tracker.next_interval(60) == min(HOTLAP_FAST_INTERVAL, 65)
+    assert tracker.next_interval(0) == 5
+
+    tracker.update(board(7, (1, "alice", 60000)))
+    tracker.update(board(7, (1, "alice", 59000)))
+    assert tracker.next_interval(None) == HOTLAP_FAST_INTERVAL
@@ -0,0 +1,121 @@
+import threading
+
+import indexes
+import utils
+from indexes import CreationIndex, UsernameIndex
+from models import Player
+
+
+def test_username_prefix_search_is_case_insensitive():
+    index = UsernameIndex()
+    index.add_many(["Alpha", "alphonse", "Beta", " ", None])
+
+    assert index.search("ALP") == ["Alpha", "alphonse"]
+    assert "beta" in index
+    assert len(index) == 3
+
+
+def test_player_stats_only_index_usernames_from_the_payload(monkeypatch):
+    index = UsernameIndex()
+    monkeypatch.setattr(utils, "known_players", index)
+    monkeypatch.setattr(utils, "call", lambda endpoint, **params: Player.from_payload({"userId": 9}))
+
+    assert utils.get_player_stats("TyPeD NaMe").username == "TyPeD NaMe"
+    assert len(index) == 0
+
+    monkeypatch.setattr(utils, "call", lambda endpoint, **params: Player.from_payload({"userId": 9, "username": "Typed_Name"}))
+    utils.get_player_stats("typed_name")
+    assert index.search("typed") == ["Typed_Name"]
+
+
+def test_creation_search_ranks_prefix_matches_first():
+    index = CreationIndex()
+    index.add_many([
+        (1, "Moon Rally", "a", "TRACK"),
+        (2, "Rally Moon", "b", "TRACK"),
+        (3, "Desert Run", "c", "TRACK"),
+    ])
+
+    assert [entry.id for entry in index.search("moon")][:2] == [1, 2]
+    assert index.search("zzzz") == []
+
+
+def test_creation_rename_moves_postings():
+    index = CreationIndex()
+    index.add(7, "Old Name")
+    index.add(7, "Brand New")
+
+    assert "old" not in index._postings
+    assert index.search("brand")[0].id == 7
+    assert index.get(7).name == "Brand New"
+
+
+def test_creation_id_prefix_search():
+    index = CreationIndex()
+    index.add_many([(10001, "A", None, None), (10002, "B", None, None), (20001, "C", None, None)])
+
+    assert [entry.id for entry in index.search("1000")] == [10001, 10002]
+
+
+def test_search_never_waits_on_writer_lock():
+    index = CreationIndex()
+    index.add_many((i, f"Track {i}", None, None) for i in range(100))
+
+    # a writer holding the lock must not block readers
+    with index._lock:
+        result = []
+        reader = threading.Thread(target=lambda: result.append(index.search("track 5")))
+        reader.start()
+        reader.join(timeout=2)
+
+    assert not reader.is_alive()
+    assert result and result[0]
+
+
+def test_unchanged_add_leaves_index_untouched():
+    index = CreationIndex()
+    index.add(1, "Canyon", "maker", "TRACK")
+    entry, postings = index.get(1), index._postings[" ca"]
+
+    index.add(1, "Canyon")
+    index.add(1, "Canyon", "maker", "TRACK")
+
+    assert index.get(1) is entry
+    assert index._postings[" ca"] is postings and postings == [1]
+
+
+def test_search_ranks_from_rare_grams_in_a_large_index(monkeypatch):
+    monkeypatch.setattr(indexes, "MAX_SEARCH_CANDIDATES", 50)
+    index = CreationIndex()
+    index.add_many((i, f"Track {i}", None, None) for i in range(1, 2001))
+    index.add(5000, "Track Zephyr")
+
+    assert index.search("zephyr")[0].id == 5000
+    assert index.search("track 1999")[0].id == 1999
+    assert len(index.search("tr", limit=100)) == 50
+
+
+def test_search_during_writes():
+    index = CreationIndex()
+    index.add_many((i, f"Track {i}", None, None) for i in range(500))
+    done = threading.Event()
+    errors = []
+
+    def search():
+        while not done.is_set():
+            try:
+                for entry in index.search("track 4"):
+                    assert index.get(entry.id) is not None
+            except Exception as error:
+                errors.append(error)
+                return
+
+    reader = threading.Thread(target=search)
+    reader.start()
+    for i in range(500, 3000):
+        index.add(i, f"Track {i}")
+        index.add(i - 500, f"Renamed Track {i}")
+    done.set()
+    reader.join()
+
+    assert errors == []
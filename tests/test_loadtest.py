@@ -0,0 +1,29 @@
+import argparse
+import asyncio
+
+import endpoints
+import loadtest
+from conftest import ROOT, SMALL_WORLD
+from mock_plgarage import MockConfig
+
+
+def test_command_mix_runs_cleanly_against_the_mock(plgarage, capsys, monkeypatch):
+    stats = plgarage()
+    # main() runs from the project root, the cogs open their images relative to it
+    monkeypatch.chdir(ROOT)
+    args = argparse.Namespace(
+        commands=60,
+        concurrency=10,
+        users=5,
+        threads=8,
+        discord_latency=0.0,
+        url=endpoints.URL,
+        seed=3,
+    )
+
+    asyncio.run(loadtest.run(args, MockConfig(**SMALL_WORLD)))
+    output = capsys.readouterr().out
+
+    assert "60 commands in" in output
+    assert "exceptions:" not in output
+    assert sum(stats().values()) > 1
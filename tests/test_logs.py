@@ -0,0 +1,82 @@
+import atexit
+import json
+import logging
+import sys
+
+import pytest
+
+from logs import BackgroundHandler, ContextFilter, JSONFormatter, SamplingFilter, parse_sampling, setup_logging
+from tracing import Trace, current_trace
+
+
+def record(name: str = "skidplate.test", level: int = logging.INFO, msg: str = "hello %s", args=("world",), exc_info=None):
+    return logging.LogRecord(name, level, __file__, 1, msg, args, exc_info)
+
+
+def test_parse_sampling_clamps_and_skips_junk():
+    assert parse_sampling("skidplate.endpoints=0.1, discord=2,bad=x,=") == {"skidplate.endpoints": 0.1, "discord": 1.0}
+
+
+def test_sampling_never_drops_warnings_and_prefers_longest_prefix():
+    sampling = SamplingFilter({"discord": 1.0, "discord.gateway": 0.0})
+
+    assert not sampling.filter(record("discord.gateway.shard"))
+    assert sampling.filter(record("discord.client"))
+    assert sampling.filter(record("discord.gateway", logging.WARNING))
+    assert sampling.filter(record("discordia"))
+
+
+def test_context_and_json_output():
+    trace = Trace(id=7, cog="Score", command="hotlap", user_id=42, started_at=0, guild_id=9)
+    token = current_trace.set(trace)
+    try:
+        entry = record()
+        ContextFilter().filter(entry)
+    finally:
+        current_trace.reset(token)
+    entry.endpoint = "player_id"
+
+    payload = json.loads(JSONFormatter().format(entry))
+
+    assert payload["message"] == "hello world"
+    assert (payload["trace_id"], payload["command"], payload["user_id"], payload["guild_id"]) == (7, "hotlap", 42, 9)
+    assert payload["endpoint"] == "player_id"
+    assert payload["time"].endswith("+00:00")
+
+
+def test_queued_records_keep_traceback_separate():
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        entry = record(exc_info=sys.exc_info())
+
+    prepared = BackgroundHandler(None).prepare(entry)
+
+    assert prepared.getMessage() == "hello world"
+    assert prepared.exc_info is None and "ValueError: boom" in prepared.exc_text
+    assert json.loads(JSONFormatter().format(prepared))["exception"].endswith("ValueError: boom")
+
+
+@pytest.fixture
+def restore_root_logger():
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    yield
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    for handler in handlers:
+        root.addHandler(handler)
+    root.setLevel(level)
+
+
+def test_setup_logging_writes_from_the_listener_thread(capsys, restore_root_logger):
+    listener = setup_logging("INFO", "json", {"skidplate.noisy": 0.0})
+    logging.getLogger("skidplate.test").info("kept %s", 1, extra={"status": 200})
+    logging.getLogger("skidplate.noisy").info("dropped")
+    logging.getLogger("skidplate.test").debug("below level")
+    listener.stop()
+    atexit.unregister(listener.stop)
+
+    lines = [json.loads(line) for line in capsys.readouterr().err.splitlines()]
+
+    assert [(line["message"], line["status"]) for line in lines] == [("kept 1", 200)]
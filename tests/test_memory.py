@@ -0,0 +1,50 @@
+import asyncio
+
+import discord
+
+from memory import MemoryTracker, count_live_views, format_report, resident_memory
+
+
+class LeakyView(discord.ui.View):
+    pass
+
+
+def allocate_rows(count: int) -> list[bytes]:
+    return [bytes(1000) for _ in range(count)]
+
+
+def test_live_views_are_counted_by_class():
+    async def run():
+        views = [LeakyView(timeout=None) for _ in range(3)]
+        return count_live_views()["LeakyView"], views
+
+    counted, _ = asyncio.run(run())
+
+    assert counted >= 3
+
+
+def test_report_shows_growth_between_snapshots():
+    tracker = MemoryTracker()
+    untraced = tracker.report()
+    assert untraced.traced is None and untraced.top == []
+
+    tracker.start()
+    try:
+        kept = allocate_rows(2000)
+        report = tracker.report(limit=10)
+    finally:
+        tracker.stop()
+
+    assert report.traced and report.peak >= report.traced
+    assert report.since is not None
+    assert any(diff.traceback[0].filename.endswith("test_memory.py") and diff.size_diff >= 1_000_000 for diff in report.growth)
+
+    text = format_report(report)
+    assert "Growth since previous snapshot" in text and "tests/test_memory.py:" in text
+    assert len(kept) == 2000
+
+
+def test_resident_memory_reads_proc():
+    rss = resident_memory()
+
+    assert rss is None or rss > 1_000_000
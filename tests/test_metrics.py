@@ -0,0 +1,49 @@
+import pytest
+
+from endpoints import RequestRecord, call
+from metrics import Histogram, RequestMetrics, request_metrics
+from utils import PLAYER_ID
+
+
+def test_histogram_buckets_and_quantiles():
+    histogram = Histogram((1.0, 2.0, 4.0))
+    for value in (0.5, 1.0, 1.5, 3.0, 8.0):
+        histogram.observe(value)
+
+    assert histogram.counts == [2, 1, 1, 1]
+    assert histogram.cumulative() == [("1", 2), ("2", 3), ("4", 4), ("+Inf", 5)]
+    assert histogram.quantile(0.4) == pytest.approx(1.0)
+    assert histogram.quantile(0.5) == pytest.approx(1.5)
+    assert histogram.quantile(1.0) == 8.0
+    assert Histogram((1.0,)).quantile(0.5) is None
+
+
+def test_summaries_split_statuses_and_errors():
+    metrics = RequestMetrics()
+    metrics.observe(RequestRecord("player", "GET", 200, 0.02, 300, None, 1))
+    metrics.observe(RequestRecord("player", "GET", 503, 0.01, 20, None, 1))
+    metrics.observe(RequestRecord("player", "GET", None, 5.0, 0, "Timeout", 2))
+    metrics.observe(RequestRecord("search", "GET", 200, 0.3, 5000, None, 1))
+
+    summaries = {summary.endpoint: summary for summary in metrics.summaries()}
+
+    assert [summary.endpoint for summary in metrics.summaries()] == ["player", "search"]
+    assert summaries["player"].requests == 3
+    assert summaries["player"].failures == 2
+    assert summaries["player"].statuses == {200: 1, 503: 1}
+    assert summaries["player"].errors == {"Timeout": 1}
+    assert summaries["player"].average_size == 160
+
+
+def test_prometheus_output_counts_real_requests(plgarage):
+    plgarage()
+    request_metrics.reset()
+
+    call(PLAYER_ID, username="player_1")
+    call(PLAYER_ID, username="player_1")
+    text = request_metrics.render_prometheus()
+
+    assert 'skidplate_upstream_request_duration_seconds_count{endpoint="player_id"} 1' in text
+    assert 'skidplate_upstream_responses_total{endpoint="player_id",status="200"} 1' in text
+    assert 'skidplate_client_events_total{endpoint="player_id",event="cache_hits"} 1' in text
+    assert 'le="+Inf"' in text
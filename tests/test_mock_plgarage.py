@@ -0,0 +1,50 @@
+import requests
+
+import endpoints
+from mock_plgarage import MOCK_TOKEN, MockConfig, build_world
+
+
+def test_world_is_deterministic_per_seed():
+    first, again, other = (build_world(MockConfig(players=20, creations=30, seed=seed)) for seed in (1, 1, 2))
+
+    assert first.players == again.players and first.creations == again.creations
+    assert first.players != other.players
+
+
+def test_moderation_routes_need_the_token(plgarage):
+    plgarage()
+
+    assert requests.post(f"{endpoints.URL}/api/moderation/setban", timeout=5).status_code == 403
+    response = requests.post(
+        f"{endpoints.URL}/api/moderation/setban",
+        headers={"Authorization": f"Bearer {MOCK_TOKEN}"},
+        timeout=5,
+    )
+    assert (response.status_code, response.text) == (200, "ok")
+
+
+def test_error_rate_spares_control_routes(plgarage):
+    stats = plgarage(error_rate=1.0)
+
+    assert requests.get(f"{endpoints.URL}/api/usernameToId", params={"username": "player_1"}, timeout=5).status_code == 503
+    assert stats()["GET /api/usernameToId"] == 1
+    assert requests.post(f"{endpoints.URL}/_mock/reset", timeout=5).text == "ok"
+    assert stats() == {"GET /_mock/stats": 1}
+
+
+def test_search_pages_are_stable(plgarage):
+    plgarage(creations=30)
+
+    def page(number):
+        return requests.get(
+            f"{endpoints.URL}/api/creations/search",
+            params={"query": "", "page": number, "perPage": 10},
+            timeout=5,
+        ).json()
+
+    pages = [page(number) for number in (1, 2, 3)]
+    ids = [creation["playerCreationId"] for data in pages for creation in data["creations"]]
+
+    assert pages[0]["total"] == len(ids) == len(set(ids))
+    assert ids == sorted(ids, reverse=True)
+    assert page(1) == pages[0]
@@ -0,0 +1,120 @@
+import dataclasses
+
+import pytest
+
+from models import Creation, LapTime, Player, Score
+from utils import format_time, get_player_stats
+
+
+@pytest.mark.parametrize("text, ms", [
+    ("00:00:000", 0),
+    ("01:05:007", 65007),
+    ("00:59:999", 59999),
+    ("12:34:567", 754567),
+    ("-00:01:500", -1500),
+])
+def test_parse_and_format_round_trip(text, ms):
+    lap_time = LapTime.parse(text)
+
+    assert lap_time == ms
+    assert lap_time.format() == text
+    assert LapTime.parse(lap_time.format()) == lap_time
+
+
+@pytest.mark.parametrize("value, ms", [
+    ("1:5:7", 65007),
+    (" 1:05:007 ", 65007),
+    ("65:123", 65123),
+    (83, 83000),
+    (83.0071, 83007),
+    ("83.5", 83500),
+])
+def test_parse_accepts_api_shapes(value, ms):
+    assert LapTime.parse(value) == ms
+
+
+@pytest.mark.parametrize("value", ["", "a:b:c", "1:2:3:4", "1:05.007", "1:-5:000", "--1:00:000", "1: 5:000", True, "fast"])
+def test_parse_rejects_malformed(value):
+    assert LapTime.parse(value) is None
+
+
+def test_fields_over_59_seconds_carry_into_minutes():
+    assert LapTime.parse("1:75:000") == 135000
+    assert LapTime.parse("1:75:000").format() == "02:15:000"
+    assert LapTime.parse("0:00:1500").format() == "00:01:500"
+
+
+def test_negative_deltas():
+    leader, player = LapTime.parse("01:00:000"), LapTime.parse("01:01:001")
+
+    assert player.delta(leader) == "+00:01:001"
+    assert leader.delta(player) == "-00:01:001"
+    assert leader.delta(leader) == "+00:00:000"
+    assert LapTime.parse(leader.delta(player)) == leader - player
+
+
+def test_arithmetic_stays_lap_time():
+    total = sum([LapTime(1500), LapTime(2500)], LapTime(0))
+
+    assert isinstance(total, LapTime) and total == 4000
+    assert isinstance(LapTime(1000) - 1500, LapTime)
+    assert format_time(LapTime(61000)) == format_time("1:01:000") == "01:01:000"
+
+
+def test_creation_from_search_payload():
+    creation = Creation.from_payload({
+        "playerCreationId": 10001,
+        "name": "Track 10001",
+        "creatorUsername": "maker",
+        "type": "TRACK",
+        "tags": ["Fast"],
+        "isMNR": True,
+        "downloads": {"all_time": 12, "this_week": 1},
+        "views": 40,
+        "records": {"bestLapTime": "1:05:007", "longestDrift": 3.25, "longestHangTime": 1.5},
+    })
+
+    assert (creation.id, creation.downloads, creation.views, creation.points) == (10001, 12, 40, None)
+    assert (creation.best_lap_time, creation.longest_drift, creation.longest_hang_time) == (65007, 3250, 1500)
+
+
+def test_creation_from_single_payload_reads_nested_records():
+    creation = Creation.from_payload({
+        "id": 5,
+        "type": "TRACK",
+        "longestDrift": {"longestDrift": 2.0},
+        "longestHangTime": {"longestHangTime": 0.5},
+    })
+
+    assert (creation.id, creation.longest_drift, creation.longest_hang_time, creation.best_lap_time) == (5, 2000, 500, None)
+
+
+def test_records_only_apply_to_tracks():
+    kart = Creation.from_payload({"id": 6, "type": "KART", "records": {"bestLapTime": "1:00:000"}})
+
+    assert kart.best_lap_time is None
+
+
+def test_player_from_payload_sums_races_and_tolerates_gaps():
+    player = Player.from_payload({"userId": 3, "onlineRaces": 4, "onlineFinished": None, "onlineForfeits": 1}, username="fallback")
+
+    assert (player.user_id, player.username, player.online_races) == (3, "fallback", 5)
+    assert player.skill_level_id is None and player.total_tracks is None
+
+
+def test_models_are_frozen():
+    score = Score.from_payload({"rank": 1, "id": 9, "playerUsername": "alice", "bestLapTime": "0:59:999"})
+
+    assert score.best_lap_time == 59999
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        score.rank = 2
+
+
+def test_player_stats_are_cached_as_models(plgarage):
+    stats = plgarage()
+
+    first, second = get_player_stats("player_1"), get_player_stats("player_1")
+
+    assert isinstance(first, Player) and first.username == "player_1"
+    assert second is first
+    assert stats()["GET /api/player"] == 1
@@ -0,0 +1,123 @@
+import asyncio
+
+import presence
+from models import Presence
+from presence import PresencePoller
+
+
+def player(user_id: int, state: str = "IN_POD", username: str | None = None) -> Presence:
+    return Presence(id=user_id, username=username or f"player_{user_id}", presence=state, platform="PS3", is_mnr=True, is_rpcn=False)
+
+
+def test_one_poll_per_platform_is_shared_by_subscribers(monkeypatch):
+    polls = []
+
+    def fetch_all(is_mnr=None):
+        polls.append(is_mnr)
+        return {"total": 2, "creations": [player(2, username="bob"), player(1, username="Alice")]}
+
+    monkeypatch.setattr(presence, "get_all_players_online_presence", fetch_all)
+
+    async def run():
+        poller = PresencePoller(interval=60)
+        received = {}
+        done = asyncio.Event()
+
+        def subscriber(key):
+            async def callback(snapshot):
+                received[key] = snapshot
+                if len(received) == 3:
+                    done.set()
+            return callback
+
+        poller.subscribe("first", subscriber("first"))
+        poller.subscribe("second", subscriber("second"), is_mnr=True)
+        poller.subscribe("karting", subscriber("karting"), is_mnr=False)
+        await asyncio.wait_for(done.wait(), 5)
+        poller.stop()
+        return received
+
+    received = asyncio.run(run())
+
+    assert sorted(polls) == [False, True]
+    assert received["first"] is received["second"]
+    assert received["karting"].is_mnr is False
+    assert [p.username for p in received["first"].players] == ["Alice", "bob"]
+
+
+def test_failing_subscriber_is_dropped(monkeypatch):
+    monkeypatch.setattr(presence, "get_all_players_online_presence", lambda is_mnr=None: {"total": 0, "creations": []})
+
+    async def run():
+        poller = PresencePoller(interval=0)
+        seen = asyncio.Event()
+
+        async def broken(snapshot):
+            raise RuntimeError("boom")
+
+        async def healthy(snapshot):
+            seen.set()
+
+        poller.subscribe("broken", broken)
+        poller.subscribe("healthy", healthy)
+        await asyncio.wait_for(seen.wait(), 5)
+        await asyncio.sleep(0)
+        membership = ("broken" in poller, "healthy" in poller)
+        poller.stop()
+        return membership
+
+    assert asyncio.run(run()) == (False, True)
+
+
+def test_fingerprint_tracks_presence_changes():
+    before = presence.PresenceSnapshot(True, (player(1), player(2)))
+    same = presence.PresenceSnapshot(True, (player(1), player(2)))
+    moved = presence.PresenceSnapshot(True, (player(1), player(2, "IN_GAME")))
+
+    assert before.fingerprint == same.fingerprint
+    assert before.fingerprint != moved.fingerprint
+
+
+def test_diff_reports_joins_leaves_and_changes():
+    before = presence.PresenceSnapshot(True, (player(1), player(2), player(3)))
+    after = presence.PresenceSnapshot(True, (player(2, "IN_GAME"), player(3), player(4)))
+
+    changes = presence.diff_presence(before, after)
+
+    assert [p.id for p in changes.joined] == [4]
+    assert [p.id for p in changes.left] == [1]
+    assert [(old.presence, new.presence) for old, new in changes.changed] == [("IN_POD", "IN_GAME")]
+    assert not presence.diff_presence(before, before)
+
+
+def test_watcher_coalesces_changes_between_flushes():
+    watcher = presence.PresenceWatcher()
+    start = presence.PresenceSnapshot(True, (player(1),))
+
+    async def observe(*snapshots):
+        for snapshot in snapshots:
+            await watcher.observe(snapshot)
+
+    asyncio.run(observe(start))
+    assert not watcher.flush()
+
+    # player 2 joins and leaves, player 1 flips away and back: nothing to report
+    asyncio.run(observe(
+        presence.PresenceSnapshot(True, (player(1, "IN_GAME"), player(2))),
+        presence.PresenceSnapshot(True, (player(1),)),
+    ))
+    assert not watcher.flush()
+
+    asyncio.run(observe(presence.PresenceSnapshot(True, (player(1), player(3)))))
+    assert [p.id for p in watcher.flush().joined] == [3]
+    assert not watcher.flush()
+
+
+def test_all_presence_pages_are_fetched(plgarage):
+    stats = plgarage(online=45)
+
+    data = presence.get_all_players_online_presence(per_page=10)
+
+    assert data["total"] == 45
+    assert len({p.id for p in data["creations"]}) == 45
+    assert stats()["GET /api/playercounts/presence"] == 5
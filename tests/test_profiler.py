@@ -0,0 +1,39 @@
+import threading
+import time
+
+from profiler import SamplingProfiler, describe_code
+
+
+def spin(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def test_busy_thread_dominates_the_profile():
+    profiler = SamplingProfiler(interval=0.002)
+    worker = threading.Thread(target=spin, args=(0.3,), name="busy-worker-1")
+
+    profiler.start()
+    worker.start()
+    worker.join()
+    profiler.stop()
+
+    assert profiler.samples > 0 and profiler.duration >= 0.3
+    assert "busy-worker" in profiler.threads
+    assert profiler.self_counts[spin.__code__] >= 0.8 * profiler.threads["busy-worker"]
+
+    report = profiler.report(limit=5)
+    assert "Self (innermost frame)" in report and "spin (tests/test_profiler.py:" in report
+
+    folded = profiler.folded().splitlines()
+    assert any(line.startswith("busy-worker;") and "spin (tests/test_profiler.py:" in line for line in folded)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in folded)
+
+
+def test_describe_code_shortens_paths():
+    assert describe_code(spin.__code__).startswith("spin (tests/test_profiler.py:")
+
+    # third party code keeps only its package and module
+    described = describe_code(threading.Thread.run.__code__)
+    assert described.startswith("run (") and described.count("/") == 1 and "threading.py:" in described
@@ -0,0 +1,106 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import ratelimits
+from ratelimits import Debounce, RateLimiter, TokenBucket, parse_group_limits, parse_limit, rate_limit_message
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(ratelimits, "time", SimpleNamespace(monotonic=clock, time=time.time))
+    return clock
+
+
+class Cog:
+    pass
+
+
+def interaction(user_id: int = 1, guild_id: int | None = 10, name: str = "player"):
+    return SimpleNamespace(
+        user=SimpleNamespace(id=user_id),
+        guild_id=guild_id,
+        command=SimpleNamespace(qualified_name=name, binding=Cog()),
+    )
+
+
+def test_parse_limits():
+    assert parse_limit("5/10") == (5, 10.0)
+    assert parse_limit("3") == (3, 1.0)
+    assert parse_limit("0/10") is None and parse_limit("") is None and parse_limit("a/b") is None
+    assert parse_group_limits("mod=2/60, Cog=1/5,broken=x") == {"mod": (2, 60.0), "Cog": (1, 5.0)}
+
+
+def test_bucket_refills_over_time(clock):
+    bucket = TokenBucket(2, 10)
+    bucket.tokens = 0
+
+    assert bucket.retry_after() == pytest.approx(5)
+    clock.now += 5
+    bucket.refill(clock())
+    assert bucket.tokens == pytest.approx(1)
+
+
+def test_user_limit_and_refill(clock):
+    limiter = RateLimiter((2, 10), None, {})
+
+    assert limiter.acquire(interaction()) is None
+    assert limiter.acquire(interaction()) is None
+    scope, retry_after = limiter.acquire(interaction())
+    assert scope == "user" and retry_after == pytest.approx(5)
+    assert limiter.acquire(interaction(user_id=2)) is None
+
+    clock.now += 5
+    assert limiter.acquire(interaction()) is None
+    assert limiter.rejected == {"user": 1}
+
+
+def test_rejection_does_not_drain_other_buckets(clock):
+    limiter = RateLimiter((5, 10), (1, 10), {})
+
+    assert limiter.acquire(interaction(user_id=1)) is None
+    assert limiter.acquire(interaction(user_id=1))[0] == "guild"
+    assert limiter._buckets[("user", 1)].tokens == pytest.approx(4)
+    assert limiter.acquire(interaction(user_id=2, guild_id=None)) is None
+
+
+def test_most_specific_group_limit_applies(clock):
+    limiter = RateLimiter(None, None, {"mod ban_player": (1, 60), "mod": (5, 60), "Cog": (10, 60)})
+
+    assert limiter.acquire(interaction(name="mod ban_player")) is None
+    assert limiter.acquire(interaction(name="mod ban_player"))[0] == "mod ban_player"
+    assert limiter.acquire(interaction(name="mod player_complaints")) is None
+    assert limiter.acquire(interaction(name="hotlap")) is None
+
+
+def test_idle_buckets_are_pruned(clock, monkeypatch):
+    monkeypatch.setattr(ratelimits, "PRUNE_EVERY", 3)
+    limiter = RateLimiter((5, 10), None, {})
+    limiter.acquire(interaction(user_id=1))
+    limiter.acquire(interaction(user_id=2))
+
+    clock.now += 60
+    limiter.acquire(interaction(user_id=3))
+
+    assert set(limiter._buckets) == {("user", 3)}
+
+
+def test_messages_and_debounce(clock):
+    assert rate_limit_message("guild", 3).startswith("Error: This server")
+    assert rate_limit_message("user", 3).startswith("Error: You are using commands")
+    assert rate_limit_message("mod", 3).startswith("Error: You are using this command")
+
+    debounce = Debounce(1)
+    assert debounce.ready() and not debounce.ready()
+    clock.now += 1
+    assert debounce.ready()
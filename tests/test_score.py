@@ -0,0 +1,85 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import endpoints
+import utils
+from cogs.score import build_combined_standings, build_comparison_embed, fetch_track_comparisons, parse_track_ids
+from models import LapTime, Score
+
+
+class Leaderboards:
+    # 400 times per track, the player we look for sits near the bottom
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+        self.requests = []
+
+    def __call__(self, endpoint, token=None, **params):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            self.requests.append((params["trackId"], params["page"]))
+        try:
+            time.sleep(0.01)
+            names = [f"racer{rank}" for rank in range(1, 401)]
+            start = (params["page"] - 1) * params["perPage"]
+            return {
+                "name": f"Track {params['trackId']}",
+                "total": len(names),
+                "scores": [
+                    SimpleNamespace(player_username=name, rank=start + index + 1)
+                    for index, name in enumerate(names[start:start + params["perPage"]])
+                ],
+            }
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+def test_comparisons_stay_within_concurrency(monkeypatch):
+    upstream = Leaderboards()
+    monkeypatch.setattr(utils, "call", upstream)
+    monkeypatch.setattr(endpoints, "call", upstream)
+
+    results = asyncio.run(fetch_track_comparisons(list(range(1, 9)), player="racer390", per_page=50, concurrency=2))
+
+    assert [player_score.rank for _, _, player_score in results] == [390] * 8
+    assert upstream.peak <= 2
+    # page 1 is fetched once per track and reused for the player lookup
+    assert sorted(upstream.requests) == [(track_id, page) for track_id in range(1, 9) for page in range(1, 9)]
+
+
+def test_parse_track_ids_dedupes_and_skips_junk():
+    assert parse_track_ids("12, 7;12 abc\n9  -3") == [12, 7, 9]
+    assert parse_track_ids("") == []
+
+
+def test_combined_standings_rank_by_tracks_then_time():
+    def board(*times):
+        return {"scores": [SimpleNamespace(player_username=name, best_lap_time=None if ms is None else LapTime(ms)) for name, ms in times]}
+
+    standings = build_combined_standings([
+        board(("alice", 60000), ("bob", 50000), ("carol", None)),
+        board(("bob", 45000), ("alice", 40000)),
+        board(("alice", 30000), ("dave", 10000)),
+    ])
+
+    assert standings == [("alice", 3, 130000), ("bob", 2, 95000), ("dave", 1, 10000)]
+
+
+def test_comparison_embed_tolerates_scores_without_time():
+    interaction = SimpleNamespace(user=SimpleNamespace(display_avatar=SimpleNamespace(url="https://example.invalid/a.png")))
+    untimed_leader = Score(rank=1, id=1, player_username="alice", best_lap_time=None, updated_at=None)
+    leader = Score(rank=1, id=2, player_username="alice", best_lap_time=LapTime(60000), updated_at=None)
+    untimed = Score(rank=2, id=3, player_username="bob", best_lap_time=None, updated_at=None)
+
+    embed = build_comparison_embed([
+        (1, {"name": "Track 1", "scores": [untimed_leader]}, Score(rank=2, id=4, player_username="bob", best_lap_time=LapTime(61000), updated_at=None)),
+        (2, {"name": "Track 2", "scores": [leader, untimed]}, untimed),
+    ], interaction, player="bob")
+
+    assert embed.fields[0].value == "🥇 alice no time\nbob: **#2** `01:01:000`"
+    assert embed.fields[1].value == "🥇 alice `01:00:000`\nbob: **#2** no time"
@@ -0,0 +1,49 @@
+import asyncio
+import time
+
+from stalls import LoopWatchdog
+
+
+def hog_the_loop(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+def test_blocking_callback_is_captured_with_its_stack():
+    watchdog = LoopWatchdog(interval=0.02, threshold=0.2)
+
+    async def run():
+        watchdog.start(latency=lambda: float("inf"))
+        await asyncio.sleep(0.1)
+        hog_the_loop(0.6)
+        await asyncio.sleep(0.3)
+        await watchdog.stop()
+
+    asyncio.run(run())
+    lag, stalls = watchdog.snapshot()
+
+    assert len(stalls) == 1
+    stall = stalls[0]
+    assert not stall.ongoing
+    assert 0.2 <= stall.duration < 1.0
+    assert stall.gateway_latency is None
+    assert "hog_the_loop" in [frame.name for frame in stall.project_frames]
+    assert lag.count > 0 and lag.max >= 0.4
+
+
+def test_quiet_loop_records_lag_only():
+    watchdog = LoopWatchdog(interval=0.01, threshold=0.5)
+
+    async def run():
+        watchdog.start(latency=lambda: 0.05)
+        await asyncio.sleep(0.2)
+        await watchdog.stop()
+
+    asyncio.run(run())
+    lag, stalls = watchdog.snapshot()
+
+    assert stalls == []
+    assert lag.count >= 5
+    assert not watchdog.running
+
+    watchdog.reset()
+    assert watchdog.snapshot()[0].count == 0
@@ -0,0 +1,63 @@
+import asyncio
+from types import SimpleNamespace
+
+from cogs.score import TimeTrialListView
+from utils import find_time_trial_score, get_time_trial_scores
+
+
+class FakeInteraction:
+    def __init__(self) -> None:
+        self.user = SimpleNamespace(display_avatar=SimpleNamespace(url="https://example.invalid/avatar.png"))
+        self.edits = []
+        self.followups = []
+
+    async def edit_original_response(self, **kwargs):
+        self.edits.append(kwargs)
+
+    @property
+    def followup(self):
+        async def send(content, **kwargs):
+            self.followups.append(content)
+        return SimpleNamespace(send=send)
+
+
+def test_pages_carry_total(plgarage):
+    plgarage(scores_per_track=25)
+
+    first = get_time_trial_scores(10000, page=1, per_page=10)
+    last = get_time_trial_scores(10000, page=3, per_page=10)
+
+    assert first["total"] == 25
+    assert [score.rank for score in first["scores"]] == list(range(1, 11))
+    assert [score.rank for score in last["scores"]] == list(range(21, 26))
+
+
+def test_find_score_walks_later_pages(plgarage):
+    stats = plgarage(scores_per_track=25)
+    last = get_time_trial_scores(10000, page=3, per_page=10)["scores"][-1]
+    requests_before = stats()["GET /api/score"]
+
+    found = find_time_trial_score(10000, last.player_username.upper(), per_page=5, max_workers=2)
+
+    assert found.rank == 25
+    assert stats()["GET /api/score"] - requests_before == 5
+    assert find_time_trial_score(10000, "nobody", per_page=5) is None
+
+
+def test_jump_opens_the_players_page(plgarage):
+    plgarage(scores_per_track=25)
+    target = get_time_trial_scores(10000, page=2, per_page=10)["scores"][4]
+
+    async def run():
+        interaction = FakeInteraction()
+        first_page = await asyncio.to_thread(get_time_trial_scores, 10000, 1, 10)
+        view = TimeTrialListView(interaction, 10000, 10, first_page)
+        await view._jump_to_player(interaction, target.player_username)
+        return view, interaction
+
+    view, interaction = asyncio.run(run())
+
+    assert view.current_page == 2 and view.total_pages == 3
+    assert set(view.page_cache) == {1, 2}
+    marked = [field.name for field in interaction.edits[-1]["embed"].fields if field.name.startswith("➡️")]
+    assert marked == [f"➡️ **#15** {target.player_username} (`{target.id}`)"]
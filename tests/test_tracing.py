@@ -0,0 +1,73 @@
+import asyncio
+from types import SimpleNamespace
+
+import discord
+
+import tracing
+from endpoints import call_many
+from tracing import TraceBuffer, current_trace, finish_trace, percentile, span, start_trace
+from utils import PLAYER_ID, get_player_id
+
+
+def interaction(name: str = "player stats") -> SimpleNamespace:
+    return SimpleNamespace(
+        command=SimpleNamespace(qualified_name=name, binding=None),
+        type=discord.InteractionType.application_command,
+        user=SimpleNamespace(id=42),
+        guild_id=7,
+        extras={},
+    )
+
+
+def test_percentile_is_nearest_rank():
+    values = [5.0, 1.0, 3.0, 2.0, 4.0]
+
+    assert percentile(values, 0.5) == 3.0
+    assert percentile(values, 0.95) == 5.0
+    assert percentile([2.0], 0.99) == 2.0
+
+
+def test_upstream_calls_from_threads_land_on_the_trace(plgarage, monkeypatch):
+    plgarage()
+    monkeypatch.setattr(tracing, "traces", TraceBuffer(10))
+
+    async def command():
+        fake = interaction()
+        trace = start_trace(fake)
+        with span("lookup"):
+            await asyncio.to_thread(get_player_id, "player_1")
+        await asyncio.to_thread(call_many, PLAYER_ID, [{"username": "player_2"}, {"username": "player_3"}])
+        assert finish_trace(fake) is trace
+        return trace
+
+    trace = asyncio.run(command())
+
+    assert (trace.command, trace.user_id, trace.guild_id) == ("player stats", 42, 7)
+    assert sorted(record.endpoint for record in trace.upstream) == ["player_id"] * 3
+    assert [s.name for s in trace.spans] == ["lookup"]
+    assert trace.duration >= trace.spans[0].duration
+    assert tracing.traces.snapshot() == [trace]
+    assert current_trace.get() is None
+
+
+def test_failed_commands_keep_the_error(monkeypatch):
+    monkeypatch.setattr(tracing, "traces", TraceBuffer(10))
+
+    async def command():
+        fake = interaction("time-trials")
+        start_trace(fake)
+        return finish_trace(fake, ValueError("bad"))
+
+    trace = asyncio.run(command())
+
+    assert trace.error == "ValueError"
+    assert tracing.traces.percentiles()["time-trials"][0] == 1
+
+
+def test_buffer_keeps_the_latest_traces():
+    buffer = TraceBuffer(2)
+    for index, duration in enumerate((0.3, 0.1, 0.2)):
+        buffer.add(tracing.Trace(id=index, cog=None, command="a", user_id=1, started_at=0, duration=duration))
+
+    assert [trace.id for trace in buffer.snapshot()] == [1, 2]
+    assert [trace.id for trace in buffer.slowest(1)] == [2]
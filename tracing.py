@@ -0,0 +1,162 @@
+import itertools
+import logging
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator
+
+import discord
+
+from config import TRACE_BUFFER_SIZE, SLOW_COMMAND_THRESHOLD
+from endpoints import RequestRecord, add_request_hook
+
+
+logger = logging.getLogger("skidplate.tracing")
+
+_trace_ids = itertools.count(1)
+
+
+@dataclass(frozen=True)
+class Span:
+    name: str
+    offset: float
+    duration: float
+
+
+@dataclass
+class Trace:
+    id: int
+    cog: str | None
+    command: str
+    user_id: int
+    started_at: float
+    guild_id: int | None = None
+    started: float = field(default_factory=time.perf_counter)
+    duration: float | None = None
+    error: str | None = None
+    spans: list[Span] = field(default_factory=list)
+    upstream: list[RequestRecord] = field(default_factory=list)
+
+    @property
+    def upstream_time(self) -> float:
+        return sum(record.elapsed for record in self.upstream)
+
+
+current_trace: ContextVar[Trace | None] = ContextVar("current_trace", default=None)
+
+
+class TraceBuffer:
+    def __init__(self, maxlen: int) -> None:
+        self._lock = threading.Lock()
+        self._traces: deque[Trace] = deque(maxlen=maxlen)
+
+    def add(self, trace: Trace) -> None:
+        with self._lock:
+            self._traces.append(trace)
+
+    def snapshot(self, command: str | None = None) -> list[Trace]:
+        with self._lock:
+            traces = list(self._traces)
+
+        if command is not None:
+            traces = [trace for trace in traces if trace.command == command]
+
+        return traces
+
+    def slowest(self, limit: int = 5, command: str | None = None) -> list[Trace]:
+        return sorted(self.snapshot(command), key=lambda trace: trace.duration or 0.0, reverse=True)[:limit]
+
+    def percentiles(self) -> dict[str, tuple[int, float, float, float]]:
+        durations: dict[str, list[float]] = {}
+        for trace in self.snapshot():
+            durations.setdefault(trace.command, []).append(trace.duration or 0.0)
+
+        return {
+            command: (
+                len(values),
+                percentile(values, 0.50),
+                percentile(values, 0.95),
+                percentile(values, 0.99),
+            )
+            for command, values in durations.items()
+        }
+
+
+def percentile(values: list[float], q: float) -> float:
+    # nearest rank on the sorted sample, the buffer is small enough to sort every time
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+def start_trace(interaction: discord.Interaction) -> Trace | None:
+    command = interaction.command
+    if command is None or interaction.type is not discord.InteractionType.application_command:
+        return None
+
+    binding = getattr(command, "binding", None)
+    trace = Trace(
+        id=next(_trace_ids),
+        cog=type(binding).__name__ if binding is not None else None,
+        command=command.qualified_name,
+        user_id=interaction.user.id,
+        started_at=time.time(),
+        guild_id=interaction.guild_id,
+    )
+
+    # the tree runs the check and the command in the same task, so the callback sees this trace
+    current_trace.set(trace)
+    interaction.extras["trace"] = trace
+    return trace
+
+
+def finish_trace(interaction: discord.Interaction, error: BaseException | None = None) -> Trace | None:
+    trace = interaction.extras.pop("trace", None)
+    if trace is None:
+        return None
+
+    trace.duration = time.perf_counter() - trace.started
+    if error is not None:
+        trace.error = type(error).__name__
+
+    traces.add(trace)
+
+    if trace.duration >= SLOW_COMMAND_THRESHOLD:
+        logger.warning(
+            "Slow command '%s' took %.2fs (%s upstream calls, %.2fs upstream).",
+            trace.command,
+            trace.duration,
+            len(trace.upstream),
+            trace.upstream_time,
+            extra={"latency": trace.duration},
+        )
+
+    return trace
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    trace = current_trace.get()
+    if trace is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.spans.append(Span(name, started - trace.started, time.perf_counter() - started))
+
+
+def _record_upstream(record: RequestRecord) -> None:
+    # asyncio.to_thread copies the context, so calls made from worker threads land on the right trace
+    trace = current_trace.get()
+    if trace is not None:
+        trace.upstream.append(record)
+
+
+traces = TraceBuffer(TRACE_BUFFER_SIZE)
+add_request_hook(_record_upstream)
@@ -1,10 +1,15 @@
+import dataclasses
+import math
 import requests
 import discord
-from decimal import Decimal, ROUND_HALF_UP
 from datetime import datetime, timedelta, timezone
 from enum import Enum, IntEnum
 
-from config import URL, MODERATOR_PERMISSIONS
+from config import URL, MODERATOR_PERMISSIONS, MODERATOR_ROLE_ID
+from decoding import decode_json
+from endpoints import Endpoint, REFRESH_TOKEN, call, call_many, is_error, parse_ok, parse_text
+from indexes import known_creations, known_players
+from models import Complaint, Creation, LapTime, Player, Presence, Score
 
 
 class CreationType(Enum):
@@ -112,6 +117,21 @@ def convert_datetime_to_discord_date(timestamp):
     dt = datetime.fromisoformat(timestamp)
     return f"<t:{int(dt.timestamp())}:F>"
 
+def has_moderator_role(interaction):
+    if not MODERATOR_ROLE_ID:
+        return False
+
+    try:
+        moderator_role_id = int(MODERATOR_ROLE_ID)
+    except ValueError:
+        return False
+
+    member = interaction.user
+    if not isinstance(member, discord.Member):
+        return False
+
+    return any(role.id == moderator_role_id for role in member.roles)
+
 def skill_level_id_to_image(id, embed):
     file_name = f"{id}.PNG"
     path = f"img/levels/{file_name}"
@@ -121,125 +141,587 @@ def skill_level_id_to_image(id, embed):
     
     return embed, file
 
-def get_player_id(username):
-    response = requests.get(f"{URL}/api/usernameToId?username={username}")
+def reset_in_seconds_to_discord_timestamp(seconds):
+    future_time = datetime.now(timezone.utc) + timedelta(seconds=seconds)
+    return f"<t:{int(future_time.timestamp())}:R>"
+
+def format_time(time):
+    if isinstance(time, LapTime):
+        return time.format()
+
+    return LapTime.parse(time).format()
+
+# response parsers
+def parse_player_id(response):
+    player_id = response.text
+    return player_id if player_id.isdigit() else None
+
+def parse_player_username(response):
+    username = decode_json(response).get("username")
+    if username:
+        known_players.add(username)
+    return username or None
+
+def parse_player_stats(response):
+    r = decode_json(response)
+
+    if r.get("error") == "error_player_not_found":
+        return "Error: Player not found."
 
-    if response.status_code == 200:
-        player_id = response.text
-        
-        if player_id.isdigit():
-            return player_id
+    return Player.from_payload(r)
 
-    return "Error: Unable to fetch player ID."
+def parse_creation(response):
+    r = decode_json(response)
+
+    if r.get("error") == "error_creation_not_found":
+        return "Error: Creation not found."
+
+    return Creation.from_payload(r)
+
+def parse_creations_page(response):
+    r = decode_json(response)
+
+    if r.get("error") == "error_creation_not_found":
+        return "Error: Creation not found."
+
+    creations = [Creation.from_payload(c) for c in r.get("creations", [])]
+    known_players.add_many(c.creator_username for c in creations)
+    known_creations.add_many((c.id, c.name, c.creator_username, c.type) for c in creations)
+
+    return {
+        "total": r.get("total", 0),
+        "creations": creations,
+    }
+
+def parse_top_creations(response):
+    r = decode_json(response)
+
+    if isinstance(r, dict):
+        creations_data = r.get("creations", [])
+    elif isinstance(r, list):
+        creations_data = r
+    else:
+        return None
+
+    creations = [Creation.from_payload(c) for c in creations_data]
+    known_players.add_many(c.creator_username for c in creations)
+    known_creations.add_many((c.id, c.name, c.creator_username, c.type) for c in creations)
+    return creations
+
+def parse_presence_page(response):
+    r = decode_json(response)
+
+    if not isinstance(r, dict):
+        return None
+
+    players = [Presence.from_payload(p) for p in r.get("presence", [])]
+    known_players.add_many(p.username for p in players)
+
+    return {
+        "total": r.get("total", 0),
+        "creations": players,
+    }
+
+def parse_digits(response):
+    return response.text if response.text.isdigit() else None
+
+def parse_creations_count(response):
+    r = decode_json(response)
+
+    return {
+        "totalMNR": r.get("totalMNR"),
+        "totalMods": r.get("mnr", {}).get("PS3", {}).get("CHARACTER"),
+        "totalKarts": r.get("mnr", {}).get("PS3", {}).get("KART"),
+        "totalTracks": r.get("mnr", {}).get("PS3", {}).get("TRACK")
+    }
+
+def parse_hotlap(response):
+    r = decode_json(response)
+    track = r.get("track", {})
+
+    top_times = [Score.from_payload(t) for t in r.get("topTimes", [])]
+    known_players.add(track.get("creatorUsername"))
+    known_players.add_many(t.player_username for t in top_times)
+
+    return {
+        "id": track.get("id"),
+        "name": track.get("name"),
+        "rating": track.get("rating"),
+        "creatorUsername": track.get("creatorUsername"),
+        "resetInSeconds": r.get("resetInSeconds"),
+        "topTimes": top_times,
+    }
+
+def parse_time_trial(response):
+    r = decode_json(response)
+    track = r.get("track", {})
+
+    scores = [Score.from_payload(t) for t in r.get("scores", [])]
+    known_players.add(track.get("creatorUsername"))
+    known_players.add_many(t.player_username for t in scores)
+
+    return {
+        "id": track.get("id"),
+        "name": track.get("name"),
+        "rating": track.get("rating"),
+        "creatorUsername": track.get("creatorUsername"),
+        "total": r.get("total", len(scores)),
+        "scores": scores,
+    }
+
+def parse_json(response):
+    return decode_json(response)
+
+def parse_login(response):
+    if response.text == "ok":
+        return response.cookies.get("Token")
+
+    if response.text == "error":
+        return "Error: Invalid credentials."
+
+    return None
+
+def parse_complaints_page(response):
+    r = decode_json(response)
+
+    if isinstance(r, list):
+        return [Complaint.from_payload(c) for c in r]
+
+    if isinstance(r, dict) and isinstance(r.get("Page"), list):
+        return {**r, "Page": [Complaint.from_payload(c) for c in r["Page"]]}
+
+    return r
+
+# endpoints
+PLAYER_ID = Endpoint(
+    name="player_id",
+    method="GET",
+    path="/api/usernameToId",
+    parse=parse_player_id,
+    error="Error: Unable to fetch player ID.",
+    cache_ttl=300,
+)
+PLAYER_USERNAME = Endpoint(
+    name="player_username",
+    method="GET",
+    path="/api/player",
+    parse=parse_player_username,
+    error="Error: Unable to fetch player username.",
+    cache_ttl=300,
+)
+PLAYER_STATS = Endpoint(
+    name="player_stats",
+    method="GET",
+    path="/api/player",
+    parse=parse_player_stats,
+    error="Error: Unable to fetch player stats.",
+    cache_ttl=30,
+)
+CREATION = Endpoint(
+    name="creation",
+    method="GET",
+    path="/api/creation/{creation_id}",
+    parse=parse_creation,
+    error="Error: Unable to fetch creation stats.",
+    cache_ttl=60,
+)
+CREATIONS_SEARCH = Endpoint(
+    name="creations_search",
+    method="GET",
+    path="/api/creations/search",
+    parse=parse_creations_page,
+    error="Error: Unable to fetch creations stats.",
+    cache_ttl=30,
+)
+CREATIONS_BY_USERNAME = Endpoint(
+    name="creations_by_username",
+    method="GET",
+    path="/api/creations/{username}",
+    parse=parse_creations_page,
+    error="Error: Unable to fetch creations stats.",
+    cache_ttl=30,
+)
+TOP_MODS = Endpoint(
+    name="top_mods",
+    method="GET",
+    path="/api/topmods",
+    parse=parse_top_creations,
+    error="Error: Unable to fetch top mods.",
+    cache_ttl=60,
+)
+TOP_KARTS = Endpoint(
+    name="top_karts",
+    method="GET",
+    path="/api/topkarts",
+    parse=parse_top_creations,
+    error="Error: Unable to fetch top karts.",
+    cache_ttl=60,
+)
+TOP_TRACKS = Endpoint(
+    name="top_tracks",
+    method="GET",
+    path="/api/toptracks",
+    parse=parse_top_creations,
+    error="Error: Unable to fetch top tracks.",
+    cache_ttl=60,
+)
+PLAYERS_PRESENCE = Endpoint(
+    name="players_presence",
+    method="GET",
+    path="/api/playercounts/presence",
+    parse=parse_presence_page,
+    error="Error: Unable to fetch players online count.",
+    cache_ttl=5,
+)
+PLAYERS_ONLINE_COUNT = Endpoint(
+    name="players_online_count",
+    method="GET",
+    path="/api/playercounts/sessioncount",
+    parse=parse_text,
+    error="Error: Unable to fetch players online count.",
+    cache_ttl=5,
+)
+TOTAL_CREATIONS_COUNT = Endpoint(
+    name="total_creations_count",
+    method="GET",
+    path="/api/creationcount",
+    parse=parse_creations_count,
+    error="Error: Unable to fetch total creations count.",
+    cache_ttl=60,
+)
+TOTAL_PLAYERS_COUNT = Endpoint(
+    name="total_players_count",
+    method="GET",
+    path="/api/playercounts",
+    parse=parse_digits,
+    error="Error: Unable to fetch total players count.",
+    cache_ttl=60,
+)
+INSTANCE_NAME = Endpoint(
+    name="instance_name",
+    method="GET",
+    path="/api/GetInstanceName",
+    parse=parse_text,
+    error="Error: Unable to fetch instance name.",
+    cache_ttl=3600,
+)
+HOTLAP = Endpoint(
+    name="hotlap",
+    method="GET",
+    path="/api/hotlap",
+    parse=parse_hotlap,
+    error="Error: Unable to fetch hotlap scores.",
+    cache_ttl=5,
+)
+TIME_TRIAL = Endpoint(
+    name="time_trial",
+    method="GET",
+    path="/api/score",
+    parse=parse_time_trial,
+    error="Error: Unable to fetch time trial scores.",
+    cache_ttl=15,
+)
+
+MODERATOR_LOGIN = Endpoint(
+    name="moderator_login",
+    method="POST",
+    path="/api/moderation/login",
+    parse=parse_login,
+    error="Error: Unable to login as moderator.",
+)
+MODERATOR_ID = Endpoint(
+    name="moderator_id",
+    method="GET",
+    path="/api/moderation/{username}/id",
+    parse=parse_text,
+    errors={403: "Error: You do not have permission to get moderator ID."},
+    error="Error: Unable to fetch moderator ID.",
+    auth=True,
+)
+SET_PLAYER_BAN = Endpoint(
+    name="set_player_ban",
+    method="POST",
+    path="/api/moderation/setban",
+    errors={403: "Error: You do not have permission to set ban status for player."},
+    error="Error: Unable to set ban status for player.",
+    auth=True,
+)
+BANNED_PLAYER_CREATIONS = Endpoint(
+    name="banned_player_creations",
+    method="GET",
+    path="/api/moderation/player_creations",
+    params={"status": "BANNED"},
+    parse=parse_json,
+    errors={403: "Error: You do not have permission to view banned player creations."},
+    error="Error: Unable to get banned player creations.",
+    auth=True,
+)
+SET_CREATION_STATUS = Endpoint(
+    name="set_creation_status",
+    method="POST",
+    path="/api/moderation/setStatus",
+    errors={403: "Error: You do not have permission to set ban status for creation."},
+    error="Error: Unable to set ban status for creation.",
+    auth=True,
+)
+SET_USER_QUOTA = Endpoint(
+    name="set_user_quota",
+    method="POST",
+    path="/api/moderation/setUserQuota",
+    errors={403: "Error: You do not have permission to set quota for user."},
+    error="Error: Unable to set quota for user.",
+    auth=True,
+)
+SET_USER_SETTINGS = Endpoint(
+    name="set_user_settings",
+    method="POST",
+    path="/api/moderation/setUserSettings",
+    errors={403: "Error: You do not have permission to set opposite platform allowance for user."},
+    error="Error: Unable to set opposite platform allowance for user.",
+    auth=True,
+)
+RESET_PLAYER_STATS = Endpoint(
+    name="reset_player_stats",
+    method="DELETE",
+    path="/api/moderation/users/{player_id}/stats",
+    errors={403: "Error: You do not have permission to reset player profile."},
+    error="Error: Unable to reset player profile.",
+    auth=True,
+)
+REMOVE_PLAYER_AVATAR = Endpoint(
+    name="remove_player_avatar",
+    method="DELETE",
+    path="/api/moderation/users/{player_id}/avatar",
+    errors={403: "Error: You do not have permission to remove player avatars."},
+    error="Error: Unable to remove player avatar.",
+    auth=True,
+)
+ANNOUNCEMENTS = Endpoint(
+    name="announcements",
+    method="GET",
+    path="/api/moderation/announcements",
+    parse=parse_json,
+    errors={403: "Error: You do not have permission to get announcements."},
+    error="Error: Unable to get announcements.",
+    auth=True,
+)
+CREATE_ANNOUNCEMENT = Endpoint(
+    name="create_announcement",
+    method="POST",
+    path="/api/moderation/announcements",
+    errors={403: "Error: You do not have permission to manage announcements."},
+    error="Error: Unable to create announcement.",
+    auth=True,
+)
+EDIT_ANNOUNCEMENT = Endpoint(
+    name="edit_announcement",
+    method="POST",
+    path="/api/moderation/announcements/{announcement_id}",
+    params={"platform": 2},
+    errors={
+        403: "Error: You do not have permission to manage announcements.",
+        404: "Error: Announcement not found.",
+    },
+    error="Error: Unable to edit announcement.",
+    auth=True,
+)
+DELETE_ANNOUNCEMENT = Endpoint(
+    name="delete_announcement",
+    method="DELETE",
+    path="/api/moderation/announcements/{announcement_id}",
+    errors={
+        403: "Error: You do not have permission to manage announcements.",
+        404: "Error: Announcement not found.",
+    },
+    error="Error: Unable to delete announcement.",
+    auth=True,
+)
+REMOVE_PLAYER_CREATION = Endpoint(
+    name="remove_player_creation",
+    method="DELETE",
+    path="/api/moderation/player_creations/{creation_id}",
+    errors={
+        403: "Error: You do not have permission to remove player creations.",
+        404: "Error: Creation not found.",
+    },
+    error="Error: Unable to remove player creation.",
+    auth=True,
+)
+REMOVE_PLAYER_CREATIONS = Endpoint(
+    name="remove_player_creations",
+    method="DELETE",
+    path="/api/moderation/users/{player_id}/creations",
+    errors={
+        403: "Error: You do not have permission to remove player creations.",
+        404: "Error: Player not found.",
+    },
+    error="Error: Unable to remove player creations.",
+    auth=True,
+)
+BANNED_CONSOLE_IDS = Endpoint(
+    name="banned_console_ids",
+    method="GET",
+    path="/api/moderation/banned_console_ids",
+    parse=parse_json,
+    errors={403: "Error: You do not have permission to manage console IDs."},
+    error="Error: Unable to fetch banned console IDs.",
+    auth=True,
+)
+ADD_BANNED_CONSOLE_ID = Endpoint(
+    name="add_banned_console_id",
+    method="POST",
+    path="/api/moderation/banned_console_ids",
+    parse=parse_ok({"error_already_exists": "Error: Console ID already exists."}),
+    errors={403: "Error: You do not have permission to manage console IDs."},
+    error="Error: Unable to add banned console ID.",
+    auth=True,
+)
+REMOVE_BANNED_CONSOLE_ID = Endpoint(
+    name="remove_banned_console_id",
+    method="DELETE",
+    path="/api/moderation/banned_console_ids",
+    errors={
+        403: "Error: You do not have permission to manage console IDs.",
+        404: "Error: Console ID not found.",
+    },
+    error="Error: Unable to remove banned console ID.",
+    auth=True,
+)
+BAN_CONSOLE_ID_BY_SESSION = Endpoint(
+    name="ban_console_id_by_session",
+    method="POST",
+    path="/api/moderation/banned_console_ids/player/{player_id}",
+    parse=parse_ok({
+        "no_active_session": "Error: Player has no active session.",
+        "no_console_id_found": "Error: No console ID found for the player's active session.",
+        "error_already_exists": "Error: Console ID already exists.",
+    }),
+    errors={403: "Error: You do not have permission to manage console IDs."},
+    error="Error: Unable to add console ID by player session.",
+    auth=True,
+)
+PLAYER_COMPLAINTS = Endpoint(
+    name="player_complaints",
+    method="GET",
+    path="/api/moderation/player_complaints",
+    parse=parse_complaints_page,
+    errors={403: "Error: You do not have permission to view player complaints."},
+    error="Error: Unable to get player complaints.",
+    auth=True,
+)
+CREATION_COMPLAINTS = Endpoint(
+    name="creation_complaints",
+    method="GET",
+    path="/api/moderation/player_creation_complaints",
+    parse=parse_complaints_page,
+    errors={403: "Error: You do not have permission to view creation complaints."},
+    error="Error: Unable to get creation complaints.",
+    auth=True,
+)
+CREATE_MODERATOR = Endpoint(
+    name="create_moderator",
+    method="POST",
+    path="/api/moderation/moderators",
+    errors={403: "Error: You do not have permission to create a moderator."},
+    error="Error: Unable to create moderator.",
+    auth=True,
+)
+DELETE_MODERATOR = Endpoint(
+    name="delete_moderator",
+    method="DELETE",
+    path="/api/moderation/moderators/{moderator_id}",
+    errors={403: "Error: You do not have permission to delete a moderator."},
+    error="Error: Unable to delete moderator.",
+    auth=True,
+)
+MODERATORS = Endpoint(
+    name="moderators",
+    method="GET",
+    path="/api/moderation/moderators",
+    parse=parse_json,
+    errors={403: "Error: You do not have permission to get moderators."},
+    error="Error: Unable to get moderators.",
+    auth=True,
+)
+MODERATOR_PERMISSIONS_LIST = Endpoint(
+    name="moderator_permissions",
+    method="GET",
+    path="/api/moderation/permissions",
+    parse=parse_json,
+    errors={404: "Error: Moderator not found."},
+    error="Error: Unable to get moderator permissions.",
+    auth=True,
+)
+SET_MODERATOR_PERMISSIONS = Endpoint(
+    name="set_moderator_permissions",
+    method="POST",
+    path="/api/moderation/{moderator_id}/set_permissions",
+    parse=lambda response: "ok" if response.text == "ok" else "Error: Moderator not found.",
+    error="Error: Unable to set moderator permissions.",
+    auth=True,
+)
+SET_MODERATOR_USERNAME = Endpoint(
+    name="set_moderator_username",
+    method="GET",
+    path="/api/moderation/set_username",
+    parse=parse_json,
+    errors={403: "Error: You do not have permission to get moderators."},
+    error="Error: Unable to get moderators.",
+    auth=True,
+    idempotent=False,
+)
+SET_MODERATOR_PASSWORD = Endpoint(
+    name="set_moderator_password",
+    method="POST",
+    path="/api/moderation/set_password",
+    parse=parse_ok({
+        "error_moderator_not_found": "Error: Moderator not found.",
+        # impossible to reach this point but eh
+        "error_password_is_empty": "Error: Password is empty.",
+    }),
+    error="Error: Unable to set moderator password.",
+    auth=True,
+)
+
+# public api
+def get_player_id(username):
+    return call(PLAYER_ID, username=username)
 
 # maybe creating an endpoint for plg
 def get_player_username(player_id):
-    response = requests.get(f"{URL}/api/player?id={player_id}")
+    return call(PLAYER_USERNAME, id=player_id)
 
-    if response.status_code == 200:
-        r = response.json()
-        
-        username = r.get("username")
-        if username:
-            return username
-
-    return "Error: Unable to fetch player username."
-    
 def get_player_stats(username):
-    response = requests.get(f"{URL}/api/player?username={username}")
-
-    if response.status_code == 200:
-        r = response.json()
-        
-        error = r.get("error")
-        
-        if error == "error_player_not_found":
-            return "Error: Player not found."
-        
-        return {
-            "userId": r.get("userId"),
-            "quote": r.get("quote"),
-            "starRating": r.get("starRating"),
-            "onlineRaces": r.get("onlineRaces") + r.get("onlineFinished") + r.get("onlineForfeits"),
-            "onlineWins": r.get("onlineWins"),
-            "winStreak": r.get("winStreak"),
-            "longestWinStreak": r.get("longestWinStreak"),
-            "skillLevelId": r.get("skillLevels", {}).get("PS3", {}).get("id"),
-            "skillLevelName": r.get("skillLevels", {}).get("PS3", {}).get("name"),
-            "creationPoints": r.get("skillLevels", {}).get("PS3", {}).get("creationPoints"),
-            "raceXp": r.get("skillLevels", {}).get("PS3", {}).get("raceXp"),
-            "skillRating": r.get("skillRating"),
-            "longestDrift": r.get("longestDrift"),
-            "longestHangTime": r.get("longestHangTime"),
-            "presence": r.get("presence"),
-            "isBanned": r.get("isBanned"),
-            "createdAt": r.get("createdAt"),
-            "totalMods": r.get("creationsCount", {}).get("mnr", {}).get("PS3", {}).get("CHARACTER"),
-            "totalKarts": r.get("creationsCount", {}).get("mnr", {}).get("PS3", {}).get("KART"),
-            "totalTracks": r.get("creationsCount", {}).get("mnr", {}).get("PS3", {}).get("TRACK")
-        }
+    player = call(PLAYER_STATS, username=username)
+    if is_error(player):
+        return player
+
+    known_players.add(player.username)
 
-    return "Error: Unable to fetch player stats."
+    return player if player.username else dataclasses.replace(player, username=username)
 
 def get_creation_name(creation_id):
-    response = requests.get(f"{URL}/api/creation/{creation_id}")
+    creation = get_creation_stats(creation_id)
 
-    if response.status_code == 200:
-        r = response.json()
-        
-        error = r.get("error")
-        
-        if error == "error_creation_not_found":
-            return "Error: Creation not found."
-        
-        return r.get("name")
+    if creation == "Error: Unable to fetch creation stats.":
+        return "Error: Unable to fetch creation name."
 
-    return "Error: Unable to fetch creation name."
+    return creation if is_error(creation) else creation.name
 
 def get_creation_stats(creation_id):
-    response = requests.get(f"{URL}/api/creation/{creation_id}")
-
-    if response.status_code == 200:
-        r = response.json()
-        
-        error = r.get("error")
-        
-        if error == "error_creation_not_found":
-            return "Error: Creation not found."
-        
-        is_track = r.get("type") == "TRACK"
-
-        return {
-            "id": r.get("playerCreationId"),
-            "name": r.get("name"),
-            "description": r.get("description"),
-            "rating": r.get("rating"),
-            "creatorUsername": r.get("creatorUsername"),
-            "type": r.get("type"),
-            "tags": r.get("tags"),
-            "isMNR": r.get("isMNR"),
-            "createdAt": r.get("createdAt"),
-            "downloads": r.get("downloads", {}).get("all_time"),
-            "views": r.get("views", {}).get("all_time"),
-            "points": r.get("points", {}).get("all_time"),
-
-            "bestLapTime": (
-                r.get("records", {}).get("bestLapTime")
-                if is_track else None
-            ),
-
-            "longestDrift": (
-                r.get("longestDrift", {}).get("longestDrift")
-                if is_track else None
-            ),
-
-            "longestHangTime": (
-                r.get("longestHangTime", {}).get("longestHangTime")
-                if is_track else None
-            )
-        }
+    creation = call(CREATION, creation_id=creation_id)
+    if is_error(creation):
+        return creation
+
+    known_players.add(creation.creator_username)
+    known_creations.add(
+        creation.id or creation_id,
+        creation.name,
+        creation.creator_username,
+        creation.type,
+    )
 
-    return "Error: Unable to fetch creation stats."
+    return creation
 
 def get_creations_stats_by_query(
     query,
@@ -249,65 +731,15 @@ def get_creations_stats_by_query(
     page=1,
     per_page=6,
 ):
-    params: dict[str, str | int] = {
-        "query": query,
-        "page": page,
-        "perPage": per_page,
-    }
-
-    if creation_type is not None:
-        params["type"] = creation_type
-
-    if platform is not None:
-        params["platform"] = platform
-
-    is_mnr = True if is_mnr is None else is_mnr
-    params["isMnr"] = str(is_mnr).lower()
-
-    response = requests.get(f"{URL}/api/creations/search", params=params)
-
-    if response.status_code == 200:
-        r = response.json()
-        
-        error = r.get("error")
-                
-        if error == "error_creation_not_found":
-            return "Error: Creation not found."
-
-        return {
-            "total": r.get("total", 0),
-            "creations": [
-                {
-                    "id": c.get("playerCreationId"),
-                    "name": c.get("name"),
-                    "description": c.get("description"),
-                    "rating": c.get("rating"),
-                    "creatorUsername": c.get("creatorUsername"),
-                    "type": c.get("type"),
-                    "tags": c.get("tags"),
-                    "isMNR": c.get("isMNR"),
-                    "createdAt": c.get("createdAt"),
-                    "downloads": c.get("downloads", {}).get("all_time"),
-                    "views": c.get("views", {}).get("all_time"),
-                    "points": c.get("points", {}).get("all_time"),
-                    "bestLapTime": (
-                        c.get("records", {}).get("bestLapTime")
-                        if c.get("type") == "TRACK" else None
-                    ),
-                    "longestDrift": (
-                        c.get("records", {}).get("longestDrift")
-                        if c.get("type") == "TRACK" else None
-                    ),
-                    "longestHangTime": (
-                        c.get("records", {}).get("longestHangTime")
-                        if c.get("type") == "TRACK" else None
-                    ),
-                }
-                for c in r.get("creations", [])
-            ],
-        }
-
-    return "Error: Unable to fetch creations stats."
+    return call(
+        CREATIONS_SEARCH,
+        query=query,
+        type=creation_type,
+        platform=platform,
+        isMnr=True if is_mnr is None else is_mnr,
+        page=page,
+        perPage=per_page,
+    )
 
 def get_creations_stats_by_username(
     username,
@@ -317,905 +749,278 @@ def get_creations_stats_by_username(
     page=1,
     per_page=6,
 ):
-    params: dict[str, str | int] = {
-        "page": page,
-        "perPage": per_page,
-    }
-
-    if creation_type is not None:
-        params["type"] = creation_type
-
-    if platform is not None:
-        params["platform"] = platform
-
-    is_mnr = True if is_mnr is None else is_mnr
-    params["isMnr"] = str(is_mnr).lower()
-
-    response = requests.get(f"{URL}/api/creations/{username}", params=params)
-
-    if response.status_code == 200:
-        r = response.json()
-        
-        error = r.get("error")
-                
-        if error == "error_creation_not_found":
-            return "Error: Creation not found."
-
-        return {
-            "total": r.get("total", 0),
-            "creations": [
-                {
-                    "id": c.get("playerCreationId"),
-                    "name": c.get("name"),
-                    "description": c.get("description"),
-                    "rating": c.get("rating"),
-                    "creatorUsername": c.get("creatorUsername"),
-                    "type": c.get("type"),
-                    "tags": c.get("tags"),
-                    "isMNR": c.get("isMNR"),
-                    "createdAt": c.get("createdAt"),
-                    "downloads": c.get("downloads", {}).get("all_time"),
-                    "views": c.get("views", {}).get("all_time"),
-                    "points": c.get("points", {}).get("all_time"),
-                    "bestLapTime": (
-                        c.get("records", {}).get("bestLapTime")
-                        if c.get("type") == "TRACK" else None
-                    ),
-                    "longestDrift": (
-                        c.get("records", {}).get("longestDrift")
-                        if c.get("type") == "TRACK" else None
-                    ),
-                    "longestHangTime": (
-                        c.get("records", {}).get("longestHangTime")
-                        if c.get("type") == "TRACK" else None
-                    ),
-                }
-                for c in r.get("creations", [])
-            ],
-        }
-
-    return "Error: Unable to fetch creations stats."
+    return call(
+        CREATIONS_BY_USERNAME,
+        username=username,
+        type=creation_type,
+        platform=platform,
+        isMnr=True if is_mnr is None else is_mnr,
+        page=page,
+        perPage=per_page,
+    )
 
 def get_topmods():
-    response = requests.get(f"{URL}/api/topmods")
-
-    if response.status_code == 200:
-        r = response.json()
-
-        if isinstance(r, dict):
-            creations_data = r.get("creations", [])
-        elif isinstance(r, list):
-            creations_data = r
-        else:
-            return "Error: Unable to fetch top mods."
-
-        return [
-            {
-                "id": c.get("id", c.get("playerCreationId")),
-                "name": c.get("name"),
-                "description": c.get("description"),
-                "rating": c.get("rating"),
-                "creatorUsername": c.get("creatorUsername"),
-                "type": c.get("type"),
-                "tags": c.get("tags"),
-                "createdAt": c.get("createdAt"),
-                "downloads": (
-                    c.get("downloads", {}).get("all_time")
-                    if isinstance(c.get("downloads"), dict)
-                    else c.get("downloads")
-                ),
-                "views": (
-                    c.get("views", {}).get("all_time")
-                    if isinstance(c.get("views"), dict)
-                    else c.get("views")
-                ),
-                "points": (
-                    c.get("points", {}).get("all_time")
-                    if isinstance(c.get("points"), dict)
-                    else c.get("points")
-                ),
-            }
-            for c in creations_data
-        ]
-
-    return "Error: Unable to fetch top mods."
+    return call(TOP_MODS)
 
 def get_topkarts():
-    response = requests.get(f"{URL}/api/topkarts")
-
-    if response.status_code == 200:
-        r = response.json()
-
-        if isinstance(r, dict):
-            creations_data = r.get("creations", [])
-        elif isinstance(r, list):
-            creations_data = r
-        else:
-            return "Error: Unable to fetch top karts."
-
-        return [
-            {
-                "id": c.get("id", c.get("playerCreationId")),
-                "name": c.get("name"),
-                "description": c.get("description"),
-                "rating": c.get("rating"),
-                "creatorUsername": c.get("creatorUsername"),
-                "type": c.get("type"),
-                "tags": c.get("tags"),
-                "createdAt": c.get("createdAt"),
-                "downloads": (
-                    c.get("downloads", {}).get("all_time")
-                    if isinstance(c.get("downloads"), dict)
-                    else c.get("downloads")
-                ),
-                "views": (
-                    c.get("views", {}).get("all_time")
-                    if isinstance(c.get("views"), dict)
-                    else c.get("views")
-                ),
-                "points": (
-                    c.get("points", {}).get("all_time")
-                    if isinstance(c.get("points"), dict)
-                    else c.get("points")
-                ),
-            }
-            for c in creations_data
-        ]
-
-    return "Error: Unable to fetch top karts."
+    return call(TOP_KARTS)
 
 def get_toptracks():
-    response = requests.get(f"{URL}/api/toptracks")
+    return call(TOP_TRACKS)
 
-    if response.status_code == 200:
-        r = response.json()
+def get_players_online_presence(is_mnr=None, page=1, per_page=6):
+    return call(
+        PLAYERS_PRESENCE,
+        isMnr=True if is_mnr is None else is_mnr,
+        page=page,
+        perPage=per_page,
+    )
 
-        if isinstance(r, dict):
-            creations_data = r.get("creations", [])
-        elif isinstance(r, list):
-            creations_data = r
-        else:
-            return "Error: Unable to fetch top tracks."
-
-        return [
-            {
-                "id": c.get("id", c.get("playerCreationId")),
-                "name": c.get("name"),
-                "description": c.get("description"),
-                "rating": c.get("rating"),
-                "creatorUsername": c.get("creatorUsername"),
-                "type": c.get("type"),
-                "tags": c.get("tags"),
-                "createdAt": c.get("createdAt"),
-                "downloads": (
-                    c.get("downloads", {}).get("all_time")
-                    if isinstance(c.get("downloads"), dict)
-                    else c.get("downloads")
-                ),
-                "views": (
-                    c.get("views", {}).get("all_time")
-                    if isinstance(c.get("views"), dict)
-                    else c.get("views")
-                ),
-                "points": (
-                    c.get("points", {}).get("all_time")
-                    if isinstance(c.get("points"), dict)
-                    else c.get("points")
-                ),
-            }
-            for c in creations_data
-        ]
-
-    return "Error: Unable to fetch top tracks."
+def get_all_players_online_presence(is_mnr=None, per_page=100, max_workers=4):
+    first_page = get_players_online_presence(is_mnr=is_mnr, page=1, per_page=per_page)
+    if isinstance(first_page, str):
+        return first_page
+
+    players = list(first_page.get("creations", []))
+    total = first_page.get("total", 0)
+    page_count = math.ceil(total / per_page) if total else 1
+
+    # the first page tells us how many more there are, so fetch the rest side by side
+    if page_count > 1 and len(players) >= per_page:
+        pages = call_many(
+            PLAYERS_PRESENCE,
+            (
+                {"isMnr": True if is_mnr is None else is_mnr, "page": page, "perPage": per_page}
+                for page in range(2, page_count + 1)
+            ),
+            max_workers=max_workers,
+        )
 
-def get_players_online_presence(is_mnr=None, page=1, per_page=6):
-    response = requests.get(f"{URL}/api/playercounts/presence?&isMnr={str(is_mnr).lower() if is_mnr is not None else 'true'}&page={page}&perPage={per_page}")
-
-    if response.status_code == 200:
-        r = response.json()
-        
-        if isinstance(r, dict):
-            return {
-                "total": r.get("total", 0),
-                "creations": [
-                    {
-                        "id": c.get("userId"),
-                        "username": c.get("username"),
-                        "presence": c.get("presence"),
-                        "platform": c.get("platform"),
-                        "IsMNR": c.get("isMNR"),
-                        "IsRpcn": c.get("isRpcn")
-                    }
-                    for c in r.get("presence", [])
-                ],
-            }
-        
-    return "Error: Unable to fetch players online count."
+        for data in pages:
+            if isinstance(data, str):
+                return data
+            players.extend(data.get("creations", []))
 
-def get_players_online_count():
-    response = requests.get(f"{URL}/api/playercounts/sessioncount")
+    return {
+        "total": max(total, len(players)),
+        "creations": players,
+    }
 
-    if response.status_code == 200:
-        players_online = response.text
-        
-        return players_online
-        
-    return "Error: Unable to fetch players online count."
+def get_players_online_count():
+    return call(PLAYERS_ONLINE_COUNT)
 
 def get_total_creations_count():
-    response = requests.get(f"{URL}/api/creationcount")
-
-    if response.status_code == 200:
-        r = response.json()
-        
-        return {
-            "totalMNR": r.get("totalMNR"),
-            "totalMods": r.get("mnr", {}).get("PS3", {}).get("CHARACTER"),
-            "totalKarts": r.get("mnr", {}).get("PS3", {}).get("KART"),
-            "totalTracks": r.get("mnr", {}).get("PS3", {}).get("TRACK")
-        }
-        
-    return "Error: Unable to fetch total creations count."
+    return call(TOTAL_CREATIONS_COUNT)
 
 def get_total_players_count():
-    response = requests.get(f"{URL}/api/playercounts")
-
-    if response.status_code == 200:
-        player_count = response.text
-        
-        if player_count.isdigit():
-            return player_count
-        
-    return "Error: Unable to fetch total players count."
+    return call(TOTAL_PLAYERS_COUNT)
 
 def get_instance_name():
-    response = requests.get(f"{URL}/api/GetInstanceName")
+    return call(INSTANCE_NAME)
 
-    if response.status_code == 200:
-        return response.text
+def get_hotlap_scores():
+    return call(HOTLAP)
 
-    return "Error: Unable to fetch instance name."
+def get_time_trial_scores(track_id, page=1, per_page=10):
+    return call(TIME_TRIAL, trackId=track_id, page=page, perPage=per_page)
 
-def reset_in_seconds_to_discord_timestamp(seconds):
-    future_time = datetime.now(timezone.utc) + timedelta(seconds=seconds)
-    return f"<t:{int(future_time.timestamp())}:R>"
+def find_time_trial_score(track_id, username, per_page=100, max_workers=4, first_page=None):
+    username = username.strip().casefold()
 
-def format_time(time):
-    if isinstance(time, str) and ":" in time:
-        parts = time.split(":")
-        if len(parts) == 3:
-            minutes = int(parts[0])
-            seconds = int(parts[1])
-            milliseconds = int(parts[2])
-            return f"{minutes:02}:{seconds:02}:{milliseconds:03}"
-        if len(parts) == 2:
-            seconds = int(parts[0])
-            milliseconds = int(parts[1])
-            return f"00:{seconds:02}:{milliseconds:03}"
-
-    total_ms = int((Decimal(str(time)) * 1000).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
-
-    minutes = total_ms // 60000
-    seconds = (total_ms % 60000) // 1000
-    milliseconds = total_ms % 1000
-
-    return f"{minutes:02}:{seconds:02}:{milliseconds:03}"
+    def find_in(data):
+        for score in data.get("scores", []):
+            if str(score.player_username or "").casefold() == username:
+                return score
+        return None
 
-def get_hotlap_scores():
-    response = requests.get(f"{URL}/api/hotlap")
-
-    if response.status_code == 200:
-        r = response.json()
-        
-        return {
-            "id": r.get("track", {}).get("id"),
-            "name": r.get("track", {}).get("name"),
-            "rating": r.get("track", {}).get("rating"),
-            "creatorUsername": r.get("track", {}).get("creatorUsername"),
-            "resetInSeconds": r.get("resetInSeconds"),
-            "topTimes": [
-                {
-                    "rank": t.get("rank"),
-                    "scoreId": t.get("scoreId"),
-                    "playerUsername": t.get("playerUsername"),
-                    "bestLapTime": t.get("bestLapTime"),
-                    "updatedAt": t.get("updatedAt"),
-                }
-                for t in r.get("topTimes", [])
-            ]
-        }
-        
-    return "Error: Unable to fetch hotlap scores."
-
-def get_time_trial_scores(track_id):
-    response = requests.get(f"{URL}/api/score?trackId={track_id}&page=1&perPage=10")
-
-    if response.status_code == 200:
-        r = response.json()
-        
-        return {
-            "id": r.get("track", {}).get("id"),
-            "name": r.get("track", {}).get("name"),
-            "rating": r.get("track", {}).get("rating"),
-            "creatorUsername": r.get("track", {}).get("creatorUsername"),
-            "scores": [
-                {
-                    "rank": t.get("rank"),
-                    "id": t.get("id"),
-                    "playerUsername": t.get("playerUsername"),
-                    "bestLapTime": t.get("bestLapTime"),
-                    "updatedAt": t.get("updatedAt"),
-                }
-                for t in r.get("scores", [])
-            ]
-        }
-        
-    return "Error: Unable to fetch time trial scores."
+    # callers that already hold page 1 at the same page size can pass it in
+    if first_page is None:
+        first_page = get_time_trial_scores(track_id, page=1, per_page=per_page)
+    if isinstance(first_page, str):
+        return first_page
 
-# moderation functions
-def moderator_login(username, password):
-    response = requests.post(f"{URL}/api/moderation/login?login={username}&password={password}")
-
-    if response.status_code == 200:
-        r = response.text
-        
-        if r == "ok":
-            token = response.cookies.get("Token")
-            return token
-        
-        elif r == "error":
-            return "Error: Invalid credentials."
-        
-    return "Error: Unable to login as moderator."
+    score = find_in(first_page)
+    if score is not None:
+        return score
 
-def refresh_moderator_token(token):
-    headers = { "Authorization": f"Bearer {token}"}
-    
-    response = requests.post(f"{URL}/api/moderation/refresh_token", headers=headers)
+    page_count = math.ceil(first_page.get("total", 0) / per_page)
 
-    if response.status_code == 200:
-        r = response.text
-        
-        if r == "ok":
-            token = response.cookies.get("Token")
-            return token
-        
-    return "Error: Unable to refresh moderator token."
+    # walk the rest of the leaderboard a few big pages at a time instead of page by page
+    for chunk_start in range(2, page_count + 1, max_workers):
+        pages = range(chunk_start, min(chunk_start + max_workers, page_count + 1))
+        chunk = call_many(
+            TIME_TRIAL,
+            ({"trackId": track_id, "page": page, "perPage": per_page} for page in pages),
+            max_workers=max_workers,
+        )
 
-def get_moderator_id(token, username):
-    headers = { "Authorization": f"Bearer {token}"}
-    
-    refresh_moderator_token(token)
-    
-    response = requests.get(f"{URL}/api/moderation/{username}/id", headers=headers)
+        for data in chunk:
+            if isinstance(data, str):
+                return data
 
-    if response.status_code == 200:
-        r = response.text
-        return r
-    
-    if response.status_code == 403:
-        return "Error: You do not have permission to get moderator ID."
-    
-    return "Error: Unable to fetch moderator ID."
+            score = find_in(data)
+            if score is not None:
+                return score
 
-def moderator_set_player_ban(token, username, is_banned):
-    headers = { "Authorization": f"Bearer {token}"}
-    
-    refresh_moderator_token(token)
-    
-    player_id = get_player_id(username)
-    response = requests.post(f"{URL}/api/moderation/setban?id={player_id}&isBanned={str(is_banned).lower()}", headers=headers)
-
-    if response.status_code == 200:
-        r = response.text
-        
-        if r == "ok":
-            return r
-        
-    elif response.status_code == 403:
-        return "Error: You do not have permission to set ban status for player."
-        
-    return "Error: Unable to set ban status for player."
+    return None
 
-def moderator_get_banned_player_creations(token, page=1, per_page=6, sort_order="desc"):
-    headers = { "Authorization": f"Bearer {token}" }
+# moderation functions
+def moderator_login(username, password):
+    return call(MODERATOR_LOGIN, login=username, password=password)
 
-    refresh_moderator_token(token)
+def refresh_moderator_token(token):
+    return call(REFRESH_TOKEN, token)
 
-    response = requests.get(
-        f"{URL}/api/moderation/player_creations?page={page}&per_page={per_page}&status=BANNED&sortOrder={sort_order}",
-        headers=headers,
-    )
+def get_moderator_id(token, username):
+    return call(MODERATOR_ID, token, username=username)
 
-    if response.status_code == 200:
-        return response.json()
+def moderator_set_player_ban(token, username, is_banned):
+    player_id = get_player_id(username)
+    if is_error(player_id):
+        return player_id
 
-    elif response.status_code == 403:
-        return "Error: You do not have permission to view banned player creations."
+    return call(SET_PLAYER_BAN, token, id=player_id, isBanned=is_banned)
 
-    return "Error: Unable to get banned player creations."
+def moderator_get_banned_player_creations(token, page=1, per_page=6, sort_order="desc"):
+    return call(BANNED_PLAYER_CREATIONS, token, page=page, per_page=per_page, sortOrder=sort_order)
 
 def moderator_ban_creation(token, creation_id, is_banned):
-    headers = { "Authorization": f"Bearer {token}"}
-    
-    refresh_moderator_token(token)
-    
     if is_banned:
         status = "BANNED"
     else:
         status = "APPROVED"
-        
-    response = requests.post(f"{URL}/api/moderation/setStatus?id={creation_id}&status={status}", headers=headers)
-
-    if response.status_code == 200:
-        r = response.text
-        
-        if r == "ok":
-            return r
-        
-    elif response.status_code == 403:
-        return "Error: You do not have permission to set ban status for creation."
-        
-    return "Error: Unable to set ban status for creation."
+
+    return call(SET_CREATION_STATUS, token, id=creation_id, status=status)
 
 def moderator_set_user_quota(token, username, quota):
-    headers = { "Authorization": f"Bearer {token}"}
-    
-    refresh_moderator_token(token)
-    
     player_id = get_player_id(username)
-    response = requests.post(f"{URL}/api/moderation/setUserQuota?id={player_id}&quota={quota}", headers=headers)
-
-    if response.status_code == 200:
-        r = response.text
-        
-        if r == "ok":
-            return r
-        
-    elif response.status_code == 403:
-        return "Error: You do not have permission to set quota for user."
-        
-    return "Error: Unable to set quota for user."
-
-def moderator_user_allow_opposite_platform(token, username, allow_opposite_platform):
-    headers = { "Authorization": f"Bearer {token}"}
+    if is_error(player_id):
+        return player_id
 
-    refresh_moderator_token(token)
+    return call(SET_USER_QUOTA, token, id=player_id, quota=quota)
 
+def moderator_user_allow_opposite_platform(token, username, allow_opposite_platform):
     player_id = get_player_id(username)
-    response = requests.post(f"{URL}/api/moderation/setUserSettings?id={player_id}&AllowOppositePlatform={str(allow_opposite_platform).lower()}", headers=headers)
-
-    if response.status_code == 200:
-        r = response.text
-        
-        if r == "ok":
-            return r
-        
-    elif response.status_code == 403:
-        return "Error: You do not have permission to set opposite platform allowance for user."
-        
-    return "Error: Unable to set opposite platform allowance for user."
+    if is_error(player_id):
+        return player_id
+
+    return call(SET_USER_SETTINGS, token, id=player_id, AllowOppositePlatform=allow_opposite_platform)
 
 def moderator_reset_player_profile(token, username, remove_creations=False):
-    headers = { "Authorization": f"Bearer {token}"}
-    
-    refresh_moderator_token(token)
-    
     player_id = get_player_id(username)
-    if isinstance(player_id, str) and player_id.startswith("Error:"):
+    if is_error(player_id):
         return player_id
 
-    response = requests.delete(
-        f"{URL}/api/moderation/users/{player_id}/stats",
-        params={"removeCreations": str(remove_creations).lower()},
-        headers=headers,
-    )
-
-    if response.status_code == 200:
-        r = response.text
-        
-        if r == "ok":
-            return r
-        
-    elif response.status_code == 403:
-        return "Error: You do not have permission to reset player profile."
-        
-    return "Error: Unable to reset player profile."
+    return call(RESET_PLAYER_STATS, token, player_id=player_id, removeCreations=remove_creations)
 
 def moderator_remove_player_avatars(token, username, is_mnr=True):
-    headers = { "Authorization": f"Bearer {token}"}
-    
-    refresh_moderator_token(token)
-    
     player_id = get_player_id(username)
-    response = requests.delete(f"{URL}/api/moderation/users/{player_id}/avatar?isMNR={str(is_mnr).lower()}", headers=headers)
-
-    if response.status_code == 200:
-        r = response.text
-        
-        if r == "ok":
-            return r
-        
-    elif response.status_code == 403:
-        return "Error: You do not have permission to remove player avatars."
+    if is_error(player_id):
+        return player_id
 
-    return "Error: Unable to remove player avatar."
+    return call(REMOVE_PLAYER_AVATAR, token, player_id=player_id, isMNR=is_mnr)
 
 def moderator_get_announcements(token, page=1, per_page=6, platform=None):
-    headers = { "Authorization": f"Bearer {token}"}
-
-    refresh_moderator_token(token)
-
-    url = f"{URL}/api/moderation/announcements?page={page}&per_page={per_page}"
-    if platform is not None:
-        url += f"&platform={platform}"
-    response = requests.get(url, headers=headers)
-
-    if response.status_code == 200:
-        return response.json()
-    
-    elif response.status_code == 403:
-        return "Error: You do not have permission to get announcements."
-
-    return "Error: Unable to get announcements."
+    return call(ANNOUNCEMENTS, token, page=page, per_page=per_page, platform=platform)
 
 def moderator_create_announcement(token, language_code, subject, text, platform):
-    headers = { "Authorization": f"Bearer {token}" }
-
-    refresh_moderator_token(token)
-
-    response = requests.post(
-        f"{URL}/api/moderation/announcements?languageCode={language_code}&subject={subject}&text={text}&platform={platform}",
-        headers=headers,
+    return call(
+        CREATE_ANNOUNCEMENT,
+        token,
+        languageCode=language_code,
+        subject=subject,
+        text=text,
+        platform=platform,
     )
 
-    if response.status_code == 200:
-        if response.text == "ok":
-            return "ok"
-
-    elif response.status_code == 403:
-        return "Error: You do not have permission to manage announcements."
-
-    return "Error: Unable to create announcement."
-
 
 def moderator_edit_announcement(token, announcement_id, language_code, subject, text):
-    headers = { "Authorization": f"Bearer {token}" }
-
-    refresh_moderator_token(token)
-
-    response = requests.post(
-        f"{URL}/api/moderation/announcements/{announcement_id}?languageCode={language_code}&subject={subject}&text={text}&platform=2",
-        headers=headers,
+    return call(
+        EDIT_ANNOUNCEMENT,
+        token,
+        announcement_id=announcement_id,
+        languageCode=language_code,
+        subject=subject,
+        text=text,
     )
 
-    if response.status_code == 200:
-        if response.text == "ok":
-            return "ok"
-
-    elif response.status_code == 403:
-        return "Error: You do not have permission to manage announcements."
-
-    elif response.status_code == 404:
-        return "Error: Announcement not found."
-
-    return "Error: Unable to edit announcement."
-
 
 def moderator_delete_announcement(token, announcement_id):
-    headers = { "Authorization": f"Bearer {token}" }
-
-    refresh_moderator_token(token)
-
-    response = requests.delete(
-        f"{URL}/api/moderation/announcements/{announcement_id}",
-        headers=headers,
-    )
-
-    if response.status_code == 200:
-        if response.text == "ok":
-            return "ok"
-
-    elif response.status_code == 403:
-        return "Error: You do not have permission to manage announcements."
-
-    elif response.status_code == 404:
-        return "Error: Announcement not found."
-
-    return "Error: Unable to delete announcement."
+    return call(DELETE_ANNOUNCEMENT, token, announcement_id=announcement_id)
 
 def moderator_remove_player_creation(token, creation_id):
-    headers = { "Authorization": f"Bearer {token}" }
-
-    refresh_moderator_token(token)
-
-    response = requests.delete(
-        f"{URL}/api/moderation/player_creations/{creation_id}",
-        headers=headers,
-    )
-
-    if response.status_code == 200:
-        if response.text == "ok":
-            return "ok"
-
-    elif response.status_code == 403:
-        return "Error: You do not have permission to remove player creations."
-
-    elif response.status_code == 404:
-        return "Error: Creation not found."
-
-    return "Error: Unable to remove player creation."
+    return call(REMOVE_PLAYER_CREATION, token, creation_id=creation_id)
 
 
 def moderator_remove_player_creations(token, username):
-    headers = { "Authorization": f"Bearer {token}" }
-
-    refresh_moderator_token(token)
-
     player_id = get_player_id(username)
-    if isinstance(player_id, str) and player_id.startswith("Error:"):
+    if is_error(player_id):
         return player_id
 
-    response = requests.delete(
-        f"{URL}/api/moderation/users/{player_id}/creations",
-        headers=headers,
-    )
-
-    if response.status_code == 200:
-        if response.text == "ok":
-            return "ok"
-
-    elif response.status_code == 403:
-        return "Error: You do not have permission to remove player creations."
-
-    elif response.status_code == 404:
-        return "Error: Player not found."
-
-    return "Error: Unable to remove player creations."
+    return call(REMOVE_PLAYER_CREATIONS, token, player_id=player_id)
 
 
 def moderator_get_banned_console_ids(token, page=1, per_page=6):
-    headers = { "Authorization": f"Bearer {token}" }
-
-    refresh_moderator_token(token)
-
-    response = requests.get(
-        f"{URL}/api/moderation/banned_console_ids?page={page}&per_page={per_page}",
-        headers=headers,
-    )
-
-    if response.status_code == 200:
-        return response.json()
-
-    elif response.status_code == 403:
-        return "Error: You do not have permission to manage console IDs."
-
-    return "Error: Unable to fetch banned console IDs."
+    return call(BANNED_CONSOLE_IDS, token, page=page, per_page=per_page)
 
 
 def moderator_add_banned_console_id(token, console_id):
-    headers = { "Authorization": f"Bearer {token}" }
-
-    refresh_moderator_token(token)
-
-    response = requests.post(
-        f"{URL}/api/moderation/banned_console_ids?consoleId={console_id}",
-        headers=headers,
-    )
-
-    if response.status_code == 200:
-        if response.text == "ok":
-            return "ok"
-        if response.text == "error_already_exists":
-            return "Error: Console ID already exists."
-
-    elif response.status_code == 403:
-        return "Error: You do not have permission to manage console IDs."
-
-    return "Error: Unable to add banned console ID."
+    return call(ADD_BANNED_CONSOLE_ID, token, consoleId=console_id)
 
 
 def moderator_remove_banned_console_id(token, console_id):
-    headers = { "Authorization": f"Bearer {token}" }
-
-    refresh_moderator_token(token)
-
-    response = requests.delete(
-        f"{URL}/api/moderation/banned_console_ids?consoleId={console_id}",
-        headers=headers,
-    )
-
-    if response.status_code == 200:
-        if response.text == "ok":
-            return "ok"
-
-    elif response.status_code == 403:
-        return "Error: You do not have permission to manage console IDs."
-
-    elif response.status_code == 404:
-        return "Error: Console ID not found."
-
-    return "Error: Unable to remove banned console ID."
+    return call(REMOVE_BANNED_CONSOLE_ID, token, consoleId=console_id)
 
 
 def moderator_ban_console_id_by_session(token, username):
-    headers = { "Authorization": f"Bearer {token}" }
-
-    refresh_moderator_token(token)
-
     player_id = get_player_id(username)
-    if isinstance(player_id, str) and player_id.startswith("Error:"):
+    if is_error(player_id):
         return player_id
 
-    response = requests.post(
-        f"{URL}/api/moderation/banned_console_ids/player/{player_id}",
-        headers=headers,
-    )
-
-    if response.status_code == 200:
-        if response.text == "ok":
-            return "ok"
-        if response.text == "no_active_session":
-            return "Error: Player has no active session."
-        if response.text == "no_console_id_found":
-            return "Error: No console ID found for the player's active session."
-        if response.text == "error_already_exists":
-            return "Error: Console ID already exists."
-
-    elif response.status_code == 403:
-        return "Error: You do not have permission to manage console IDs."
-
-    return "Error: Unable to add console ID by player session."
+    return call(BAN_CONSOLE_ID_BY_SESSION, token, player_id=player_id)
 
 def moderator_get_player_complaints(token, page=1, per_page=1):
-    headers = { "Authorization": f"Bearer {token}" }
-    
-    refresh_moderator_token(token)
-
-    response = requests.get(
-        f"{URL}/api/moderation/player_complaints?page={page}&per_page={per_page}",
-        headers=headers,
-    )
-
-    if response.status_code == 200:
-        return response.json()
-
-    elif response.status_code == 403:
-        return "Error: You do not have permission to view player complaints."
-
-    return "Error: Unable to get player complaints."
+    return call(PLAYER_COMPLAINTS, token, page=page, per_page=per_page)
 
 def moderator_get_creation_complaints(token, page=1, per_page=1):
-    headers = { "Authorization": f"Bearer {token}" }
-    
-    refresh_moderator_token(token)
-
-    response = requests.get(
-        f"{URL}/api/moderation/player_creation_complaints?page={page}&per_page={per_page}",
-        headers=headers,
-    )
-
-    if response.status_code == 200:
-        return response.json()
-
-    elif response.status_code == 403:
-        return "Error: You do not have permission to view creation complaints."
-
-    return "Error: Unable to get creation complaints."
+    return call(CREATION_COMPLAINTS, token, page=page, per_page=per_page)
 
 # moderator management
 def create_moderator(token, username, password):
-    headers = { "Authorization": f"Bearer {token}"}
-    
-    refresh_moderator_token(token)
-    
     # set permissions in the future, for now just creates the moderator
-    response = requests.post(f"{URL}/api/moderation/moderators?username={username}&password={password}", headers=headers)
-    
-    if response.status_code == 200:
-        r = response.text
-        
-        if r == "ok":
-            return r
-        
-    elif response.status_code == 403:
-        return "Error: You do not have permission to create a moderator."
-    
-    return "Error: Unable to create moderator."
+    return call(CREATE_MODERATOR, token, username=username, password=password)
 
 def delete_moderator(token, username):
-    headers = { "Authorization": f"Bearer {token}"}
-    refresh_moderator_token(token)
-    
     moderator_id = get_moderator_id(token, username)
-    if isinstance(moderator_id, str) and moderator_id.startswith("Error:"):
+    if is_error(moderator_id):
         return moderator_id
-    
-    response = requests.delete(f"{URL}/api/moderation/moderators/{moderator_id}", headers=headers)
-
-    if response.status_code == 200:
-        r = response.text
-        
-        if r == "ok":
-            return r
-        
-    elif response.status_code == 403:
-        return "Error: You do not have permission to delete a moderator."
 
-    return "Error: Unable to delete moderator."
+    return call(DELETE_MODERATOR, token, moderator_id=moderator_id)
 
 def get_moderators(token):
-    headers = { "Authorization": f"Bearer {token}"}
-    
-    refresh_moderator_token(token)
-    
-    response = requests.get(
-        f"{URL}/api/moderation/moderators",
-        params={"page": 1, "per_page": 10},
-        headers=headers,
-    )
-
-    if response.status_code == 200:
-        return response.json()
-    
-    elif response.status_code == 403:
-        return "Error: You do not have permission to get moderators."
-
-    return "Error: Unable to get moderators."
+    return call(MODERATORS, token, page=1, per_page=10)
 
 
 def moderator_get_moderators(token, page=1, per_page=6, sort_order="desc"):
-    headers = { "Authorization": f"Bearer {token}" }
-
-    refresh_moderator_token(token)
-
-    response = requests.get(
-        f"{URL}/api/moderation/moderators?page={page}&per_page={per_page}&sortOrder={sort_order}",
-        headers=headers,
-    )
-
-    if response.status_code == 200:
-        return response.json()
-
-    elif response.status_code == 403:
-        return "Error: You do not have permission to get moderators."
-
-    return "Error: Unable to get moderators."
+    return call(MODERATORS, token, page=page, per_page=per_page, sortOrder=sort_order)
 
 def moderator_get_permissions(token):
-    headers = { "Authorization": f"Bearer {token}"}
-
-    refresh_moderator_token(token)
-
-    response = requests.get(f"{URL}/api/moderation/permissions", headers=headers)
-
-    if response.status_code == 200:
-        r = response.json()
-
-        return r
-    
-    elif response.status_code == 404:
-        return "Error: Moderator not found."
-
-    return "Error: Unable to get moderator permissions."
+    return call(MODERATOR_PERMISSIONS_LIST, token)
 
 def moderator_set_permissions(token, username, permissions, value):
-    headers = { "Authorization": f"Bearer {token}" }
-    refresh_moderator_token(token)
-
     moderator_id = get_moderator_id(token, username)
-    if isinstance(moderator_id, str) and moderator_id.startswith("Error:"):
+    if is_error(moderator_id):
         return moderator_id
 
     if isinstance(permissions, dict):
         permission_params = {
-            k: "true" if v else "false"
+            k: bool(v)
             for k, v in permissions.items()
             if k in MODERATOR_PERMISSIONS
         }
     elif isinstance(permissions, list) and value is not None:
         permission_params = {
-            p: "true" if value else "false"
+            p: bool(value)
             for p in permissions
             if p in MODERATOR_PERMISSIONS
         }
@@ -1225,61 +1030,10 @@ def moderator_set_permissions(token, username, permissions, value):
     if not permission_params:
         return "Error: No valid permissions provided."
 
-    response = requests.post(
-        f"{URL}/api/moderation/{moderator_id}/set_permissions",
-        params=permission_params,
-        headers=headers,
-    )
+    return call(SET_MODERATOR_PERMISSIONS, token, moderator_id=moderator_id, **permission_params)
 
-    if response.status_code == 200:
-        r = response.text
-        
-        if r == "ok":
-            return r
-        
-        else:
-            return "Error: Moderator not found."
-    
-    else:
-        return "Error: Unable to set moderator permissions."
-    
 def moderator_set_username(token, username):
-    headers = { "Authorization": f"Bearer {token}"}
-    
-    refresh_moderator_token(token)
-    
-    response = requests.get(f"{URL}/api/moderation/set_username?username={username}", headers=headers)
-    
-    if response.status_code == 200:
-        r = response.json()
-        
-        return r
-    
-    elif response.status_code == 403:
-        return "Error: You do not have permission to get moderators."
-    
-    else:
-        return "Error: Unable to get moderators."
-    
+    return call(SET_MODERATOR_USERNAME, token, username=username)
+
 def moderator_set_password(token, password):
-    headers = { "Authorization": f"Bearer {token}"}
-    
-    refresh_moderator_token(token)
-    
-    response = requests.post(f"{URL}/api/moderation/set_password?password={password}", headers=headers)
-    
-    if response.status_code == 200:
-        r = response.text
-        
-        if r == "ok":
-            return r
-        
-        elif r == "error_moderator_not_found":
-            return "Error: Moderator not found."
-        
-        # impossible to reach this point but eh
-        elif r == "error_password_is_empty":
-            return "Error: Password is empty."
-    
-    else:
-        return "Error: Unable to set moderator password."
+    return call(SET_MODERATOR_PASSWORD, token, password=password)